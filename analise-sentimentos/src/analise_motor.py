@@ -5,14 +5,21 @@ Motor de Análise de Sentimentos - TechNova
 Utiliza TextBlob para classificar polaridade de comentários
 """
 
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
 import os
-from typing import Tuple
+from typing import Iterable, Optional, Tuple
+
+from cache_sentimentos import CacheSentimentos, cache_padrao
+
+# Faixa de polaridade considerada neutra
+LIMIAR_POSITIVO = 0.1
+LIMIAR_NEGATIVO = -0.1
 
 def analisar_sentimento(texto: str) -> Tuple[float, str]:
     """
-    Analisa o sentimento de um texto usando TextBlob.
+    Analisa o sentimento de um texto usando TextBlob (com cache).
     
     Args:
         texto: String com o texto a ser analisado
@@ -22,26 +29,8 @@ def analisar_sentimento(texto: str) -> Tuple[float, str]:
         - polaridade: float de -1 (muito negativo) a 1 (muito positivo)
         - classificacao: 'Positivo', 'Negativo' ou 'Neutro'
     """
-    try:
-        # Cria objeto TextBlob
-        blob = TextBlob(str(texto))
-        
-        # Obtém polaridade (-1 a 1)
-        polaridade = blob.sentiment.polarity
-        
-        # Classifica baseado na polaridade
-        if polaridade > 0.1:
-            classificacao = 'Positivo'
-        elif polaridade < -0.1:
-            classificacao = 'Negativo'
-        else:
-            classificacao = 'Neutro'
-            
-        return polaridade, classificacao
-        
-    except Exception as e:
-        print(f"Erro ao analisar texto: {e}")
-        return 0.0, 'Neutro'
+    polaridade, _, classificacao = analisar_lote([texto])
+    return float(polaridade[0]), classificacao[0]
 
 def analisar_subjetividade(texto: str) -> float:
     """
@@ -53,36 +42,103 @@ def analisar_subjetividade(texto: str) -> float:
     Returns:
         subjetividade: float de 0 (objetivo) a 1 (subjetivo)
     """
+    _, subjetividade, _ = analisar_lote([texto])
+    return float(subjetividade[0])
+
+def classificar(polaridade: np.ndarray) -> np.ndarray:
+    """
+    Classifica um vetor de polaridades de uma vez.
+    
+    Args:
+        polaridade: Array de floats de -1 a 1
+        
+    Returns:
+        Array com 'Positivo', 'Negativo' ou 'Neutro' para cada posição
+    """
+    return np.select(
+        [polaridade > LIMIAR_POSITIVO, polaridade < LIMIAR_NEGATIVO],
+        ['Positivo', 'Negativo'],
+        default='Neutro',
+    ).astype(object)
+
+def _pontuar_texto(texto: str) -> Optional[Tuple[float, float]]:
+    """(polaridade, subjetividade) de um texto, ou None se o analisador falhar."""
     try:
-        blob = TextBlob(str(texto))
-        return blob.sentiment.subjectivity
-    except Exception:
-        return 0.5
+        return tuple(pattern_sentiment(texto))
+    except Exception as e:
+        print(f"Erro ao analisar texto: {e}")
+        return None
+
+def analisar_lote(
+    textos: Iterable,
+    usar_cache: bool = True,
+    cache: Optional[CacheSentimentos] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Analisa polaridade e subjetividade de vários textos numa única passada.
+    
+    Cada texto é avaliado uma só vez pelo mesmo analisador que o TextBlob
+    usa por padrão, sem montar um objeto TextBlob por linha. Com cache,
+    textos que só diferem em caixa, espaços ou URLs são pontuados uma vez
+    e o resultado é reaproveitado entre execuções.
+    
+    Args:
+        textos: Sequência de textos (valores não-texto são convertidos com str)
+        usar_cache: Consulta o cache de pontuações antes de analisar
+        cache: Cache a usar (padrão: o compartilhado do processo)
+        
+    Returns:
+        Tuple de arrays NumPy alinhados com a entrada:
+        - polaridade: float64 de -1 a 1
+        - subjetividade: float64 de 0 a 1
+        - classificacao: 'Positivo', 'Negativo' ou 'Neutro'
+    """
+    textos = [str(texto) for texto in textos]
+    
+    if usar_cache:
+        polaridade, subjetividade = (cache or cache_padrao()).pontuar(textos, _pontuar_texto)
+        return polaridade, subjetividade, classificar(polaridade)
+    
+    polaridade = np.zeros(len(textos))
+    subjetividade = np.full(len(textos), 0.5)
+    for i, texto in enumerate(textos):
+        pontuacao = _pontuar_texto(texto)
+        if pontuacao is not None:
+            polaridade[i], subjetividade[i] = pontuacao
+    
+    return polaridade, subjetividade, classificar(polaridade)
 
-def processar_dataframe(df: pd.DataFrame, coluna_texto: str = 'texto') -> pd.DataFrame:
+def processar_dataframe(
+    df: pd.DataFrame,
+    coluna_texto: str = 'texto',
+    usar_cache: bool = True,
+) -> pd.DataFrame:
     """
     Processa um DataFrame aplicando análise de sentimentos.
     
     Args:
         df: DataFrame com os dados
         coluna_texto: Nome da coluna com o texto a analisar
+        usar_cache: Reaproveita pontuações de textos já vistos
         
     Returns:
         DataFrame com colunas adicionais de polaridade e classificação
     """
     print("🔍 Iniciando análise de sentimentos...")
     
-    # Aplica análise de sentimentos
-    resultados = df[coluna_texto].apply(analisar_sentimento)
-    
-    # Separa polaridade e classificação
-    df['polaridade'] = resultados.apply(lambda x: x[0])
-    df['classificacao'] = resultados.apply(lambda x: x[1])
-    
-    # Adiciona subjetividade
-    df['subjetividade'] = df[coluna_texto].apply(analisar_subjetividade)
+    # Uma passada por texto; as três colunas entram no DataFrame juntas
+    polaridade, subjetividade, classificacao = analisar_lote(df[coluna_texto].to_numpy(), usar_cache)
+    df[['polaridade', 'classificacao', 'subjetividade']] = pd.DataFrame(
+        {'polaridade': polaridade, 'classificacao': classificacao, 'subjetividade': subjetividade},
+        index=df.index,
+    )
     
     print(f"✅ {len(df)} textos analisados!")
+    if usar_cache:
+        stats = cache_padrao().estatisticas()
+        print(f"♻️  Cache: {stats['taxa_acerto']:.1%} sem repontuar "
+              f"({stats['repetidos']} repetidos, {stats['memoria']} da memória, "
+              f"{stats['disco']} do disco, {stats['calculados']} analisados)")
     
     return df
 
@@ -0,0 +1,187 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Benchmark do Motor de Sentimentos - TechNova
+Compara a vazão do processamento em lote com o caminho antigo
+(dois TextBlob por linha e colunas separadas por apply) e, com --cache,
+mede o reaproveitamento de pontuações em memória e em disco
+
+Uso:
+    python src/benchmark_motor.py
+    python src/benchmark_motor.py --linhas 200000 --linhas-legado 20000 --saida resultado.json
+    python src/benchmark_motor.py --cache --linhas 5000000 --linhas-legado 20000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+from analise_motor import analisar_lote, classificar, processar_dataframe
+from cache_sentimentos import CacheSentimentos
+
+DIR_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_COMENTARIOS = os.path.join(DIR_BASE, 'data', 'comentarios_social.csv')
+
+def carregar_comentarios(n_linhas: int, semente: int = 42, variacoes: float = 0.0) -> pd.DataFrame:
+    """
+    Monta um DataFrame de `n_linhas` comentários sorteados dos dados sintéticos.
+
+    Args:
+        n_linhas: Número de linhas desejado
+        semente: Semente do sorteio
+        variacoes: Fração das linhas alteradas como num feed real (caixa alta,
+                   espaços extras ou link encurtado único)
+
+    Returns:
+        DataFrame com a coluna 'texto'
+    """
+    if os.path.exists(ARQUIVO_COMENTARIOS):
+        base = pd.read_csv(ARQUIVO_COMENTARIOS)['texto']
+    else:
+        from gerador_dados import gerar_comentarios
+        base = gerar_comentarios(500)['texto']
+
+    rng = np.random.default_rng(semente)
+    indices = rng.integers(0, len(base), size=n_linhas)
+    textos = base.to_numpy()[indices]
+
+    for i in np.flatnonzero(rng.random(n_linhas) < variacoes):
+        tipo = i % 3
+        if tipo == 0:
+            textos[i] = textos[i].upper()
+        elif tipo == 1:
+            textos[i] = "  " + textos[i].replace(" ", "   ")
+        else:
+            textos[i] = f"{textos[i]} https://t.co/{i:x}"
+    return pd.DataFrame({'texto': textos})
+
+def _sentimento_legado(texto) -> tuple:
+    try:
+        polaridade = TextBlob(str(texto)).sentiment.polarity
+        return polaridade, classificar(np.array([polaridade]))[0]
+    except Exception:
+        return 0.0, 'Neutro'
+
+def _subjetividade_legado(texto) -> float:
+    try:
+        return TextBlob(str(texto)).sentiment.subjectivity
+    except Exception:
+        return 0.5
+
+def processar_legado(df: pd.DataFrame, coluna_texto: str = 'texto') -> pd.DataFrame:
+    """Caminho anterior de processar_dataframe, mantido só para comparação."""
+    resultados = df[coluna_texto].apply(_sentimento_legado)
+    df['polaridade'] = resultados.apply(lambda x: x[0])
+    df['classificacao'] = resultados.apply(lambda x: x[1])
+    df['subjetividade'] = df[coluna_texto].apply(_subjetividade_legado)
+    return df
+
+def medir_cache(df: pd.DataFrame) -> dict:
+    """
+    Pontua `df` três vezes com um cache temporário: frio, com a memória
+    aquecida e num cache novo que só tem o SQLite (como outro processo).
+
+    Returns:
+        Dicionário {rodada: {segundos, linhas_por_s, taxa_acerto, calculados}}
+    """
+    resultado = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'cache.sqlite3')
+        quente = CacheSentimentos(caminho=caminho)
+        rodadas = [('frio', quente), ('memoria', quente), ('disco', CacheSentimentos(caminho=caminho))]
+        for nome, cache in rodadas:
+            antes = cache.estatisticas()
+            inicio = time.perf_counter()
+            analisar_lote(df['texto'].to_numpy(), cache=cache)
+            segundos = time.perf_counter() - inicio
+            depois = cache.estatisticas()
+            calculados = depois['calculados'] - antes['calculados']
+            resultado[nome] = {
+                'segundos': round(segundos, 2),
+                'linhas_por_s': round(len(df) / segundos, 1),
+                'taxa_acerto': round(1 - calculados / len(df), 4),
+                'calculados': calculados,
+            }
+            print(f"♻️  Cache {nome:<8} {segundos:7.2f}s ({resultado[nome]['linhas_por_s']:,.0f} linhas/s) | "
+                  f"acertos {resultado[nome]['taxa_acerto']:.1%} | {calculados} analisados")
+    return resultado
+
+def medir(funcao, df: pd.DataFrame) -> dict:
+    """Executa `funcao` numa cópia de `df` e mede tempo e vazão."""
+    copia = df.copy()
+    inicio = time.perf_counter()
+    resultado = funcao(copia)
+    segundos = time.perf_counter() - inicio
+    return {
+        'linhas': len(df),
+        'segundos': round(segundos, 2),
+        'linhas_por_s': round(len(df) / segundos, 1),
+        'df': resultado,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do motor de sentimentos")
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--linhas-legado', type=int,
+                        help="Linhas para o caminho antigo (padrão: as mesmas; a vazão é comparada)")
+    parser.add_argument('--cache', action='store_true', help="Mede também o cache de pontuações")
+    parser.add_argument('--variacoes', type=float, default=0.3,
+                        help="Fração de linhas com caixa, espaços ou links alterados")
+    parser.add_argument('--saida', help="Arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("⏱️  BENCHMARK DO MOTOR DE SENTIMENTOS")
+    print("=" * 50)
+
+    df = carregar_comentarios(args.linhas, variacoes=args.variacoes)
+    print(f"📂 {len(df)} comentários ({df['texto'].nunique()} textos distintos)")
+
+    lote = medir(lambda d: processar_dataframe(d, 'texto', usar_cache=False), df)
+    print(f"🚀 Lote:   {lote['linhas']} linhas em {lote['segundos']:.2f}s "
+          f"({lote['linhas_por_s']:,.0f} linhas/s)")
+
+    df_legado = df.head(args.linhas_legado) if args.linhas_legado else df
+    legado = medir(processar_legado, df_legado)
+    print(f"🐢 Legado: {legado['linhas']} linhas em {legado['segundos']:.2f}s "
+          f"({legado['linhas_por_s']:,.0f} linhas/s)")
+
+    # Os dois caminhos precisam concordar nas linhas em comum
+    n = len(df_legado)
+    novo, antigo = lote['df'].head(n), legado['df']
+    diferenca = float(np.max(np.abs(novo['polaridade'].to_numpy() - antigo['polaridade'].to_numpy()), initial=0.0))
+    diferenca = max(diferenca, float(np.max(
+        np.abs(novo['subjetividade'].to_numpy() - antigo['subjetividade'].to_numpy()), initial=0.0)))
+    classes_iguais = bool((novo['classificacao'].to_numpy() == antigo['classificacao'].to_numpy()).all())
+
+    aceleracao = lote['linhas_por_s'] / legado['linhas_por_s']
+    print(f"\n📈 Aceleração: {aceleracao:.1f}x")
+    print(f"🔎 Diferença máxima de pontuação: {diferenca:.2e} | classes iguais: {classes_iguais}")
+
+    cache = medir_cache(df) if args.cache else None
+    print("=" * 50)
+
+    resultado = {
+        'lote': {k: v for k, v in lote.items() if k != 'df'},
+        'legado': {k: v for k, v in legado.items() if k != 'df'},
+        'aceleracao': round(aceleracao, 2),
+        'diferenca_maxima': diferenca,
+        'classes_iguais': classes_iguais,
+    }
+    if cache:
+        resultado['cache'] = cache
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"💾 Resultado salvo em '{args.saida}'")
+
+    return resultado
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Cache de Pontuações de Sentimento - TechNova
+Memoriza polaridade e subjetividade por texto normalizado, em memória (LRU)
+e opcionalmente em SQLite, compartilhado entre a CLI e os dashboards
+"""
+
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Streamlit Cloud: filesystem é readonly exceto /tmp
+_is_cloud = (
+    os.getenv("HOME") == "/home/adminuser"
+    or str(BASE_DIR).startswith("/mount/src")
+    or not os.access(str(BASE_DIR), os.W_OK)
+)
+_DIR_CACHE_PADRAO = Path(tempfile.gettempdir()) if _is_cloud else BASE_DIR / "data"
+
+# Configurações (variáveis de ambiente)
+# Caminho vazio desliga a camada persistente
+CACHE_SQLITE_PATH = os.getenv(
+    "SENTIMENTOS_CACHE_SQLITE",
+    str(_DIR_CACHE_PADRAO / "cache_sentimentos.sqlite3"),
+)
+CACHE_MAX_ITENS = int(os.getenv("SENTIMENTOS_CACHE_ITENS", "100000"))
+
+# Limite de parâmetros por consulta IN (...) no SQLite
+_LOTE_SQLITE = 500
+
+_REGEX_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+
+Pontuacao = Tuple[float, float]
+
+def _versao_analisador() -> str:
+    """Identifica o analisador; pontuações de outra versão não são reaproveitadas."""
+    try:
+        return f"textblob-{version('textblob')}"
+    except PackageNotFoundError:
+        return "textblob"
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Forma canônica usada como chave do cache.
+
+    URLs viram 'url', espaços são colapsados e as palavras vão para
+    minúsculas. Tokens com uma só letra (emoticons como ':D') mantêm a
+    caixa, pois o analisador os diferencia.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    tokens = _REGEX_URL.sub("url", texto).split()
+    return " ".join(
+        token.lower() if sum(c.isalpha() for c in token) > 1 else token
+        for token in tokens
+    )
+
+class CacheSentimentos:
+    """
+    Pontuações (polaridade, subjetividade) por hash do texto normalizado.
+
+    A camada em memória guarda até `max_itens` entradas com descarte LRU;
+    a camada SQLite em `caminho` (opcional) sobrevive entre execuções e é
+    lida em lote. Textos repetidos dentro de um mesmo lote são pontuados
+    uma vez só.
+    """
+
+    def __init__(
+        self,
+        max_itens: int = CACHE_MAX_ITENS,
+        caminho: Optional[str] = None,
+        analisador: Optional[str] = None,
+    ):
+        self.max_itens = max_itens
+        self.caminho = Path(caminho) if caminho else None
+        self.analisador = analisador or _versao_analisador()
+        self._memoria: "OrderedDict[bytes, Pontuacao]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._contadores = {'linhas': 0, 'repetidos': 0, 'memoria': 0, 'disco': 0, 'calculados': 0}
+
+    # ────────────────────────────────────────────────────────────────────
+    # Camada persistente
+    # ────────────────────────────────────────────────────────────────────
+    def _conexao(self) -> Optional[sqlite3.Connection]:
+        """Conexão única por instância: abrir o banco por consulta custaria mais que pontuar."""
+        if self.caminho is None:
+            return None
+        if self._conn is None:
+            try:
+                self.caminho.parent.mkdir(parents=True, exist_ok=True)
+                # CLI e dashboards podem usar o mesmo arquivo ao mesmo tempo
+                self._conn = sqlite3.connect(str(self.caminho), timeout=30, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS pontuacoes (
+                        chave BLOB PRIMARY KEY,
+                        polaridade REAL NOT NULL,
+                        subjetividade REAL NOT NULL
+                    ) WITHOUT ROWID
+                    """
+                )
+            except (OSError, sqlite3.Error) as exc:
+                self._desativar_disco(exc)
+        return self._conn
+
+    def _desativar_disco(self, exc: Exception) -> None:
+        """Segue só com a camada em memória (avisa uma vez): o cache nunca impede a análise."""
+        print(f"⚠️  Cache de sentimentos em disco desativado ({self.caminho}): {exc}")
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self.caminho = None
+
+    def _ler_disco(self, chaves: List[bytes]) -> Dict[bytes, Pontuacao]:
+        conn = self._conexao()
+        if conn is None or not chaves:
+            return {}
+        encontrados = {}
+        try:
+            for inicio in range(0, len(chaves), _LOTE_SQLITE):
+                parte = chaves[inicio:inicio + _LOTE_SQLITE]
+                marcadores = ",".join("?" * len(parte))
+                for chave, polaridade, subjetividade in conn.execute(
+                    f"SELECT chave, polaridade, subjetividade FROM pontuacoes WHERE chave IN ({marcadores})",
+                    parte,
+                ):
+                    encontrados[chave] = (polaridade, subjetividade)
+        except sqlite3.Error as exc:
+            self._desativar_disco(exc)
+        return encontrados
+
+    def _gravar_disco(self, pontuacoes: Dict[bytes, Pontuacao]) -> None:
+        conn = self._conexao()
+        if conn is None or not pontuacoes:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pontuacoes (chave, polaridade, subjetividade) VALUES (?, ?, ?)",
+                    ((chave, p, s) for chave, (p, s) in pontuacoes.items()),
+                )
+        except sqlite3.Error as exc:
+            # Ex.: arquivo somente leitura ou disco cheio
+            self._desativar_disco(exc)
+
+    # ────────────────────────────────────────────────────────────────────
+    # Camada em memória
+    # ────────────────────────────────────────────────────────────────────
+    def _lembrar(self, chave: bytes, pontuacao: Pontuacao) -> None:
+        self._memoria[chave] = pontuacao
+        self._memoria.move_to_end(chave)
+        if len(self._memoria) > self.max_itens:
+            self._memoria.popitem(last=False)
+
+    def chave(self, texto_normalizado: str) -> bytes:
+        """Hash de 128 bits do texto normalizado (inclui a versão do analisador)."""
+        return hashlib.blake2b(
+            f"{self.analisador}\0{texto_normalizado}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    # ────────────────────────────────────────────────────────────────────
+    # API
+    # ────────────────────────────────────────────────────────────────────
+    def pontuar(
+        self,
+        textos: Iterable[str],
+        funcao: Callable[[str], Optional[Pontuacao]],
+        padrao: Pontuacao = (0.0, 0.5),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pontua os textos consultando memória, depois disco, e só então `funcao`.
+
+        Args:
+            textos: Textos originais
+            funcao: Pontua um texto já normalizado; None indica falha
+                    (usa `padrao` e não entra no cache)
+            padrao: (polaridade, subjetividade) para textos que falharam
+
+        Returns:
+            Arrays float64 de polaridade e subjetividade alinhados com a entrada
+        """
+        # Textos idênticos são normalizados uma vez só
+        posicoes: Dict[str, int] = {}
+        codigos = np.fromiter(
+            (posicoes.setdefault(texto, len(posicoes)) for texto in textos), dtype=np.int64
+        )
+
+        # Textos diferentes podem cair na mesma chave (caixa, espaços, URLs)
+        chaves_por_texto = []
+        normalizados: Dict[bytes, str] = {}
+        for texto in posicoes:
+            normalizado = normalizar_texto(texto)
+            chave = self.chave(normalizado)
+            chaves_por_texto.append(chave)
+            normalizados.setdefault(chave, normalizado)
+
+        with self._lock:
+            pontuacoes: Dict[bytes, Pontuacao] = {}
+            ausentes = []
+            for chave in normalizados:
+                achado = self._memoria.get(chave)
+                if achado is None:
+                    ausentes.append(chave)
+                else:
+                    self._memoria.move_to_end(chave)
+                    pontuacoes[chave] = achado
+            acertos_memoria = len(pontuacoes)
+
+            do_disco = self._ler_disco(ausentes)
+            for chave, pontuacao in do_disco.items():
+                self._lembrar(chave, pontuacao)
+            pontuacoes.update(do_disco)
+
+        calculados = {}
+        for chave in ausentes:
+            if chave in do_disco:
+                continue
+            pontuacao = funcao(normalizados[chave])
+            if pontuacao is None:
+                pontuacoes[chave] = padrao
+            else:
+                calculados[chave] = pontuacoes[chave] = (float(pontuacao[0]), float(pontuacao[1]))
+
+        with self._lock:
+            for chave, pontuacao in calculados.items():
+                self._lembrar(chave, pontuacao)
+            self._gravar_disco(calculados)
+            self._contadores['linhas'] += len(codigos)
+            self._contadores['repetidos'] += len(codigos) - len(normalizados)
+            self._contadores['memoria'] += acertos_memoria
+            self._contadores['disco'] += len(do_disco)
+            self._contadores['calculados'] += len(ausentes) - len(do_disco)
+
+        valores = np.array([pontuacoes[chave] for chave in chaves_por_texto], dtype=np.float64).reshape(-1, 2)
+        return valores[codigos, 0], valores[codigos, 1]
+
+    def estatisticas(self) -> dict:
+        """
+        Contadores acumulados desde a criação.
+
+        Returns:
+            Dicionário com linhas, repetidos (no mesmo lote), acertos em
+            memória e em disco, calculados e taxa_acerto (fração das linhas
+            que não precisaram ser pontuadas)
+        """
+        with self._lock:
+            stats = dict(self._contadores)
+            stats['itens_memoria'] = len(self._memoria)
+        stats['taxa_acerto'] = (
+            1 - stats['calculados'] / stats['linhas'] if stats['linhas'] else 0.0
+        )
+        return stats
+
+    def limpar(self) -> None:
+        """Esvazia as duas camadas e zera os contadores."""
+        with self._lock:
+            self._memoria.clear()
+            for nome in self._contadores:
+                self._contadores[nome] = 0
+            conn = self._conexao()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM pontuacoes")
+                except sqlite3.Error as exc:
+                    self._desativar_disco(exc)
+
+_cache_padrao: Optional[CacheSentimentos] = None
+_lock_padrao = threading.Lock()
+
+def cache_padrao() -> CacheSentimentos:
+    """Cache compartilhado do processo, configurado pelas variáveis de ambiente."""
+    global _cache_padrao
+    with _lock_padrao:
+        if _cache_padrao is None:
+            _cache_padrao = CacheSentimentos(CACHE_MAX_ITENS, CACHE_SQLITE_PATH or None)
+        return _cache_padrao
@@ -7,9 +7,9 @@ Usa busca semântica (ChromaDB) + geração de respostas com Gemini API
 """
 
 from pathlib import Path
+from typing import Iterator, Optional
 import os
 import sys
-import shutil
 
 import streamlit as st
 
@@ -17,17 +17,28 @@ import streamlit as st
 BASE_DIR = Path(__file__).resolve().parents[1]
 PROJECT_ROOT = BASE_DIR.parent
 SRC_DIR = BASE_DIR / "src"
-DB_DIR = BASE_DIR / "db_store"
 sys.path.insert(0, str(SRC_DIR))
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from processador_pdf import processar_pdf_upload
 from indexador import (
+    FiltroBusca,
     criar_ou_carregar_vectorstore,
-    indexar_documentos,
     buscar_com_scores,
     contar_documentos,
+    limpar_base,
+    listar_documentos,
+    remover_documento,
+    metricas_embeddings,
+    obter_versao_colecao,
+    etapas_aquecimento,
 )
+from aquecimento import estado_aquecimento, iniciar_aquecimento
+from cache_respostas import CacheRespostas
+from pool_llm import PoolClientesLLM, gerar_stream
+from modelos_llm import GEMINI_MODEL_DEFAULT, GEMINI_MODEL_FALLBACKS, USAR_LLM_FALSO, criar_llm
+from fila_indexacao import FilaIndexacao
+from contexto import montar_prompt as montar_prompt_rag
+from snapshot_base import RESTAURAR_NA_INICIALIZACAO, restaurar_snapshot
 from shared.components import (  # noqa: E402
     SHARED_SIDEBAR_CSS,
     render_sidebar_header,
@@ -40,13 +51,15 @@ from shared.components import (  # noqa: E402
 # CONFIGURAÇÕES
 # ────────────────────────────────────────────────────────────────────────────────
 MAX_FILE_SIZE_MB = 100  # Limite de 100MB por arquivo
-GEMINI_MODEL_DEFAULT = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-GEMINI_MODEL_FALLBACKS = [
-    GEMINI_MODEL_DEFAULT,
-    "gemini-2.5-flash",
-    "gemini-2.5-pro",
-    "gemini-flash-latest",
-]
+MAX_TAREFAS_EXIBIDAS = 5  # Indexações recentes listadas na sidebar
+INTERVALO_PROGRESSO_S = 1.5  # Atualização do progresso enquanto há indexações ativas
+# Cache semântico de respostas (compartilhado entre sessões)
+LIMIAR_CACHE_RESPOSTAS = float(os.getenv("RAG_CACHE_RESPOSTAS_LIMIAR", "0.95"))
+# Hedging: dispara o próximo modelo se o atual não responder nesse prazo (0 = desligado)
+LLM_HEDGE_MS = float(os.getenv("RAG_LLM_HEDGE_MS", "0"))
+MAX_METRICAS_GERACAO = 50  # Respostas recentes consideradas nas métricas da sessão
+# Tokens de contexto por pergunta (trechos vizinhos são unidos sem a sobreposição)
+ORCAMENTO_CONTEXTO = int(os.getenv("RAG_ORCAMENTO_CONTEXTO", "1500"))
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -221,51 +234,71 @@ def obter_gemini_api_key() -> str:
 
 def verificar_gemini() -> bool:
     """Verifica se a API do Gemini está configurada."""
+    if USAR_LLM_FALSO:
+        return True
     api_key = obter_gemini_api_key()
     return bool(api_key and api_key.strip())
 
 
-def gerar_resposta_gemini(pergunta: str, contextos: list, modelo: str = GEMINI_MODEL_DEFAULT) -> str:
-    """Gera resposta usando Gemini API com fallback de modelo."""
-    from langchain_google_genai import ChatGoogleGenerativeAI
+def montar_prompt(pergunta: str, contextos: list, relatorio: Optional[dict] = None) -> str:
+    """Monta o prompt RAG com os trechos recuperados (dentro de RAG_ORCAMENTO_CONTEXTO)."""
+    return montar_prompt_rag(pergunta, contextos, ORCAMENTO_CONTEXTO, relatorio)
 
-    api_key = obter_gemini_api_key()
-    if not api_key:
-        return "❌ Chave API do Gemini não configurada."
 
-    contexto_texto = "\n\n".join([
-        f"Trecho {i+1} (de {doc.metadata.get('fonte', 'documento')}):\n{doc.page_content}"
-        for i, (doc, score) in enumerate(contextos)
-    ])
+@st.cache_resource(show_spinner=False)
+def obter_pool_llm(api_key: str) -> PoolClientesLLM:
+    """Pool de clientes LLM compartilhado entre sessões (um por API key)."""
+    return PoolClientesLLM(lambda modelo_nome: criar_llm(modelo_nome, api_key))
+
 
-    prompt = f"""Você é um assistente corporativo inteligente. Use APENAS as informações do contexto abaixo para responder à pergunta. Se a informação não estiver no contexto, diga que não encontrou a informação nos documentos.
+def gerar_resposta_gemini_stream(
+    pergunta: str,
+    contextos: list,
+    modelo: str = GEMINI_MODEL_DEFAULT,
+    metricas: Optional[dict] = None,
+) -> Iterator[str]:
+    """
+    Gera a resposta token a token, com fallback de modelo.
 
-CONTEXTO:
-{contexto_texto}
+    Os modelos são tentados na ordem sugerida pelas estatísticas do pool
+    (latência e taxa de erro). O fallback só acontece antes do primeiro
+    token; com RAG_LLM_HEDGE_MS > 0 o próximo modelo é disparado em paralelo
+    se o atual não começar a responder dentro desse atraso.
 
-PERGUNTA: {pergunta}
+    Args:
+        pergunta: Pergunta do usuário
+        contextos: Lista de (Document, score) recuperados
+        modelo: Modelo preferido (os de GEMINI_MODEL_FALLBACKS vêm em seguida)
+        metricas: Dicionário preenchido com modelo, ttft_ms, total_ms, tokens,
+            tentativas, contexto (tokens do prompt) e, em caso de falha, erro
 
-RESPOSTA (seja conciso e objetivo):"""
+    Yields:
+        Fragmentos de texto da resposta
+    """
+    metricas = metricas if metricas is not None else {}
+    api_key = obter_gemini_api_key()
+    if not api_key and not USAR_LLM_FALSO:
+        metricas["erro"] = "sem chave"
+        yield "❌ Chave API do Gemini não configurada."
+        return
 
     modelos_tentar = [modelo] if modelo else []
     modelos_tentar.extend([m for m in GEMINI_MODEL_FALLBACKS if m not in modelos_tentar])
 
-    erros = []
-    for modelo_nome in modelos_tentar:
-        try:
-            llm = ChatGoogleGenerativeAI(
-                model=modelo_nome,
-                google_api_key=api_key,
-                temperature=0.3,
-                max_output_tokens=1024,
-            )
-            resposta = llm.invoke(prompt)
-            return resposta.content.strip()
-        except Exception as exc:  # Keep trying other models when one fails
-            erros.append(f"{modelo_nome}: {exc}")
-            continue
+    pool = obter_pool_llm(api_key)
+    metricas["contexto"] = {}
+    yield from gerar_stream(
+        pool,
+        montar_prompt(pergunta, contextos, metricas["contexto"]),
+        pool.ordenar(modelos_tentar),
+        atraso_hedge_ms=LLM_HEDGE_MS,
+        metricas=metricas,
+    )
 
-    return "❌ Erro ao gerar resposta. Modelos testados: " + " | ".join(erros)
+
+def gerar_resposta_gemini(pergunta: str, contextos: list, modelo: str = GEMINI_MODEL_DEFAULT) -> str:
+    """Gera resposta usando Gemini API com fallback de modelo (sem streaming)."""
+    return "".join(gerar_resposta_gemini_stream(pergunta, contextos, modelo)).strip()
 
 
 def gerar_resposta_sem_llm(pergunta: str, contextos: list) -> str:
@@ -293,15 +326,51 @@ def gerar_resposta_sem_llm(pergunta: str, contextos: list) -> str:
 def limpar_base_documentos():
     """Remove todos os documentos indexados."""
     try:
-        if DB_DIR.exists():
-            shutil.rmtree(DB_DIR)
-            st.session_state.vectorstore = None
-            return True
+        limpar_base()
+        st.session_state.vectorstore = None
+        return True
     except Exception as e:
         st.error(f"Erro ao limpar base: {str(e)}")
     return False
 
 
+@st.cache_resource(show_spinner=False)
+def obter_cache_respostas() -> CacheRespostas:
+    """Cache de respostas único para todas as sessões do servidor."""
+    return CacheRespostas(limiar=LIMIAR_CACHE_RESPOSTAS)
+
+
+def registrar_metricas_geracao(metricas: dict):
+    """Guarda TTFT e tempo total da geração nas métricas da sessão."""
+    if "ttft_ms" not in metricas:
+        return
+    historico = st.session_state.metricas_geracao
+    historico.append(metricas)
+    del historico[:-MAX_METRICAS_GERACAO]
+
+
+@st.cache_resource(show_spinner=False)
+def obter_fila_indexacao() -> FilaIndexacao:
+    """Fila de indexação única para todas as sessões do servidor."""
+    return FilaIndexacao()
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar_aquecimento_app() -> bool:
+    """
+    Uma vez por processo, depois do primeiro render: carrega em segundo
+    plano o Chroma, a base (restaurando o snapshot), o modelo de embeddings
+    e o cliente do LLM, para que a primeira pergunta não pague por eles.
+    """
+    etapas = etapas_aquecimento()
+    # Antes do modelo de embeddings (última etapa): a sidebar espera a restauração
+    etapas.insert(len(etapas) - 1, ("base", preparar_base))
+    if verificar_gemini():
+        pool = obter_pool_llm(obter_gemini_api_key())
+        etapas.append(("llm", lambda: pool.obter(GEMINI_MODEL_DEFAULT)))
+    return iniciar_aquecimento(etapas)
+
+
 def inicializar_sessao():
     """Inicializa variáveis de sessão do Streamlit."""
     if "mensagens" not in st.session_state:
@@ -310,36 +379,102 @@ def inicializar_sessao():
         st.session_state.vectorstore = None
     if "fontes_ultima_resposta" not in st.session_state:
         st.session_state.fontes_ultima_resposta = []
+    if "metricas_geracao" not in st.session_state:
+        st.session_state.metricas_geracao = []
+    if "tarefas_acompanhadas" not in st.session_state:
+        st.session_state.tarefas_acompanhadas = set()
+    if "escopo_fontes" not in st.session_state:
+        st.session_state.escopo_fontes = []
+
+
+@st.cache_resource(show_spinner=False)
+def restaurar_snapshot_inicial() -> int:
+    """Na primeira sessão do processo, restaura o snapshot se a base estiver vazia."""
+    if not RESTAURAR_NA_INICIALIZACAO:
+        return 0
+    return restaurar_snapshot()
+
+
+def preparar_base() -> None:
+    """Etapa de aquecimento: abre a base vetorial e restaura o snapshot se ela estiver vazia."""
+    vectorstore = criar_ou_carregar_vectorstore()
+    if RESTAURAR_NA_INICIALIZACAO:
+        restaurar_snapshot(vectorstore=vectorstore)
+
+
+def base_em_preparo() -> bool:
+    """True enquanto a etapa 'base' do aquecimento não terminou."""
+    return estado_aquecimento().get("base", {}).get("estado") not in ("pronto", "erro")
 
 
 def carregar_vectorstore():
-    """Carrega ou cria a base vetorial."""
+    """
+    Carrega ou cria a base vetorial no primeiro uso (pergunta ou remoção);
+    o render da página não depende dela.
+    """
     if st.session_state.vectorstore is None:
         with st.spinner("🔮 Carregando base de conhecimento..."):
+            restaurar_snapshot_inicial()
             st.session_state.vectorstore = criar_ou_carregar_vectorstore()
     return st.session_state.vectorstore
 
 
 def processar_upload(arquivo_pdf):
-    """Processa PDF enviado pelo usuário."""
+    """Envia o PDF para a fila de indexação em segundo plano."""
     if arquivo_pdf is None:
         return
     
     # Verifica tamanho do arquivo
-    file_size_mb = len(arquivo_pdf.getvalue()) / (1024 * 1024)
+    file_size_mb = arquivo_pdf.size / (1024 * 1024)
     if file_size_mb > MAX_FILE_SIZE_MB:
         st.error(f"❌ Arquivo muito grande ({file_size_mb:.1f}MB). Máximo: {MAX_FILE_SIZE_MB}MB")
         return
     
-    with st.spinner(f"📄 Processando {arquivo_pdf.name}..."):
-        chunks = processar_pdf_upload(arquivo_pdf.getvalue(), arquivo_pdf.name)
-        
-        if not chunks:
-            st.error("❌ Não foi possível extrair texto do PDF.")
-            return
-        
-        st.session_state.vectorstore = indexar_documentos(chunks, limpar_base=False)
-        st.success(f"✅ {len(chunks)} trechos indexados de '{arquivo_pdf.name}'!")
+    # Só a cópia para disco acontece aqui; leitura, chunks e embeddings rodam no worker
+    tarefa = obter_fila_indexacao().enviar(arquivo_pdf, arquivo_pdf.name)
+    if tarefa.envios > 1:
+        st.info(f"♻️ '{arquivo_pdf.name}' já está sendo indexado")
+    else:
+        st.success(f"📥 '{arquivo_pdf.name}' enviado para indexação")
+
+
+def render_tarefas_indexacao():
+    """Progresso das indexações em segundo plano (atualiza sozinho enquanto há tarefas)."""
+    fila = obter_fila_indexacao()
+    tarefas = fila.listar()[:MAX_TAREFAS_EXIBIDAS]
+    if not tarefas:
+        return
+    
+    em_andamento = {t["id"] for t in tarefas if t["estado"] in ("na_fila", "processando")}
+    acompanhadas = st.session_state.tarefas_acompanhadas
+    terminou = bool(acompanhadas - em_andamento)
+    st.session_state.tarefas_acompanhadas = em_andamento
+    
+    for t in tarefas:
+        if t["estado"] == "na_fila":
+            st.progress(0.0, text=f"⏳ {t['nome']} (na fila)")
+        elif t["estado"] == "processando":
+            eta = f" · ~{t['eta_s']:.0f}s restantes" if t["eta_s"] is not None else ""
+            st.progress(
+                min(t["fracao"], 1.0),
+                text=f"⚙️ {t['nome']}: {t['paginas_lidas']}/{t['paginas_total']} páginas"
+                     f" · {t['chunks_embedados']} chunks{eta}",
+            )
+        elif t["estado"] == "concluida":
+            st.caption(f"✅ {t['nome']}: {t['chunks_lidos']} trechos em {t['duracao_s']:.1f}s")
+        else:
+            st.caption(f"❌ {t['nome']}: {t['erro']}")
+    
+    # Ao concluir, recarrega a página inteira para atualizar o status da base
+    if terminou:
+        st.session_state.vectorstore = None
+        st.rerun()
+
+
+def aguardar_base(preparando: bool):
+    """Recarrega a página quando a base termina de ser preparada (snapshot restaurado)."""
+    if preparando and not base_em_preparo():
+        st.rerun()
 
 
 def processar_pergunta(pergunta: str):
@@ -350,16 +485,38 @@ def processar_pergunta(pergunta: str):
     if num_docs == 0:
         return "⚠️ Nenhum documento indexado. Faça upload de um PDF primeiro!", []
     
+    usar_llm = verificar_gemini()
+    escopo = st.session_state.get("escopo_fontes") or []
+    filtro = FiltroBusca(fontes=escopo) if escopo else None
+    
+    # Perguntas equivalentes já respondidas pulam busca e LLM
+    # (o cache é global: perguntas restritas a documentos não passam por ele)
+    usar_cache = usar_llm and filtro is None
+    if usar_cache:
+        cache = obter_cache_respostas()
+        vetor_query = vectorstore.embeddings.embed_query(pergunta)
+        versao = obter_versao_colecao()
+        em_cache = cache.buscar(vetor_query, versao)
+        if em_cache is not None:
+            return em_cache
+    
     with st.spinner("🔍 Buscando informações relevantes..."):
-        resultados = buscar_com_scores(pergunta, k=3, vectorstore=vectorstore)
+        resultados = buscar_com_scores(pergunta, k=3, vectorstore=vectorstore, filtro=filtro)
     
     if not resultados:
         return "Não encontrei informações relevantes para sua pergunta.", []
     
-    # Usa Gemini se disponível, senão mostra chunks
-    if verificar_gemini():
-        with st.spinner(f"⚡ Gerando resposta com Gemini..."):
-            resposta = gerar_resposta_gemini(pergunta, resultados, GEMINI_MODEL_DEFAULT)
+    # Usa Gemini se disponível (tokens aparecem conforme chegam), senão mostra chunks
+    if usar_llm:
+        metricas = {}
+        st.markdown("🤖 **Assistente:**")
+        resposta = st.write_stream(
+            gerar_resposta_gemini_stream(pergunta, resultados, GEMINI_MODEL_DEFAULT, metricas)
+        )
+        resposta = (resposta if isinstance(resposta, str) else "".join(map(str, resposta))).strip()
+        registrar_metricas_geracao(metricas)
+        if usar_cache and "erro" not in metricas:
+            cache.guardar(vetor_query, versao, (resposta, resultados))
     else:
         resposta = gerar_resposta_sem_llm(pergunta, resultados)
     
@@ -395,11 +552,18 @@ def render_fontes(fontes: list):
         pagina = doc.metadata.get("page", "N/A")
         trecho = doc.page_content[:150] + "..." if len(doc.page_content) > 150 else doc.page_content
         similaridade = max(0, min(100, int((1 - score) * 100)))
+        # Trecho repetido em outros documentos (quase-duplicatas ligadas a este)
+        outras = doc.metadata.get("fontes", [])[1:]
+        tambem_em = (
+            f'<div style="color:#64748b; font-size:0.75rem;">🔗 Também em: {", ".join(outras)}</div>'
+            if outras else ""
+        )
         
         st.markdown(
             f"""
             <div class="fonte-card">
                 <div class="fonte-header">📄 {fonte} (pág. {pagina})</div>
+                {tambem_em}
                 <div class="fonte-trecho">{trecho}</div>
                 <div style="margin-top:0.5rem;">
                     <span style="background:#dbeafe; color:#1e40af; padding:0.15rem 0.5rem; border-radius:8px; font-size:0.7rem;">
@@ -412,6 +576,99 @@ def render_fontes(fontes: list):
         )
 
 
+def render_documentos(documentos: list):
+    """Lista os documentos indexados, com remoção individual."""
+    for i, doc in enumerate(documentos):
+        col_nome, col_acao = st.columns([4, 1])
+        with col_nome:
+            st.caption(f"📄 {doc['fonte']} · {doc['chunks']} trechos")
+        with col_acao:
+            if st.button("🗑️", key=f"remover_doc_{i}", help=f"Remover {doc['fonte']}"):
+                remover_documento(doc["fonte"], carregar_vectorstore())
+                st.rerun()
+
+
+def render_escopo(documentos: list):
+    """Seletor de documentos que restringe as buscas do chat."""
+    fontes = [doc["fonte"] for doc in documentos]
+    # Documentos removidos saem da seleção antes de o widget validar as opções
+    st.session_state.escopo_fontes = [f for f in st.session_state.escopo_fontes if f in fontes]
+    st.multiselect(
+        "🎯 Buscar apenas em",
+        options=fontes,
+        key="escopo_fontes",
+        placeholder="Todos os documentos",
+        help="Restringe as respostas aos documentos escolhidos (busca mais rápida em bases grandes)",
+    )
+
+
+def render_metricas():
+    """Renderiza métricas das camadas de embeddings, dos caches e da geração."""
+    metricas = metricas_embeddings()
+    linhas = []
+    
+    cache = metricas.get("cache")
+    if cache:
+        linhas.append(
+            f"💾 Cache de embeddings: {cache['taxa_acerto']:.0%} acertos "
+            f"({cache['entradas']} vetores)"
+        )
+    micro_lote = metricas.get("micro_lote")
+    if micro_lote:
+        linhas.append(
+            f"📦 Micro-lotes: fila {micro_lote['fila_atual']}, "
+            f"lote médio {micro_lote['media_lote']:.1f}, "
+            f"espera média {micro_lote['espera_media_ms']:.1f} ms"
+        )
+    lotes = metricas.get("lotes_comprimento")
+    if lotes and lotes["lotes"]:
+        linhas.append(
+            f"📏 Lotes por comprimento: {lotes['media_lote']:.1f} textos/lote, "
+            f"{lotes['aproveitamento']:.0%} sem padding (orçamento {lotes['orcamento_tokens']} tokens)"
+        )
+    respostas = obter_cache_respostas().estatisticas()
+    linhas.append(
+        f"💬 Cache de respostas: {respostas['taxa_acerto']:.0%} acertos "
+        f"({respostas['entradas']} respostas)"
+    )
+    
+    geracoes = st.session_state.get("metricas_geracao", [])
+    if geracoes:
+        ultima = geracoes[-1]
+        ttfts = sorted(g["ttft_ms"] for g in geracoes)
+        linhas.append(
+            f"⚡ Última resposta: 1º token em {ultima['ttft_ms']:.0f} ms, "
+            f"total {ultima['total_ms']:.0f} ms ({ultima['modelo']})"
+        )
+        linhas.append(
+            f"⏱️ 1º token (mediana de {len(ttfts)}): {ttfts[len(ttfts) // 2]:.0f} ms"
+        )
+        contexto = ultima.get("contexto")
+        if contexto:
+            economizados = sum(g.get("contexto", {}).get("tokens_economizados", 0) for g in geracoes)
+            linhas.append(
+                f"✂️ Contexto: {contexto['tokens_usados']} tokens "
+                f"({contexto['tokens_economizados']} economizados; {economizados} na sessão)"
+            )
+    if verificar_gemini():
+        for modelo, stat in obter_pool_llm(obter_gemini_api_key()).estatisticas().items():
+            latencia = f"{stat['latencia_ms']:.0f} ms" if stat["latencia_ms"] is not None else "—"
+            linhas.append(
+                f"🧠 {modelo}: 1º token ~{latencia}, erros {stat['taxa_erro']:.0%} "
+                f"({stat['chamadas']} chamadas)"
+            )
+    
+    aquecimento = estado_aquecimento()
+    if aquecimento:
+        linhas.append("🔥 Aquecimento: " + ", ".join(
+            f"{nome} {dados['ms'] / 1000:.1f} s" if "ms" in dados else f"{nome} {dados['estado']}"
+            for nome, dados in aquecimento.items()
+        ))
+    
+    for linha in linhas:
+        st.caption(linha)
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # APP PRINCIPAL
 # ────────────────────────────────────────────────────────────────────────────────
@@ -429,7 +686,7 @@ def render_app():
     render_instrucoes_uso(
         instrucoes=[
             "Faça upload de PDFs na sidebar (máx. 100MB)",
-            "Aguarde a indexação dos documentos",
+            "Acompanhe a indexação na sidebar (roda em segundo plano)",
             "Digite sua pergunta no chat",
         ],
         ferramentas_sidebar=[
@@ -470,26 +727,41 @@ def render_app():
         )
         
         if arquivo_pdf:
-            file_size_mb = len(arquivo_pdf.getvalue()) / (1024 * 1024)
+            file_size_mb = arquivo_pdf.size / (1024 * 1024)
             st.markdown(f'<p style="color: #94a3b8; font-size: 0.875rem; margin-top: 0.5rem;">📄 {arquivo_pdf.name} ({file_size_mb:.1f}MB)</p>', unsafe_allow_html=True)
             
             if st.button("📤 Indexar documento", use_container_width=True):
                 processar_upload(arquivo_pdf)
         
+        intervalo = INTERVALO_PROGRESSO_S if obter_fila_indexacao().ativas() else None
+        st.fragment(run_every=intervalo)(render_tarefas_indexacao)()
+        
         st.markdown("---")
         
-        # Status da base
+        # Status da base: lido do manifesto, sem abrir a base vetorial (nem importar o Chroma)
         st.markdown("### 📊 Status da Base")
-        vectorstore = carregar_vectorstore()
-        num_docs = contar_documentos(vectorstore)
+        preparando = base_em_preparo()
+        st.fragment(run_every=INTERVALO_PROGRESSO_S if preparando else None)(aguardar_base)(preparando)
+        documentos = listar_documentos()
+        num_docs = sum(doc["chunks"] for doc in documentos)
         
         st.metric("Documentos indexados", num_docs)
         
         if num_docs > 0:
             st.markdown('<div class="status-card status-ok">✅ Pronto para perguntas</div>', unsafe_allow_html=True)
+        elif preparando:
+            st.markdown('<div class="status-card status-warning">⏳ Preparando base...</div>', unsafe_allow_html=True)
         else:
             st.markdown('<div class="status-card status-warning">⚠️ Base vazia</div>', unsafe_allow_html=True)
         
+        if num_docs > 0:
+            render_escopo(documentos)
+            with st.expander("📄 Documentos indexados"):
+                render_documentos(documentos)
+        
+        with st.expander("📈 Métricas de desempenho"):
+            render_metricas()
+        
         st.markdown("---")
         
         # Status do Gemini
@@ -550,6 +822,10 @@ def render_app():
     
     if pergunta:
         st.session_state.mensagens.append({"role": "user", "content": pergunta})
+        st.markdown(
+            f'<div class="chat-message chat-user">👤 <strong>Você:</strong> {pergunta}</div>',
+            unsafe_allow_html=True
+        )
         
         resposta, fontes = processar_pergunta(pergunta)
         
@@ -563,6 +839,9 @@ def render_app():
         subtitulo="Perguntas e respostas sobre documentos com busca semântica",
         tecnologias="LangChain + ChromaDB + HuggingFace + Gemini"
     )
+    
+    # Página já desenhada: antecipa os carregamentos pesados em segundo plano
+    iniciar_aquecimento_app()
 
 
 if __name__ == "__main__":
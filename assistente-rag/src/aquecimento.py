@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Carregamento Preguiçoso e Aquecimento - Assistente Corporativo RAG
+Adia o carregamento do modelo de embeddings até o primeiro uso e o
+antecipa numa thread de fundo depois que a página já foi desenhada
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import importlib
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+
+# Estado do aquecimento do processo (exibido nas métricas do chat)
+_ESTADO: Dict[str, dict] = {}
+_LOCK_ESTADO = threading.Lock()
+_thread_aquecimento: Optional[threading.Thread] = None
+
+
+class EmbeddingsPreguicosos(Embeddings):
+    """
+    Embeddings que só são construídos na primeira chamada (ou em `carregar()`).
+
+    Criar a base vetorial e contar documentos não precisa do modelo; o
+    torch e os pesos do sentence-transformers só são carregados quando um
+    texto precisa ser codificado.
+    """
+
+    def __init__(self, fabrica: Callable[[], Embeddings]):
+        self._fabrica = fabrica
+        self._embeddings: Optional[Embeddings] = None
+        self._lock = threading.Lock()
+
+    @property
+    def carregado(self) -> bool:
+        return self._embeddings is not None
+
+    @property
+    def base(self) -> Optional[Embeddings]:
+        """Camadas já construídas (None antes do carregamento, sem forçá-lo)."""
+        return self._embeddings
+
+    def carregar(self) -> Embeddings:
+        """Constrói as camadas de embeddings uma única vez (seguro entre threads)."""
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    self._embeddings = self._fabrica()
+        return self._embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.carregar().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.carregar().embed_query(text)
+
+
+def _executar(etapas: Sequence[Tuple[str, Callable[[], object]]]) -> None:
+    for nome, etapa in etapas:
+        with _LOCK_ESTADO:
+            _ESTADO[nome] = {"estado": "carregando"}
+        inicio = time.perf_counter()
+        try:
+            etapa()
+            resultado = {"estado": "pronto"}
+        except Exception as exc:  # Falha aqui só adia o custo para o primeiro uso
+            resultado = {"estado": "erro", "erro": str(exc)}
+        resultado["ms"] = round(1000 * (time.perf_counter() - inicio), 1)
+        with _LOCK_ESTADO:
+            _ESTADO[nome] = resultado
+
+
+def iniciar_aquecimento(etapas: Sequence[Tuple[str, Callable[[], object]]]) -> bool:
+    """
+    Roda as etapas (nome, função) em ordem numa thread daemon, uma vez por processo.
+
+    Returns:
+        True se a thread foi iniciada agora, False se já havia sido
+    """
+    global _thread_aquecimento
+    with _LOCK_ESTADO:
+        if _thread_aquecimento is not None:
+            return False
+        _thread_aquecimento = threading.Thread(
+            target=_executar, args=(list(etapas),), name="aquecimento-rag", daemon=True
+        )
+        _thread_aquecimento.start()
+    return True
+
+
+def importar(modulo: str) -> Callable[[], object]:
+    """Etapa de aquecimento que importa um módulo pesado."""
+    return lambda: importlib.import_module(modulo)
+
+
+def estado_aquecimento() -> Dict[str, dict]:
+    """Cópia do estado de cada etapa: {nome: {estado, ms, erro?}}."""
+    with _LOCK_ESTADO:
+        return {nome: dict(dados) for nome, dados in _ESTADO.items()}
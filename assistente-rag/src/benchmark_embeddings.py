@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Benchmark de Backends de Embeddings - Assistente Corporativo RAG
+Compara torch x ONNX x ONNX int8 em tempo de inicialização, vazão e
+concordância de recuperação (top-k) sobre um corpus de amostra
+
+Uso:
+    python src/benchmark_embeddings.py --backends torch onnx onnx-int8
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+TEMAS = [
+    "férias", "reembolso de despesas", "home office", "código de conduta",
+    "segurança da informação", "contrato de prestação de serviços",
+    "plano de saúde", "avaliação de desempenho", "compras corporativas",
+    "política de viagens", "proteção de dados pessoais", "horas extras",
+]
+MODELOS_FRASE = [
+    "A política de {tema} estabelece que o colaborador deve solicitar aprovação prévia do gestor.",
+    "Conforme o artigo {n}, as regras de {tema} valem para todas as unidades da empresa.",
+    "O procedimento de {tema} deve ser registrado no sistema interno em até {n} dias úteis.",
+    "Casos omissos sobre {tema} serão avaliados pelo comitê responsável.",
+    "O descumprimento das normas de {tema} pode gerar advertência formal.",
+    "Dúvidas sobre {tema} devem ser encaminhadas ao RH pelo canal oficial.",
+]
+
+
+def gerar_corpus_amostra(tamanho: int, semente: int = 42) -> List[str]:
+    """Gera trechos sintéticos em português, determinísticos pela semente."""
+    rng = random.Random(semente)
+    corpus = []
+    for _ in range(tamanho):
+        frases = [
+            rng.choice(MODELOS_FRASE).format(tema=rng.choice(TEMAS), n=rng.randint(1, 90))
+            for _ in range(rng.randint(2, 8))
+        ]
+        corpus.append(" ".join(frases))
+    return corpus
+
+
+def carregar_corpus(tamanho: int) -> List[str]:
+    """Usa chunks dos PDFs em documentos/ se houver; senão, o corpus sintético."""
+    from processador_pdf import DOCUMENTOS_DIR, processar_todos_pdfs
+
+    if any(DOCUMENTOS_DIR.glob("*.pdf")):
+        textos = [chunk.page_content for chunk in processar_todos_pdfs()]
+        if textos:
+            return textos[:tamanho]
+    return gerar_corpus_amostra(tamanho)
+
+
+def _medir_backend(backend: str, textos: List[str], queries: List[str]) -> dict:
+    """Executado em processo novo: mede inicialização a frio e vazão."""
+    inicio = time.perf_counter()
+    from indexador import criar_modelo_embeddings
+
+    modelo = criar_modelo_embeddings(backend)
+    modelo.embed_query("aquecimento")
+    inicializacao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    vetores = np.asarray(modelo.embed_documents(textos), dtype=np.float32)
+    tempo_docs = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    vetores_queries = np.asarray([modelo.embed_query(q) for q in queries], dtype=np.float32)
+    tempo_queries = time.perf_counter() - inicio
+
+    return {
+        "backend": backend,
+        "inicializacao_s": inicializacao,
+        "docs_por_s": len(textos) / tempo_docs,
+        "latencia_query_ms": 1000 * tempo_queries / max(len(queries), 1),
+        "vetores": vetores,
+        "vetores_queries": vetores_queries,
+    }
+
+
+def concordancia(referencia: dict, outro: dict, k: int) -> dict:
+    """Similaridade entre vetores e sobreposição dos top-k de cada query."""
+    cossenos = np.sum(referencia["vetores"] * outro["vetores"], axis=1)
+    top_ref = np.argsort(-(referencia["vetores_queries"] @ referencia["vetores"].T), axis=1)[:, :k]
+    top_outro = np.argsort(-(outro["vetores_queries"] @ outro["vetores"].T), axis=1)[:, :k]
+    sobreposicao = [len(set(a) & set(b)) / k for a, b in zip(top_ref, top_outro)]
+    return {
+        "cosseno_medio": float(np.mean(cossenos)),
+        "cosseno_minimo": float(np.min(cossenos)),
+        f"sobreposicao_top{k}": float(np.mean(sobreposicao)),
+        "top1_igual": float(np.mean(top_ref[:, 0] == top_outro[:, 0])),
+    }
+
+
+def executar_benchmark(
+    backends: List[str],
+    tamanho_corpus: int = 500,
+    num_queries: int = 50,
+    k: int = 5,
+    saida: Optional[Path] = None,
+) -> dict:
+    """
+    Roda o benchmark, cada backend num processo novo (inicialização a frio).
+
+    Returns:
+        Dicionário com métricas por backend e concordância com o primeiro
+    """
+    textos = carregar_corpus(tamanho_corpus)
+    rng = random.Random(7)
+    queries = [texto[:120] for texto in rng.sample(textos, min(num_queries, len(textos)))]
+    print(f"📚 Corpus: {len(textos)} trechos | {len(queries)} queries | k={k}")
+
+    medicoes = []
+    for backend in backends:
+        print(f"⏱️  Medindo backend '{backend}'...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            medicoes.append(pool.submit(_medir_backend, backend, textos, queries).result())
+
+    referencia = medicoes[0]
+    resultado = {"corpus": len(textos), "queries": len(queries), "k": k, "backends": {}}
+    for medicao in medicoes:
+        dados = {
+            chave: valor for chave, valor in medicao.items()
+            if chave not in ("vetores", "vetores_queries", "backend")
+        }
+        if medicao is not referencia:
+            dados["concordancia_com_" + referencia["backend"]] = concordancia(referencia, medicao, k)
+        resultado["backends"][medicao["backend"]] = dados
+
+    print()
+    print(f"{'backend':<12}{'init (s)':>10}{'docs/s':>10}{'query (ms)':>12}{'top-k':>8}")
+    for backend, dados in resultado["backends"].items():
+        acordo = next((v for c, v in dados.items() if c.startswith("concordancia")), None)
+        topk = f"{acordo[f'sobreposicao_top{k}']:.2f}" if acordo else "ref"
+        print(
+            f"{backend:<12}{dados['inicializacao_s']:>10.2f}{dados['docs_por_s']:>10.1f}"
+            f"{dados['latencia_query_ms']:>12.2f}{topk:>8}"
+        )
+
+    if saida:
+        saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Resultado salvo em {saida}")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de backends de embeddings")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--corpus", type=int, default=500, help="Número de trechos")
+    parser.add_argument("--queries", type=int, default=50, help="Número de queries")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  BENCHMARK DE EMBEDDINGS - Assistente RAG")
+    print("=" * 60)
+    executar_benchmark(args.backends, args.corpus, args.queries, args.k, args.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Benchmark de Importação - Assistente Corporativo RAG
+Mede o custo de importar os módulos do assistente num interpretador novo
+(como `python -X importtime`), agregado por pacote, e aponta quais
+dependências pesadas entraram já na importação
+
+Uso:
+    python src/benchmark_importacao.py
+    python src/benchmark_importacao.py --alvos indexador chatbot_rag --limite-ms 1500
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = BASE_DIR / "src"
+APP_DIR = BASE_DIR / "app"
+
+ALVOS_PADRAO = ["indexador", "chatbot_rag"]
+# Devem carregar só no primeiro uso (ou no aquecimento em segundo plano)
+PACOTES_PESADOS = [
+    "torch", "sentence_transformers", "transformers", "chromadb",
+    "langchain_huggingface", "langchain_chroma", "langchain_google_genai", "onnxruntime",
+]
+
+_REGEX_LINHA = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_CODIGO_FILHO = """
+import sys, time, json
+sys.path[:0] = {caminhos!r}
+inicio = time.perf_counter()
+import {alvo}
+total = 1000 * (time.perf_counter() - inicio)
+print(json.dumps({{"total_ms": total, "modulos": sorted(sys.modules)}}))
+"""
+
+
+def medir_importacao(alvo: str) -> dict:
+    """
+    Importa `alvo` num subprocesso com -X importtime.
+
+    Returns:
+        {total_ms, por_pacote {pacote: ms próprios}, modulos [(nome, ms acumulados, nível)], pesados}
+    """
+    codigo = _CODIGO_FILHO.format(caminhos=[str(SRC_DIR), str(APP_DIR)], alvo=alvo)
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        capture_output=True, text=True, cwd=str(BASE_DIR),
+    )
+    if processo.returncode != 0:
+        erro = processo.stderr.strip().splitlines()
+        raise RuntimeError(f"Falha ao importar {alvo}: {erro[-1] if erro else processo.returncode}")
+    saida = json.loads(processo.stdout.strip().splitlines()[-1])
+
+    por_pacote: Dict[str, float] = {}
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        casamento = _REGEX_LINHA.match(linha)
+        if not casamento:
+            continue
+        proprio_us, acumulado_us, recuo, nome = casamento.groups()
+        pacote = nome.split(".")[0]
+        por_pacote[pacote] = por_pacote.get(pacote, 0.0) + int(proprio_us) / 1000
+        modulos.append((nome, int(acumulado_us) / 1000, len(recuo) // 2))
+
+    carregados = set(saida["modulos"])
+    return {
+        "total_ms": round(saida["total_ms"], 1),
+        "por_pacote": {p: round(ms, 1) for p, ms in sorted(por_pacote.items(), key=lambda i: -i[1])},
+        "modulos": modulos,
+        "pesados": [p for p in PACOTES_PESADOS if p in carregados],
+    }
+
+
+def executar_benchmark(
+    alvos: List[str],
+    repeticoes: int = 3,
+    top: int = 15,
+    saida: Optional[Path] = None,
+) -> dict:
+    """
+    Mede cada alvo `repeticoes` vezes (mediana do total) e imprime os
+    pacotes mais caros da última rodada.
+
+    Returns:
+        Dicionário {alvo: métricas} (também gravado em `saida`, se informado)
+    """
+    resultado = {}
+    for alvo in alvos:
+        rodadas = [medir_importacao(alvo) for _ in range(repeticoes)]
+        ultima = rodadas[-1]
+        totais = [r["total_ms"] for r in rodadas]
+        resultado[alvo] = {
+            "total_ms_mediana": round(statistics.median(totais), 1),
+            "total_ms": totais,
+            "pesados": ultima["pesados"],
+            "por_pacote": dict(list(ultima["por_pacote"].items())[:top]),
+            # Filhos diretos do alvo: o que cada import do módulo custa
+            "imports_diretos": {
+                nome: round(ms, 1)
+                for nome, ms, nivel in sorted(ultima["modulos"], key=lambda m: -m[1])
+                if nivel == 1
+            },
+        }
+
+        print(f"\n📦 {alvo}: {resultado[alvo]['total_ms_mediana']:.0f} ms (mediana de {repeticoes})")
+        pesados = resultado[alvo]["pesados"]
+        print(f"   🏋️  Pesados já na importação: {', '.join(pesados) if pesados else 'nenhum'}")
+        for pacote, ms in resultado[alvo]["por_pacote"].items():
+            print(f"   {pacote:<28} {ms:8.1f} ms")
+
+    if saida:
+        saida.parent.mkdir(parents=True, exist_ok=True)
+        saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 Resultado salvo em {saida}")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de tempo de importação")
+    parser.add_argument("--alvos", nargs="+", default=ALVOS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Pacotes listados por alvo")
+    parser.add_argument("--limite-ms", type=float, help="Falha (código 1) se algum alvo passar disso")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  BENCHMARK DE IMPORTAÇÃO - Assistente RAG")
+    print("=" * 60)
+    resultado = executar_benchmark(args.alvos, args.repeticoes, args.top, args.saida)
+
+    if args.limite_ms is not None:
+        acima = [a for a, r in resultado.items() if r["total_ms_mediana"] > args.limite_ms]
+        if acima:
+            print(f"\n❌ Acima de {args.limite_ms:.0f} ms: {', '.join(acima)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
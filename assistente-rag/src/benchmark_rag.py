@@ -0,0 +1,543 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Benchmark de Recuperação - Assistente Corporativo RAG
+Gera (ou reaproveita) um corpus sintético de PDFs com perguntas rotuladas
+e mede ingestão, latência de busca, tamanho do índice e qualidade (recall@k, MRR)
+
+Uso:
+    python src/benchmark_rag.py --docs 20 --paginas 5 --k 3 --saida resultado.json
+
+A base é criada num diretório temporário (RAG_DB_DIR) e não afeta a base
+principal. O JSON tem chaves estáveis para poder ser comparado entre execuções.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import textwrap
+import time
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+CORPUS_DIR = BASE_DIR / "benchmark" / "corpus"
+ARQUIVO_PERGUNTAS = "perguntas.jsonl"
+
+FORNECEDORES = [
+    "Alvorada", "Bandeirantes", "Cerrado", "Delta Sul", "Estrela Azul", "Farol",
+    "Guaíba", "Horizonte", "Ipê Roxo", "Jacarandá", "Litoral", "Missões",
+    "Norte Forte", "Orion", "Pampa", "Quero-Quero", "Rio Claro", "Serra Gaúcha",
+]
+RAMOS = ["Serviços", "Tecnologia", "Logística", "Engenharia", "Consultoria", "Facilities"]
+SERVICOS = [
+    "limpeza predial", "manutenção de ar-condicionado", "vigilância patrimonial",
+    "suporte de TI", "transporte de colaboradores", "refeições corporativas",
+    "licenciamento de software", "auditoria contábil", "gestão de frotas",
+]
+INDICES = ["IPCA", "IGP-M", "INPC"]
+POLITICAS = [
+    "Política de Viagens", "Política de Home Office", "Código de Conduta",
+    "Política de Segurança da Informação", "Política de Reembolso",
+    "Política de Compras", "Política de Férias", "Política de Privacidade",
+]
+REGRAS = [
+    "as despesas devem ser comprovadas com nota fiscal em até {d} dias",
+    "o colaborador precisa de aprovação do gestor imediato com {d} dias de antecedência",
+    "o limite diário de hospedagem é de R$ {v}",
+    "é proibido compartilhar senhas, sob pena de advertência formal",
+    "equipamentos da empresa devem ser devolvidos em até {d} dias após o desligamento",
+    "solicitações acima de R$ {v} exigem três orçamentos",
+    "o período aquisitivo pode ser fracionado em até três partes, uma delas com {d} dias",
+    "dados pessoais de clientes só podem ser armazenados em sistemas homologados",
+]
+PRODUTOS = [
+    "notebook corporativo", "monitor de 27 polegadas", "cadeira ergonômica",
+    "headset com cancelamento de ruído", "leitor de código de barras",
+    "impressora térmica", "nobreak de 1500 VA", "roteador Wi-Fi 6",
+]
+PARAGRAFOS_RUIDO = [
+    "Este documento é de uso interno e não deve ser distribuído a terceiros sem autorização.",
+    "Revisões deste material são publicadas na intranet e substituem versões anteriores.",
+    "Em caso de dúvidas, procure a área responsável pelo canal oficial de atendimento.",
+]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ESCRITA DE PDF (sem dependências externas)
+# ────────────────────────────────────────────────────────────────────────────────
+def _escapar_pdf(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def escrever_pdf(caminho: Path, paginas: List[List[str]], largura: int = 95) -> None:
+    """
+    Grava um PDF de texto simples (Helvetica, WinAnsi) com um parágrafo por item.
+
+    Args:
+        caminho: Arquivo de saída
+        paginas: Lista de páginas, cada uma com uma lista de parágrafos
+        largura: Caracteres por linha ao quebrar os parágrafos
+    """
+    n = len(paginas)
+    ids_paginas = [4 + 2 * i for i in range(n)]
+    objetos: Dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in ids_paginas)}] /Count {n} >>"
+        ).encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    for id_pagina, paragrafos in zip(ids_paginas, paginas):
+        comandos = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        for paragrafo in paragrafos:
+            for linha in textwrap.wrap(paragrafo, largura):
+                comandos.append(f"({_escapar_pdf(linha)}) Tj T*")
+            comandos.append("T*")
+        comandos.append("ET")
+        conteudo = "\n".join(comandos).encode("cp1252", errors="replace")
+        objetos[id_pagina] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {id_pagina + 1} 0 R >>"
+        ).encode()
+        objetos[id_pagina + 1] = (
+            f"<< /Length {len(conteudo)} >>\nstream\n".encode() + conteudo + b"\nendstream"
+        )
+
+    saida = bytearray(b"%PDF-1.4\n")
+    posicoes = {}
+    for numero in sorted(objetos):
+        posicoes[numero] = len(saida)
+        saida += f"{numero} 0 obj\n".encode() + objetos[numero] + b"\nendobj\n"
+    inicio_xref = len(saida)
+    total = max(objetos) + 1
+    saida += f"xref\n0 {total}\n0000000000 65535 f \n".encode()
+    for numero in range(1, total):
+        saida += f"{posicoes[numero]:010d} 00000 n \n".encode()
+    saida += f"trailer\n<< /Size {total} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n".encode()
+    caminho.write_bytes(bytes(saida))
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# CORPUS SINTÉTICO
+# ────────────────────────────────────────────────────────────────────────────────
+def _fato_contrato(rng: random.Random, usados: set) -> Tuple[str, str, List[Tuple[str, str]]]:
+    while True:
+        codigo = f"CT-{rng.randint(2019, 2025)}/{rng.randint(1, 9999):04d}"
+        fornecedor = f"{rng.choice(FORNECEDORES)} {rng.choice(RAMOS)} {rng.randint(10, 99)}"
+        if codigo not in usados and fornecedor not in usados:
+            usados.update({codigo, fornecedor})
+            break
+    servico = rng.choice(SERVICOS)
+    meses = rng.choice([12, 24, 36, 48])
+    valor = f"{rng.randint(5, 900)}.{rng.randint(0, 999):03d},00"
+    texto = (
+        f"O contrato {codigo}, firmado com a empresa {fornecedor} para {servico}, "
+        f"tem vigência de {meses} meses, valor mensal de R$ {valor} e reajuste anual "
+        f"pelo {rng.choice(INDICES)}. A fiscalização cabe à gerência administrativa."
+    )
+    perguntas = [
+        ("exata", f"Qual o valor mensal do contrato {codigo}?"),
+        ("semantica", f"Quanto a empresa paga por mês à {fornecedor}?"),
+    ]
+    return texto, codigo, perguntas
+
+
+def _fato_artigo(rng: random.Random, usados: set, politica: str) -> Tuple[str, str, List[Tuple[str, str]]]:
+    while True:
+        numero = rng.randint(1, 120)
+        marcador = f"Art. {numero} da {politica}"
+        if marcador not in usados:
+            usados.add(marcador)
+            break
+    regra = rng.choice(REGRAS).format(d=rng.randint(2, 60), v=rng.randint(100, 5000))
+    texto = f"{marcador}: {regra}. Exceções devem ser aprovadas pela diretoria."
+    perguntas = [
+        ("exata", f"O que determina o Art. {numero} da {politica}?"),
+    ]
+    return texto, marcador, perguntas
+
+
+def _fato_produto(rng: random.Random, usados: set) -> Tuple[str, str, List[Tuple[str, str]]]:
+    while True:
+        sku = f"SKU-{rng.randint(10000, 99999)}"
+        if sku not in usados:
+            usados.add(sku)
+            break
+    produto = rng.choice(PRODUTOS)
+    texto = (
+        f"O item {sku} ({produto}) tem garantia de {rng.choice([6, 12, 24, 36])} meses "
+        f"e prazo de reposição de {rng.randint(3, 45)} dias pelo almoxarifado central."
+    )
+    perguntas = [("exata", f"Qual a garantia do item {sku}?")]
+    return texto, sku, perguntas
+
+
+def gerar_corpus(pasta: Path, num_docs: int = 20, paginas_por_doc: int = 5, semente: int = 42) -> List[dict]:
+    """
+    Gera PDFs sintéticos e o arquivo de perguntas rotuladas.
+
+    Cada pergunta aponta para o documento e para um marcador único
+    (código do contrato, artigo ou SKU) presente no trecho que a responde.
+
+    Returns:
+        Lista de perguntas {tipo, pergunta, fonte, pagina, marcador}
+    """
+    rng = random.Random(semente)
+    pasta.mkdir(parents=True, exist_ok=True)
+    usados: set = set()
+    perguntas: List[dict] = []
+
+    for d in range(num_docs):
+        politica = POLITICAS[d % len(POLITICAS)] + f" {2020 + d // len(POLITICAS)}"
+        fonte = f"manual_{d:03d}.pdf"
+        paginas = []
+        for p in range(paginas_por_doc):
+            paragrafos = [f"{politica} - página {p + 1}"]
+            for _ in range(rng.randint(3, 5)):
+                gerador = rng.choice(["contrato", "artigo", "produto"])
+                if gerador == "contrato":
+                    texto, marcador, qs = _fato_contrato(rng, usados)
+                elif gerador == "artigo":
+                    texto, marcador, qs = _fato_artigo(rng, usados, politica)
+                else:
+                    texto, marcador, qs = _fato_produto(rng, usados)
+                paragrafos.append(texto)
+                paragrafos.append(rng.choice(PARAGRAFOS_RUIDO))
+                for tipo, pergunta in qs:
+                    perguntas.append({
+                        "tipo": tipo, "pergunta": pergunta, "fonte": fonte,
+                        "pagina": p, "marcador": marcador,
+                    })
+            paginas.append(paragrafos)
+        escrever_pdf(pasta / fonte, paginas)
+
+    with open(pasta / ARQUIVO_PERGUNTAS, "w", encoding="utf-8") as arquivo:
+        for pergunta in perguntas:
+            arquivo.write(json.dumps(pergunta, ensure_ascii=False) + "\n")
+    return perguntas
+
+
+def carregar_ou_gerar_corpus(
+    pasta: Path = CORPUS_DIR,
+    num_docs: int = 20,
+    paginas_por_doc: int = 5,
+    semente: int = 42,
+    regerar: bool = False,
+) -> List[dict]:
+    """Reaproveita o corpus em disco; gera de novo se faltar ou se pedido."""
+    arquivo = pasta / ARQUIVO_PERGUNTAS
+    if arquivo.exists() and not regerar:
+        with open(arquivo, encoding="utf-8") as f:
+            return [json.loads(linha) for linha in f if linha.strip()]
+    if pasta.exists():
+        shutil.rmtree(pasta)
+    return gerar_corpus(pasta, num_docs, paginas_por_doc, semente)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# MEDIÇÕES
+# ────────────────────────────────────────────────────────────────────────────────
+def _percentis(valores: List[float]) -> dict:
+    import numpy as np
+
+    if not valores:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "media": 0.0}
+    arr = np.asarray(valores)
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "media": round(float(arr.mean()), 3),
+    }
+
+
+def tamanho_diretorio(pasta: Path) -> int:
+    """Soma o tamanho em bytes dos arquivos de um diretório."""
+    return sum(f.stat().st_size for f in pasta.rglob("*") if f.is_file())
+
+
+def _eh_relevante(doc, pergunta: dict) -> bool:
+    conteudo = " ".join(doc.page_content.split())
+    fontes = doc.metadata.get("fontes") or [doc.metadata.get("fonte")]
+    return pergunta["fonte"] in fontes and pergunta["marcador"] in conteudo
+
+
+def medir_ingestao(pasta_corpus: Path, workers: int) -> dict:
+    """Processa e indexa o corpus, medindo páginas/s e chunks/s."""
+    import indexador
+    from processador_pdf import iterar_pdfs_processados
+
+    arquivos = sorted(pasta_corpus.glob("*.pdf"))
+    inicio = time.perf_counter()
+    chunks_por_arquivo = {}
+    for pdf_path, chunks, erro in iterar_pdfs_processados(arquivos, workers):
+        if erro is None:
+            chunks_por_arquivo[pdf_path.name] = chunks
+    tempo_parse = time.perf_counter() - inicio
+
+    paginas = sum(
+        len({c.metadata.get("page") for c in chunks}) for chunks in chunks_por_arquivo.values()
+    )
+    total_chunks = sum(len(chunks) for chunks in chunks_por_arquivo.values())
+
+    inicio = time.perf_counter()
+    for fonte, chunks in chunks_por_arquivo.items():
+        indexador.indexar_documentos(chunks, origem="pasta")
+    tempo_indexacao = time.perf_counter() - inicio
+    total = tempo_parse + tempo_indexacao
+    duplicados = indexador._indice_duplicatas().contar_copias()
+
+    return {
+        "arquivos": len(arquivos),
+        "paginas": paginas,
+        "chunks": total_chunks,
+        "chunks_duplicados": duplicados,
+        "tempo_parse_s": round(tempo_parse, 3),
+        "tempo_indexacao_s": round(tempo_indexacao, 3),
+        "paginas_por_s": round(paginas / total, 2) if total else 0.0,
+        "chunks_por_s": round(total_chunks / total, 2) if total else 0.0,
+    }
+
+
+def medir_consultas(perguntas: List[dict], k: int, modo: str, vectorstore, escopo: bool = False) -> dict:
+    """
+    Roda todas as perguntas e calcula latência, recall@k e MRR.
+
+    Com `escopo`, cada pergunta é restrita ao documento que a responde
+    (como no seletor de documentos do chat), medindo o ganho do pré-filtro.
+    """
+    import indexador
+
+    latencias: List[float] = []
+    acertos: Dict[str, List[float]] = {}
+    reciprocos: List[float] = []
+    for pergunta in perguntas:
+        filtro = indexador.FiltroBusca(fontes=[pergunta["fonte"]]) if escopo else None
+        inicio = time.perf_counter()
+        resultados = indexador.buscar_com_scores(
+            pergunta["pergunta"], k=k, vectorstore=vectorstore, modo=modo, filtro=filtro
+        )
+        latencias.append(1000 * (time.perf_counter() - inicio))
+
+        posicao = next(
+            (i for i, (doc, _) in enumerate(resultados, 1) if _eh_relevante(doc, pergunta)), None
+        )
+        reciprocos.append(1.0 / posicao if posicao else 0.0)
+        acertos.setdefault(pergunta["tipo"], []).append(1.0 if posicao else 0.0)
+
+    todos = [v for valores in acertos.values() for v in valores]
+    return {
+        "latencia_ms": _percentis(latencias),
+        f"recall@{k}": round(sum(todos) / len(todos), 4) if todos else 0.0,
+        "mrr": round(sum(reciprocos) / len(reciprocos), 4) if reciprocos else 0.0,
+        f"recall@{k}_por_tipo": {
+            tipo: round(sum(v) / len(v), 4) for tipo, v in sorted(acertos.items())
+        },
+    }
+
+
+# (nome, compressão, dimensões PCA, reavaliação exata dos candidatos)
+CONFIGURACOES_COMPRESSAO = [
+    ("float16", "float16", 0, True),
+    ("int8", "int8", 0, True),
+    ("int8_pca128", "int8", 128, True),
+    ("int8_pca64", "int8", 64, True),
+    ("int8_pca64_sem_reavaliar", "int8", 64, False),
+]
+
+
+def medir_compressao(perguntas: List[dict], k: int, vectorstore, pasta: Path) -> dict:
+    """
+    Compara o índice float32 completo com as opções compactas do VetorialNumpy.
+
+    Os vetores já indexados são copiados para bases temporárias (um por
+    configuração). Para cada uma, reporta a memória da varredura, o disco
+    total, o recall@k nos rótulos do corpus, a fração do top-k exato
+    recuperada e a latência de busca.
+    """
+    import numpy as np
+    from indexador import _contar_vetores
+    from vectorstore_numpy import VetorialNumpy
+
+    total = _contar_vetores(vectorstore)
+    ids, textos, metadados, vetores = [], [], [], []
+    for inicio in range(0, total, 1000):
+        dados = vectorstore.get(include=["documents", "metadatas", "embeddings"], limit=1000, offset=inicio)
+        ids.extend(dados["ids"])
+        textos.extend(dados["documents"])
+        metadados.extend(dados["metadatas"])
+        vetores.append(np.asarray(dados["embeddings"], dtype=np.float32))
+    matriz = np.concatenate(vetores)
+    consultas = np.asarray(vectorstore.embeddings.embed_documents([p["pergunta"] for p in perguntas]))
+
+    def avaliar(nome: str, vs: VetorialNumpy, referencia: Optional[List[List[str]]]) -> Tuple[dict, List[List[str]]]:
+        vs.adicionar_vetores(ids, textos, metadados, matriz)
+        vs.ajustar_compressao()
+        latencias, encontrados, acertos = [], [], []
+        for pergunta, consulta in zip(perguntas, consultas):
+            inicio = time.perf_counter()
+            resultados = vs.buscar_em_lote([consulta], k=k)[0]
+            latencias.append(1000 * (time.perf_counter() - inicio))
+            encontrados.append([doc.id for doc, _ in resultados])
+            acertos.append(1.0 if any(_eh_relevante(doc, pergunta) for doc, _ in resultados) else 0.0)
+        varredura = vs._compactos if vs._compactos is not None else vs._vetores
+        linhas = len(ids)
+        dados = {
+            "bytes_varredura": int(linhas * varredura.shape[1] * varredura.dtype.itemsize),
+            "bytes_disco": sum(f.stat().st_size for f in vs.pasta.iterdir()),
+            f"recall@{k}": round(sum(acertos) / len(acertos), 4) if acertos else 0.0,
+            f"sobreposicao_exato@{k}": round(
+                float(np.mean([len(set(a) & set(b)) / max(len(b), 1) for a, b in zip(encontrados, referencia)])), 4
+            ) if referencia else 1.0,
+            "latencia_ms": _percentis(latencias),
+        }
+        print(f"   {nome:<26} varredura {dados['bytes_varredura'] / 2**20:7.2f} MB | "
+              f"recall@{k} {dados[f'recall@{k}']:.3f} | top-{k} exato {dados[f'sobreposicao_exato@{k}']:.3f}")
+        return dados, encontrados
+
+    resultado = {}
+    resultado["float32"], referencia = avaliar(
+        "float32", VetorialNumpy(pasta / "float32", vectorstore.embeddings), None
+    )
+    for nome, compressao, pca, reavaliar in CONFIGURACOES_COMPRESSAO:
+        if pca >= matriz.shape[1] or pca > len(ids):
+            continue
+        vs = VetorialNumpy(
+            pasta / nome, vectorstore.embeddings, compressao=compressao, dimensao_pca=pca, reavaliar=reavaliar
+        )
+        resultado[nome], _ = avaliar(nome, vs, referencia)
+
+    base = resultado["float32"]
+    for dados in resultado.values():
+        dados["memoria_economizada"] = round(1 - dados["bytes_varredura"] / base["bytes_varredura"], 4)
+        dados["recall_perdido"] = round(base[f"recall@{k}"] - dados[f"recall@{k}"], 4)
+    return resultado
+
+
+def executar_benchmark(
+    num_docs: int = 20,
+    paginas_por_doc: int = 5,
+    k: int = 3,
+    modos: Optional[List[str]] = None,
+    workers: int = 1,
+    regerar: bool = False,
+    com_cache: bool = False,
+    escopo: bool = False,
+    compressao: bool = False,
+    saida: Optional[Path] = None,
+) -> dict:
+    """
+    Executa o benchmark completo numa base temporária.
+
+    Returns:
+        Dicionário de resultados (também gravado em `saida`, se informado)
+    """
+    modos = modos or ["vetorial", "hibrido"]
+    perguntas = carregar_ou_gerar_corpus(CORPUS_DIR, num_docs, paginas_por_doc, regerar=regerar)
+    print(f"📚 Corpus: {len(list(CORPUS_DIR.glob('*.pdf')))} PDFs | {len(perguntas)} perguntas")
+
+    db_temp = Path(tempfile.mkdtemp(prefix="rag_benchmark_"))
+    os.environ["RAG_DB_DIR"] = str(db_temp / "db")
+    if not com_cache:
+        os.environ["RAG_CACHE_EMBEDDINGS"] = "0"
+        os.environ["RAG_CACHE_EXTRACAO"] = "0"
+
+    # Importa só depois de configurar o ambiente (caminhos são lidos na importação)
+    import indexador
+    import processador_pdf
+
+    try:
+        print("🔮 Medindo ingestão...")
+        ingestao = medir_ingestao(CORPUS_DIR, workers)
+        vectorstore = indexador.criar_ou_carregar_vectorstore()
+        # Aquecimento: primeira consulta carrega modelo/índices
+        indexador.buscar_com_scores("aquecimento", k=k, vectorstore=vectorstore)
+
+        resultado = {
+            "config": {
+                "chunk_size": processador_pdf.CHUNK_SIZE,
+                "chunk_overlap": processador_pdf.CHUNK_OVERLAP,
+                "modelo_embeddings": indexador.MODELO_EMBEDDINGS,
+                "backend_embeddings": indexador.BACKEND_EMBEDDINGS,
+                "backend_vetorial": indexador.BACKEND_VETORIAL,
+                "k": k,
+                "documentos": num_docs,
+                "paginas_por_documento": paginas_por_doc,
+                "perguntas": len(perguntas),
+            },
+            "ingestao": ingestao,
+            "indice": {
+                "tamanho_mb": round(tamanho_diretorio(indexador.DB_DIR) / 2**20, 3),
+                "chunks": indexador.contar_documentos(vectorstore),
+            },
+            "consultas": {},
+        }
+        for modo in modos:
+            print(f"🔍 Medindo consultas ({modo})...")
+            resultado["consultas"][modo] = medir_consultas(perguntas, k, modo, vectorstore)
+            if escopo:
+                print(f"🎯 Medindo consultas restritas ao documento ({modo})...")
+                resultado["consultas"][f"{modo}_escopo"] = medir_consultas(
+                    perguntas, k, modo, vectorstore, escopo=True
+                )
+        if compressao:
+            print("🗜️  Medindo índices compactos (memória x recall)...")
+            resultado["compressao"] = medir_compressao(perguntas, k, vectorstore, db_temp / "compressao")
+    finally:
+        shutil.rmtree(db_temp, ignore_errors=True)
+
+    print()
+    print(f"📥 Ingestão: {ingestao['paginas_por_s']} páginas/s | {ingestao['chunks_por_s']} chunks/s")
+    print(f"💽 Índice: {resultado['indice']['tamanho_mb']} MB ({resultado['indice']['chunks']} chunks)")
+    if ingestao["chunks_duplicados"]:
+        print(f"🔗 Quase-duplicatas ligadas: {ingestao['chunks_duplicados']} de {ingestao['chunks']} chunks")
+    for modo, dados in resultado["consultas"].items():
+        lat = dados["latencia_ms"]
+        print(
+            f"🔍 {modo:<16} p50 {lat['p50']:.1f} ms | p95 {lat['p95']:.1f} ms | "
+            f"p99 {lat['p99']:.1f} ms | recall@{k} {dados[f'recall@{k}']:.3f} | MRR {dados['mrr']:.3f}"
+        )
+
+    if saida:
+        saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\n💾 Resultado salvo em {saida}")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de recuperação do Assistente RAG")
+    parser.add_argument("--docs", type=int, default=20, help="Documentos no corpus sintético")
+    parser.add_argument("--paginas", type=int, default=5, help="Páginas por documento")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--modos", nargs="+", default=["vetorial", "hibrido"])
+    parser.add_argument("--workers", type=int, default=1, help="Processos de leitura de PDF")
+    parser.add_argument("--regerar", action="store_true", help="Regera o corpus sintético")
+    parser.add_argument("--com-cache", action="store_true", help="Mantém os caches de embeddings e de extração ligados")
+    parser.add_argument("--escopo", action="store_true", help="Mede também buscas restritas ao documento")
+    parser.add_argument("--compressao", action="store_true", help="Compara float16/int8/PCA com o float32")
+    parser.add_argument("--saida", type=Path, default=Path("benchmark_rag.json"))
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  BENCHMARK DE RECUPERAÇÃO - Assistente RAG")
+    print("=" * 60)
+    executar_benchmark(
+        num_docs=args.docs,
+        paginas_por_doc=args.paginas,
+        k=args.k,
+        modos=args.modos,
+        workers=args.workers,
+        regerar=args.regerar,
+        com_cache=args.com_cache,
+        escopo=args.escopo,
+        compressao=args.compressao,
+        saida=args.saida,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Cache de Embeddings - Assistente Corporativo RAG
+Guarda em SQLite os vetores já calculados, chaveados por modelo + hash do texto
+"""
+
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from langchain_core.embeddings import Embeddings
+
+# Limite padrão de entradas (~1,5 KB por vetor de 384 dimensões em float32)
+MAX_ENTRADAS_PADRAO = 100_000
+
+
+def normalizar_texto(texto: str) -> str:
+    """Normaliza Unicode (NFC) e colapsa espaços em branco."""
+    return " ".join(unicodedata.normalize("NFC", texto).split())
+
+
+def chave_cache(modelo: str, texto: str) -> str:
+    """Gera a chave do cache: SHA-256 de modelo + texto normalizado."""
+    conteudo = f"{modelo}\x00{normalizar_texto(texto)}"
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+class EmbeddingsComCache(Embeddings):
+    """
+    Wrapper de Embeddings com cache persistente em SQLite.
+
+    Textos já vistos são lidos do disco em vez de passar pelo modelo.
+    A tabela é limitada a `max_entradas` com descarte LRU (menos usado
+    recentemente) e contadores de acertos/faltas ficam em `estatisticas()`.
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        modelo: str,
+        caminho: Path,
+        max_entradas: int = MAX_ENTRADAS_PADRAO,
+    ):
+        self.base = base
+        self.modelo = modelo
+        self.caminho = Path(caminho)
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.faltas = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Contagem corrente das entradas: evita um COUNT(*) (varredura) a cada gravação
+        self._entradas = 0
+
+    # ── Armazenamento ───────────────────────────────────────────────────────────
+    def _conexao(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    chave TEXT PRIMARY KEY,
+                    vetor BLOB NOT NULL,
+                    ultimo_acesso REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ultimo_acesso ON embeddings (ultimo_acesso)"
+            )
+            (self._entradas,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return self._conn
+
+    def _ler(self, chaves: List[str]) -> Dict[str, List[float]]:
+        """Busca vetores no cache e atualiza o instante de acesso (LRU)."""
+        encontrados: Dict[str, List[float]] = {}
+        conn = self._conexao()
+        unicas = list(dict.fromkeys(chaves))
+        # SQLite limita o número de parâmetros por consulta
+        for inicio in range(0, len(unicas), 500):
+            lote = unicas[inicio:inicio + 500]
+            marcadores = ",".join("?" * len(lote))
+            for chave, blob in conn.execute(
+                f"SELECT chave, vetor FROM embeddings WHERE chave IN ({marcadores})", lote
+            ):
+                encontrados[chave] = array("f", blob).tolist()
+        if encontrados:
+            agora = time.time()
+            conn.executemany(
+                "UPDATE embeddings SET ultimo_acesso = ? WHERE chave = ?",
+                [(agora, chave) for chave in encontrados],
+            )
+            conn.commit()
+        return encontrados
+
+    def _gravar(self, novos: Dict[str, List[float]]) -> None:
+        """Grava vetores novos e descarta os menos usados acima do limite."""
+        conn = self._conexao()
+        agora = time.time()
+        # Chaves já presentes (outra thread pode ter gravado o mesmo texto) não aumentam a contagem
+        chaves = list(novos)
+        existentes = 0
+        for inicio in range(0, len(chaves), 500):
+            lote = chaves[inicio:inicio + 500]
+            marcadores = ",".join("?" * len(lote))
+            (quantidade,) = conn.execute(
+                f"SELECT COUNT(*) FROM embeddings WHERE chave IN ({marcadores})", lote
+            ).fetchone()
+            existentes += quantidade
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (chave, vetor, ultimo_acesso) VALUES (?, ?, ?)",
+            [(chave, array("f", vetor).tobytes(), agora) for chave, vetor in novos.items()],
+        )
+        self._entradas += len(chaves) - existentes
+        excesso = self._entradas - self.max_entradas
+        if excesso > 0:
+            cursor = conn.execute(
+                """
+                DELETE FROM embeddings WHERE chave IN (
+                    SELECT chave FROM embeddings ORDER BY ultimo_acesso ASC LIMIT ?
+                )
+                """,
+                (excesso,),
+            )
+            self._entradas -= cursor.rowcount
+        conn.commit()
+
+    # ── Interface Embeddings ────────────────────────────────────────────────────
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        chaves = [chave_cache(self.modelo, texto) for texto in texts]
+        with self._lock:
+            encontrados = self._ler(chaves)
+
+        # Calcula apenas os textos ausentes (sem repetir duplicatas do lote)
+        pendentes: Dict[str, str] = {}
+        for chave, texto in zip(chaves, texts):
+            if chave not in encontrados and chave not in pendentes:
+                pendentes[chave] = texto
+
+        novos: Dict[str, List[float]] = {}
+        if pendentes:
+            vetores = self.base.embed_documents(list(pendentes.values()))
+            novos = dict(zip(pendentes.keys(), vetores))
+            with self._lock:
+                self._gravar(novos)
+
+        with self._lock:
+            self.faltas += len(pendentes)
+            self.acertos += len(texts) - len(pendentes)
+
+        return [encontrados.get(chave) or novos[chave] for chave in chaves]
+
+    def embed_query(self, text: str) -> List[float]:
+        chave = chave_cache(self.modelo, text)
+        with self._lock:
+            encontrado = self._ler([chave]).get(chave)
+            if encontrado is not None:
+                self.acertos += 1
+                return encontrado
+        vetor = self.base.embed_query(text)
+        with self._lock:
+            self.faltas += 1
+            self._gravar({chave: vetor})
+        return vetor
+
+    # ── Métricas ────────────────────────────────────────────────────────────────
+    def estatisticas(self) -> dict:
+        """Retorna contadores de acertos/faltas e ocupação do cache."""
+        with self._lock:
+            self._conexao()
+            entradas = self._entradas
+            total = self.acertos + self.faltas
+            return {
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "taxa_acerto": self.acertos / total if total else 0.0,
+                "entradas": entradas,
+                "max_entradas": self.max_entradas,
+            }
+
+    def limpar(self) -> None:
+        """Remove todas as entradas do cache e zera os contadores."""
+        with self._lock:
+            conn = self._conexao()
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+            self._entradas = 0
+            self.acertos = 0
+            self.faltas = 0
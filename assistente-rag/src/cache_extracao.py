@@ -0,0 +1,198 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Cache de Extração de PDFs - Assistente Corporativo RAG
+Guarda em SQLite o texto e os metadados de cada página já extraída,
+chaveados pelo SHA-256 do arquivo
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+import json
+import sqlite3
+import time
+
+from langchain_core.documents import Document
+
+MAX_MB_PADRAO = 512
+MAX_DIAS_PADRAO = 30
+# Extrações interrompidas (consumidor parou no meio) viram lixo depois disso
+EXPIRACAO_INCOMPLETAS_S = 3600
+# Metadados que dependem de onde o arquivo está, não do conteúdo
+_METADADOS_DO_CAMINHO = ("source", "fonte")
+
+
+class CacheExtracao:
+    """
+    Texto extraído por página, reaproveitado entre uploads, reindexações e
+    mudanças de CHUNK_SIZE.
+
+    Limitado a `max_mb` de texto com descarte LRU por arquivo, e entradas
+    sem uso há mais de `max_dias` são removidas. Entradas de outro
+    `extrator` (versão do leitor de PDF) são ignoradas.
+    """
+
+    def __init__(
+        self,
+        caminho: Path,
+        extrator: str,
+        max_mb: float = MAX_MB_PADRAO,
+        max_dias: float = MAX_DIAS_PADRAO,
+    ):
+        self.caminho = Path(caminho)
+        self.extrator = extrator
+        self.max_bytes = int(max_mb * 2**20)
+        self.max_idade_s = max_dias * 86400
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão por operação (commit ao sair, sempre fechada)."""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        # Workers de leitura em processos separados compartilham o arquivo
+        conn = sqlite3.connect(str(self.caminho), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS arquivos (
+                hash TEXT PRIMARY KEY,
+                extrator TEXT NOT NULL,
+                paginas INTEGER NOT NULL DEFAULT 0,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                completo INTEGER NOT NULL DEFAULT 0,
+                ultimo_acesso REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_arquivos_acesso ON arquivos (ultimo_acesso);
+            CREATE TABLE IF NOT EXISTS paginas (
+                hash TEXT NOT NULL,
+                numero INTEGER NOT NULL,
+                texto TEXT NOT NULL,
+                metadados TEXT NOT NULL,
+                PRIMARY KEY (hash, numero)
+            ) WITHOUT ROWID;
+            """
+        )
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _registro(self, conn: sqlite3.Connection, hash_arquivo: str) -> Optional[tuple]:
+        registro = conn.execute(
+            "SELECT paginas, ultimo_acesso FROM arquivos WHERE hash = ? AND extrator = ? AND completo = 1",
+            (hash_arquivo, self.extrator),
+        ).fetchone()
+        if registro is None or time.time() - registro[1] > self.max_idade_s:
+            return None
+        return registro
+
+    def contar_paginas(self, hash_arquivo: str) -> Optional[int]:
+        """Páginas do arquivo em cache (None se não estiver)."""
+        if not self.caminho.exists():
+            return None
+        with self._conectar() as conn:
+            registro = self._registro(conn, hash_arquivo)
+        return registro[0] if registro else None
+
+    def ler(self, hash_arquivo: str) -> Optional[Iterator[Document]]:
+        """
+        Páginas em cache, lidas uma a uma do disco.
+
+        Returns:
+            Iterador de Documents (sem 'source'/'fonte'), ou None se o
+            arquivo não estiver em cache
+        """
+        if not self.caminho.exists():
+            return None
+        with self._conectar() as conn:
+            if self._registro(conn, hash_arquivo) is None:
+                return None
+            conn.execute(
+                "UPDATE arquivos SET ultimo_acesso = ? WHERE hash = ?", (time.time(), hash_arquivo)
+            )
+        return self._iterar(hash_arquivo)
+
+    def _iterar(self, hash_arquivo: str) -> Iterator[Document]:
+        with self._conectar() as conn:
+            for texto, metadados in conn.execute(
+                "SELECT texto, metadados FROM paginas WHERE hash = ? ORDER BY numero", (hash_arquivo,)
+            ):
+                yield Document(page_content=texto, metadata=json.loads(metadados))
+
+    def gravar(self, hash_arquivo: str, paginas: Iterable[Document]) -> Iterator[Document]:
+        """
+        Repassa as páginas extraídas gravando cada uma no cache.
+
+        A entrada só passa a valer quando o iterável termina; se o consumidor
+        parar antes, ela é descartada na próxima limpeza.
+
+        Yields:
+            As mesmas páginas recebidas
+        """
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM paginas WHERE hash = ?", (hash_arquivo,))
+            conn.execute(
+                "INSERT OR REPLACE INTO arquivos (hash, extrator, completo, ultimo_acesso) VALUES (?, ?, 0, ?)",
+                (hash_arquivo, self.extrator, time.time()),
+            )
+
+        numero = 0
+        total_bytes = 0
+        with self._conectar() as conn:
+            for pagina in paginas:
+                metadados = {k: v for k, v in pagina.metadata.items() if k not in _METADADOS_DO_CAMINHO}
+                conn.execute(
+                    "INSERT OR REPLACE INTO paginas (hash, numero, texto, metadados) VALUES (?, ?, ?, ?)",
+                    (hash_arquivo, numero, pagina.page_content, json.dumps(metadados, ensure_ascii=False)),
+                )
+                # Não segura a escrita enquanto a próxima página é extraída
+                conn.commit()
+                numero += 1
+                total_bytes += len(pagina.page_content.encode("utf-8"))
+                yield pagina
+
+            conn.execute(
+                "UPDATE arquivos SET paginas = ?, bytes = ?, completo = 1, ultimo_acesso = ? WHERE hash = ?",
+                (numero, total_bytes, time.time(), hash_arquivo),
+            )
+            self._podar(conn)
+
+    def _podar(self, conn: sqlite3.Connection) -> None:
+        """Remove entradas vencidas, incompletas abandonadas e as menos usadas acima do limite."""
+        agora = time.time()
+        descartar = [
+            hash_arquivo for (hash_arquivo,) in conn.execute(
+                "SELECT hash FROM arquivos WHERE ultimo_acesso < ? OR extrator != ? "
+                "OR (completo = 0 AND ultimo_acesso < ?)",
+                (agora - self.max_idade_s, self.extrator, agora - EXPIRACAO_INCOMPLETAS_S),
+            )
+        ]
+        total = 0
+        for hash_arquivo, tamanho in conn.execute(
+            "SELECT hash, bytes FROM arquivos WHERE completo = 1 ORDER BY ultimo_acesso DESC"
+        ).fetchall():
+            total += tamanho
+            if total > self.max_bytes and hash_arquivo not in descartar:
+                descartar.append(hash_arquivo)
+        for hash_arquivo in descartar:
+            conn.execute("DELETE FROM paginas WHERE hash = ?", (hash_arquivo,))
+            conn.execute("DELETE FROM arquivos WHERE hash = ?", (hash_arquivo,))
+
+    def estatisticas(self) -> dict:
+        """Arquivos, páginas e megabytes de texto em cache."""
+        if not self.caminho.exists():
+            return {"arquivos": 0, "paginas": 0, "mb": 0.0}
+        with self._conectar() as conn:
+            arquivos, paginas, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(paginas), 0), COALESCE(SUM(bytes), 0) "
+                "FROM arquivos WHERE completo = 1"
+            ).fetchone()
+        return {"arquivos": arquivos, "paginas": paginas, "mb": round(total / 2**20, 2)}
+
+    def limpar(self) -> None:
+        """Remove todas as entradas."""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM paginas")
+            conn.execute("DELETE FROM arquivos")
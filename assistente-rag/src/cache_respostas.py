@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Cache Semântico de Respostas - Assistente Corporativo RAG
+Reaproveita respostas do LLM para perguntas quase idênticas
+"""
+
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Tuple
+import threading
+
+import numpy as np
+
+# Similaridade de cosseno mínima para considerar duas perguntas equivalentes
+LIMIAR_SIMILARIDADE_PADRAO = 0.95
+MAX_ENTRADAS_PADRAO = 500
+
+
+class CacheRespostas:
+    """
+    Cache de respostas chaveado pelo embedding da pergunta.
+
+    Uma pergunta é acerto quando o cosseno com alguma pergunta já
+    respondida passa do limiar. Cada entrada guarda a versão da coleção
+    em que foi gerada; ao mudar a versão (documentos indexados ou
+    removidos) o cache inteiro é descartado.
+    """
+
+    def __init__(
+        self,
+        limiar: float = LIMIAR_SIMILARIDADE_PADRAO,
+        max_entradas: int = MAX_ENTRADAS_PADRAO,
+    ):
+        self.limiar = limiar
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.faltas = 0
+        self._versao: Any = None
+        self._entradas: "OrderedDict[int, Tuple[np.ndarray, Any]]" = OrderedDict()
+        self._matriz: Optional[np.ndarray] = None
+        self._chaves: list = []
+        self._proxima_chave = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalizar(vetor: Sequence[float]) -> np.ndarray:
+        vetor = np.asarray(vetor, dtype=np.float32)
+        norma = np.linalg.norm(vetor)
+        return vetor / norma if norma else vetor
+
+    def _sincronizar_versao(self, versao: Any) -> None:
+        if versao != self._versao:
+            self._entradas.clear()
+            self._matriz = None
+            self._versao = versao
+
+    def buscar(self, vetor_query: Sequence[float], versao: Any) -> Optional[Any]:
+        """
+        Procura uma resposta para pergunta semanticamente equivalente.
+
+        Args:
+            vetor_query: Embedding da pergunta
+            versao: Versão atual da coleção
+
+        Returns:
+            Valor guardado ou None se não houver acerto
+        """
+        vetor = self._normalizar(vetor_query)
+        with self._lock:
+            self._sincronizar_versao(versao)
+            if not self._entradas:
+                self.faltas += 1
+                return None
+            if self._matriz is None:
+                self._chaves = list(self._entradas)
+                self._matriz = np.stack([self._entradas[c][0] for c in self._chaves])
+            similaridades = self._matriz @ vetor
+            melhor = int(np.argmax(similaridades))
+            if similaridades[melhor] < self.limiar:
+                self.faltas += 1
+                return None
+            chave = self._chaves[melhor]
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return self._entradas[chave][1]
+
+    def guardar(self, vetor_query: Sequence[float], versao: Any, valor: Any) -> None:
+        """Guarda um valor para a pergunta, descartando o menos usado se cheio."""
+        vetor = self._normalizar(vetor_query)
+        with self._lock:
+            self._sincronizar_versao(versao)
+            self._entradas[self._proxima_chave] = (vetor, valor)
+            self._proxima_chave += 1
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+            self._matriz = None
+
+    def estatisticas(self) -> dict:
+        """Retorna acertos, faltas e ocupação do cache."""
+        with self._lock:
+            total = self.acertos + self.faltas
+            return {
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "taxa_acerto": self.acertos / total if total else 0.0,
+                "entradas": len(self._entradas),
+            }
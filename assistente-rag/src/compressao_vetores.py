@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Compressão de Vetores - Assistente Corporativo RAG
+Representação compacta (float16 ou int8 com escala por dimensão, opcionalmente
+após PCA) usada na primeira passada da busca do VetorialNumpy
+"""
+
+from pathlib import Path
+from typing import Optional
+import os
+
+import numpy as np
+
+METODOS = ("float16", "int8")
+AMOSTRA_MAXIMA = 20000      # Vetores usados para ajustar PCA e escalas
+LIMITE_INT8 = 127
+
+
+class CompressorVetores:
+    """
+    Codifica vetores normalizados numa matriz compacta para a busca aproximada.
+
+    Os vetores são centralizados pela média e, com `dimensao` > 0,
+    projetados nos primeiros componentes principais. No int8 cada dimensão
+    tem sua própria escala (maior valor absoluto da amostra de ajuste).
+
+    O produto interno com a consulta é preservado a menos de uma constante
+    por consulta (média · consulta), então o ranking pode ser feito direto
+    sobre os códigos; a escala do int8 é aplicada na consulta, não na matriz.
+    """
+
+    def __init__(self, metodo: str = "int8", dimensao: int = 0):
+        if metodo not in METODOS:
+            raise ValueError(f"Compressão desconhecida: {metodo} (use {', '.join(METODOS)})")
+        self.metodo = metodo
+        self.dimensao = dimensao
+        self.media: Optional[np.ndarray] = None
+        self.componentes: Optional[np.ndarray] = None   # (dimensão reduzida x original) ou None
+        self.escala: Optional[np.ndarray] = None        # Só no int8
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.int8 if self.metodo == "int8" else np.float16)
+
+    @property
+    def ajustado(self) -> bool:
+        return self.media is not None
+
+    def dimensao_saida(self, dimensao_original: int) -> int:
+        return self.componentes.shape[0] if self.componentes is not None else dimensao_original
+
+    def compativel(self, metodo: str, dimensao: int) -> bool:
+        return self.ajustado and self.metodo == metodo and self.dimensao == dimensao
+
+    def ajustar(self, amostra: np.ndarray, semente: int = 0) -> None:
+        """
+        Ajusta média, componentes principais e escalas a uma amostra de vetores.
+
+        Args:
+            amostra: Vetores normalizados (n x dimensão), n >= `dimensao`
+        """
+        amostra = np.asarray(amostra, dtype=np.float32)
+        if len(amostra) > AMOSTRA_MAXIMA:
+            rng = np.random.default_rng(semente)
+            amostra = amostra[rng.choice(len(amostra), AMOSTRA_MAXIMA, replace=False)]
+        self.media = amostra.mean(axis=0)
+        centralizada = amostra - self.media
+
+        self.componentes = None
+        if 0 < self.dimensao < amostra.shape[1]:
+            if len(amostra) < self.dimensao:
+                raise ValueError(f"PCA com {self.dimensao} dimensões precisa de ao menos {self.dimensao} vetores")
+            _, _, vt = np.linalg.svd(centralizada, full_matrices=False)
+            self.componentes = np.ascontiguousarray(vt[:self.dimensao], dtype=np.float32)
+
+        if self.metodo == "int8":
+            maximos = np.abs(self._projetar(centralizada)).max(axis=0)
+            self.escala = np.clip(maximos, 1e-6, None).astype(np.float32) / LIMITE_INT8
+
+    def _projetar(self, centralizados: np.ndarray) -> np.ndarray:
+        if self.componentes is None:
+            return centralizados
+        return centralizados @ self.componentes.T
+
+    def codificar(self, vetores: np.ndarray) -> np.ndarray:
+        """Vetores normalizados (n x dimensão) → códigos compactos."""
+        projetados = self._projetar(np.asarray(vetores, dtype=np.float32) - self.media)
+        if self.metodo == "float16":
+            return projetados.astype(np.float16)
+        codigos = np.rint(projetados / self.escala)
+        return np.clip(codigos, -LIMITE_INT8, LIMITE_INT8).astype(np.int8)
+
+    def preparar_consultas(self, consultas: np.ndarray) -> np.ndarray:
+        """
+        Consultas normalizadas → vetores que, multiplicados pelos códigos
+        (convertidos para float32), dão o score aproximado de cada linha.
+        """
+        preparadas = np.asarray(consultas, dtype=np.float32)
+        if self.componentes is not None:
+            preparadas = preparadas @ self.componentes.T
+        if self.escala is not None:
+            preparadas = preparadas * self.escala
+        return np.ascontiguousarray(preparadas, dtype=np.float32)
+
+    # ── Persistência ────────────────────────────────────────────────────────────
+    def salvar(self, caminho: Path) -> None:
+        dados = {"metodo": np.array(self.metodo), "dimensao": np.array(self.dimensao), "media": self.media}
+        if self.componentes is not None:
+            dados["componentes"] = self.componentes
+        if self.escala is not None:
+            dados["escala"] = self.escala
+        tmp_path = caminho.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **dados)
+        os.replace(tmp_path, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> Optional["CompressorVetores"]:
+        """Compressor salvo em `caminho` (None se não existir)."""
+        if not caminho.exists():
+            return None
+        with np.load(caminho) as dados:
+            compressor = cls(str(dados["metodo"]), int(dados["dimensao"]))
+            compressor.media = dados["media"]
+            compressor.componentes = dados["componentes"] if "componentes" in dados else None
+            compressor.escala = dados["escala"] if "escala" in dados else None
+        return compressor
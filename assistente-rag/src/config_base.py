@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Diretórios da Base - Assistente Corporativo RAG
+Local único do DB_DIR, compartilhado pelo indexador e pelo processador de PDFs
+(que guarda o cache de extração ao lado da base vetorial)
+"""
+
+from pathlib import Path
+import os
+import tempfile
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Detecta Streamlit Cloud: filesystem é readonly exceto /tmp
+# Variáveis que indicam ambiente cloud: HOME=/home/adminuser ou mount path /mount/src
+_is_cloud = (
+    os.getenv("HOME") == "/home/adminuser"
+    or str(BASE_DIR).startswith("/mount/src")
+    or not os.access(str(BASE_DIR), os.W_OK)
+)
+
+if os.getenv("RAG_DB_DIR"):
+    # Permite bases isoladas (benchmarks, testes) sem tocar na base principal
+    DB_DIR = Path(os.environ["RAG_DB_DIR"])
+elif _is_cloud:
+    DB_DIR = Path(tempfile.gettempdir()) / "assistente_rag_db"
+else:
+    DB_DIR = BASE_DIR / "db_store"
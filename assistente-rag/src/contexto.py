@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Montagem de Contexto - Assistente Corporativo RAG
+Junta chunks vizinhos do mesmo documento e página, remove o texto repetido
+pela sobreposição (CHUNK_OVERLAP) e encaixa o conteúdo mais relevante num
+orçamento de tokens do prompt
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import math
+
+ORCAMENTO_CONTEXTO_PADRAO = 1500    # Tokens de contexto por pergunta
+CARACTERES_POR_TOKEN = 4.0          # Estimativa para modelos Gemini em português
+SOBREPOSICAO_MAXIMA = 400           # Caracteres procurados na junção de dois chunks
+SOBREPOSICAO_MINIMA = 20            # Abaixo disso a coincidência é tratada como acaso
+MIN_TOKENS_TRUNCAR = 60             # Sobra mínima para incluir um bloco truncado
+SEPARADOR_TRECHOS = "\n[…]\n"       # Entre chunks da mesma página que não se tocam
+
+TEMPLATE_PROMPT = """Você é um assistente corporativo inteligente. Use APENAS as informações do contexto abaixo para responder à pergunta. Se a informação não estiver no contexto, diga que não encontrou a informação nos documentos.
+
+CONTEXTO:
+{contexto}
+
+PERGUNTA: {pergunta}
+
+RESPOSTA (seja conciso e objetivo):"""
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa de tokens pelo número de caracteres."""
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN)
+
+
+def _sobreposicao(anterior: str, seguinte: str) -> int:
+    """Tamanho do maior sufixo de `anterior` que é prefixo de `seguinte`."""
+    limite = min(len(anterior), len(seguinte), SOBREPOSICAO_MAXIMA)
+    for tamanho in range(limite, SOBREPOSICAO_MINIMA - 1, -1):
+        if anterior.endswith(seguinte[:tamanho]):
+            return tamanho
+    return 0
+
+
+def _cabecalho(indice: int, fonte: str, pagina) -> str:
+    if pagina is None:
+        return f"Trecho {indice} (de {fonte}):"
+    return f"Trecho {indice} (de {fonte}, pág. {pagina}):"
+
+
+def _truncar(texto: str, max_caracteres: int) -> str:
+    """Corta no último fim de frase (ou espaço) antes do limite."""
+    if len(texto) <= max_caracteres:
+        return texto
+    corte = texto[:max_caracteres]
+    fim_frase = max(corte.rfind(". "), corte.rfind(".\n"))
+    if fim_frase > max_caracteres // 2:
+        return corte[:fim_frase + 1] + " …"
+    espaco = corte.rfind(" ")
+    return (corte[:espaco] if espaco > 0 else corte) + " …"
+
+
+def juntar_vizinhos(contextos: List[tuple]) -> Tuple[List[dict], int]:
+    """
+    Agrupa os chunks por (fonte, página) e junta os de cada grupo em ordem.
+
+    Chunks consecutivos perdem o trecho repetido pela sobreposição; os que
+    não se tocam ficam no mesmo bloco separados por SEPARADOR_TRECHOS.
+
+    Args:
+        contextos: Lista de (Document, score), score = distância (menor é melhor)
+
+    Returns:
+        Tuple com (blocos {fonte, pagina, texto, score, chunks}, caracteres removidos)
+    """
+    grupos: Dict[tuple, List[tuple]] = {}
+    for doc, score in contextos:
+        chave = (doc.metadata.get("fonte", "documento"), doc.metadata.get("page"))
+        grupos.setdefault(chave, []).append((doc, score))
+
+    blocos = []
+    removidos = 0
+    for (fonte, pagina), membros in grupos.items():
+        membros.sort(key=lambda par: par[0].metadata.get("chunk_id", 0))
+        texto = ""
+        vistos = set()
+        for doc, _ in membros:
+            conteudo = doc.page_content.strip()
+            if conteudo in vistos:
+                removidos += len(conteudo)
+                continue
+            vistos.add(conteudo)
+            if not texto:
+                texto = conteudo
+                continue
+            repetido = _sobreposicao(texto, conteudo)
+            if repetido:
+                texto += conteudo[repetido:]
+                removidos += repetido
+            else:
+                texto += SEPARADOR_TRECHOS + conteudo
+        blocos.append({
+            "fonte": fonte,
+            "pagina": pagina,
+            "texto": texto,
+            "score": min(score for _, score in membros),
+            "chunks": len(membros),
+        })
+    return blocos, removidos
+
+
+def montar_contexto(
+    contextos: List[tuple],
+    orcamento_tokens: int = ORCAMENTO_CONTEXTO_PADRAO,
+    contar_tokens: Optional[Callable[[str], int]] = None,
+) -> Tuple[str, dict]:
+    """
+    Monta o texto de contexto do prompt dentro do orçamento de tokens.
+
+    Os blocos entram do mais para o menos relevante; o primeiro que não
+    couber é truncado se ainda sobrar espaço útil, e os demais ficam de fora.
+
+    Args:
+        contextos: Lista de (Document, score) da busca
+        orcamento_tokens: Máximo de tokens de contexto
+        contar_tokens: Contador de tokens (padrão: estimativa por caracteres)
+
+    Returns:
+        Tuple com (texto do contexto, relatório de tokens)
+    """
+    contar = contar_tokens or estimar_tokens
+    ingenuo = "\n\n".join(
+        f"Trecho {i} (de {doc.metadata.get('fonte', 'documento')}):\n{doc.page_content}"
+        for i, (doc, _) in enumerate(contextos, 1)
+    )
+
+    blocos, caracteres_removidos = juntar_vizinhos(contextos)
+    blocos.sort(key=lambda bloco: bloco["score"])
+
+    partes: List[str] = []
+    usados = 0
+    truncados = 0
+    descartados = 0
+    for bloco in blocos:
+        cabecalho = _cabecalho(len(partes) + 1, bloco["fonte"], bloco["pagina"])
+        parte = f"{cabecalho}\n{bloco['texto']}"
+        custo = contar(parte) + (1 if partes else 0)
+        if usados + custo <= orcamento_tokens:
+            partes.append(parte)
+            usados += custo
+            continue
+        restante = orcamento_tokens - usados - contar(cabecalho) - 1
+        if restante >= MIN_TOKENS_TRUNCAR and not truncados:
+            texto = _truncar(bloco["texto"], int(restante * CARACTERES_POR_TOKEN))
+            partes.append(f"{cabecalho}\n{texto}")
+            usados += contar(partes[-1]) + 1
+            truncados += 1
+        else:
+            descartados += 1
+
+    texto = "\n\n".join(partes)
+    tokens_originais = contar(ingenuo)
+    tokens_usados = contar(texto)
+    return texto, {
+        "trechos": len(contextos),
+        "blocos": len(partes),
+        "tokens_originais": tokens_originais,
+        "tokens_usados": tokens_usados,
+        "tokens_economizados": max(tokens_originais - tokens_usados, 0),
+        "caracteres_sobrepostos": caracteres_removidos,
+        "blocos_truncados": truncados,
+        "blocos_descartados": descartados,
+        "orcamento_tokens": orcamento_tokens,
+    }
+
+
+def montar_prompt(
+    pergunta: str,
+    contextos: List[tuple],
+    orcamento_tokens: int = ORCAMENTO_CONTEXTO_PADRAO,
+    relatorio: Optional[dict] = None,
+) -> str:
+    """
+    Monta o prompt RAG com os trechos recuperados.
+
+    Args:
+        pergunta: Pergunta do usuário
+        contextos: Lista de (Document, score) recuperados
+        orcamento_tokens: Máximo de tokens de contexto
+        relatorio: Dicionário preenchido com a contagem de tokens do contexto
+
+    Returns:
+        Prompt completo
+    """
+    contexto_texto, estatisticas = montar_contexto(contextos, orcamento_tokens)
+    if relatorio is not None:
+        relatorio.update(estatisticas)
+    return TEMPLATE_PROMPT.format(contexto=contexto_texto, pergunta=pergunta)
@@ -0,0 +1,385 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Detecção de Quase-Duplicatas - Assistente Corporativo RAG
+MinHash + LSH em SQLite para reconhecer chunks repetidos (rodapés, avisos
+legais, políticas copiadas em vários manuais) antes de gerar embeddings
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import re
+import sqlite3
+import unicodedata
+import zlib
+
+import numpy as np
+from langchain_core.documents import Document
+
+NUM_PERMUTACOES = 128
+BANDAS = 16                 # 16 bandas x 8 linhas: pares com Jaccard >= 0,9 colidem em ~100% dos casos
+TAMANHO_SHINGLE = 5         # Palavras por shingle
+LIMIAR_PADRAO = 0.9         # Jaccard estimado a partir do qual o chunk é tratado como cópia
+
+_PRIMO = (1 << 31) - 1
+_rng = np.random.default_rng(20260417)
+_COEF_A = _rng.integers(1, _PRIMO, NUM_PERMUTACOES, dtype=np.uint64)
+_COEF_B = _rng.integers(0, _PRIMO, NUM_PERMUTACOES, dtype=np.uint64)
+_REGEX_PALAVRA = re.compile(r"\w+")
+
+
+def _palavras(texto: str) -> List[str]:
+    sem_acento = unicodedata.normalize("NFKD", texto.lower())
+    sem_acento = "".join(c for c in sem_acento if not unicodedata.combining(c))
+    return _REGEX_PALAVRA.findall(sem_acento)
+
+
+def assinatura_minhash(texto: str) -> np.ndarray:
+    """
+    Assinatura MinHash (NUM_PERMUTACOES valores uint32) dos shingles de palavras.
+
+    Caixa, acentos, pontuação e espaços não influenciam; textos com menos
+    de TAMANHO_SHINGLE palavras viram um único shingle.
+    """
+    palavras = _palavras(texto)
+    n = max(len(palavras) - TAMANHO_SHINGLE + 1, 1)
+    shingles = {" ".join(palavras[i:i + TAMANHO_SHINGLE]) for i in range(n)}
+    valores = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) % _PRIMO for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    permutados = (valores[:, None] * _COEF_A + _COEF_B) % _PRIMO
+    return permutados.min(axis=0).astype(np.uint32)
+
+
+def similaridade(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard estimado entre duas assinaturas."""
+    return float(np.mean(a == b))
+
+
+def _chaves_bandas(assinatura: np.ndarray) -> List[Tuple[int, int]]:
+    linhas = NUM_PERMUTACOES // BANDAS
+    return [
+        (banda, int.from_bytes(
+            hashlib.blake2b(assinatura[banda * linhas:(banda + 1) * linhas].tobytes(), digest_size=8).digest(),
+            "little", signed=True,
+        ))
+        for banda in range(BANDAS)
+    ]
+
+
+class Separacao:
+    """
+    Resultado de `IndiceDuplicatas.separar`, ainda não gravado no índice.
+
+    Guarda as assinaturas e bandas dos canônicos novos, para reconhecer
+    cópias dentro do mesmo lote antes de eles existirem no SQLite.
+    """
+
+    def __init__(self):
+        self.novos_ids: List[str] = []
+        self.novos_chunks: List[Document] = []
+        self.ligacoes: Dict[str, str] = {}
+        self.copias: List[Tuple[str, Document]] = []
+        self.assinaturas: Dict[str, np.ndarray] = {}
+        self.bandas: Dict[Tuple[int, int], List[str]] = {}
+
+    def adicionar_canonico(self, chunk_id: str, chunk: Document, assinatura: np.ndarray) -> None:
+        self.novos_ids.append(chunk_id)
+        self.novos_chunks.append(chunk)
+        self.assinaturas[chunk_id] = assinatura
+        for chave in _chaves_bandas(assinatura):
+            self.bandas.setdefault(chave, []).append(chunk_id)
+
+    def ligar(self, chunk_id: str, chunk: Document, canonico: str) -> None:
+        self.copias.append((chunk_id, chunk))
+        self.ligacoes[chunk_id] = canonico
+
+
+class IndiceDuplicatas:
+    """
+    Índice LSH dos chunks canônicos e registro das cópias ligadas a eles.
+
+    Só os canônicos têm vetor na base; cada cópia guarda o próprio texto e
+    metadados para poder ser promovida se o canônico for removido.
+    """
+
+    def __init__(self, caminho: Path, limiar: float = LIMIAR_PADRAO):
+        self.caminho = Path(caminho)
+        self.limiar = limiar
+        self._esquema_criado = False
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão por operação (commit ao sair, sempre fechada)."""
+        # O esquema só é recriado se o arquivo sumiu (ex.: base limpa por outro caminho)
+        criar_esquema = not self._esquema_criado or not self.caminho.exists()
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.caminho))
+        if criar_esquema:
+            self._criar_esquema(conn)
+            self._esquema_criado = True
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _criar_esquema(conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS canonicos (
+                chunk_id TEXT PRIMARY KEY,
+                assinatura BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bandas (
+                banda INTEGER NOT NULL,
+                chave INTEGER NOT NULL,
+                chunk_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bandas_chave ON bandas (banda, chave);
+            CREATE INDEX IF NOT EXISTS idx_bandas_chunk ON bandas (chunk_id);
+            CREATE TABLE IF NOT EXISTS copias (
+                chunk_id TEXT PRIMARY KEY,
+                canonico TEXT NOT NULL,
+                fonte TEXT,
+                pagina INTEGER,
+                texto TEXT NOT NULL,
+                metadados TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_copias_canonico ON copias (canonico);
+            CREATE INDEX IF NOT EXISTS idx_copias_fonte ON copias (fonte);
+            """
+        )
+
+    @staticmethod
+    def _em_lotes(ids: Sequence[str]) -> Iterator[Tuple[list, str]]:
+        lista = list(ids)
+        for inicio in range(0, len(lista), 500):
+            lote = lista[inicio:inicio + 500]
+            yield lote, ",".join("?" * len(lote))
+
+    def _registrar_canonico(self, conn: sqlite3.Connection, chunk_id: str, assinatura: np.ndarray) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO canonicos (chunk_id, assinatura) VALUES (?, ?)",
+            (chunk_id, assinatura.tobytes()),
+        )
+        conn.execute("DELETE FROM bandas WHERE chunk_id = ?", (chunk_id,))
+        conn.executemany(
+            "INSERT INTO bandas (banda, chave, chunk_id) VALUES (?, ?, ?)",
+            [(banda, chave, chunk_id) for banda, chave in _chaves_bandas(assinatura)],
+        )
+
+    def separar(self, ids: Sequence[str], chunks: Sequence[Document]) -> Separacao:
+        """
+        Separa os chunks novos das cópias de chunks já indexados (ou de
+        outro chunk do mesmo lote), sem gravar nada no índice.
+
+        Chame `registrar` com o resultado só depois que os chunks novos
+        estiverem na base vetorial: se o embedding falhar, o índice não
+        fica com canônicos sem vetor.
+
+        Args:
+            ids: IDs dos chunks
+            chunks: Chunks a indexar
+
+        Returns:
+            Separacao com os IDs e chunks a embedar e as ligações
+            {id da cópia: id do canônico}
+        """
+        separacao = Separacao()
+        with self._conectar() as conn:
+            for chunk_id, chunk in zip(ids, chunks):
+                assinatura = assinatura_minhash(chunk.page_content)
+                # O ID vem do conteúdo: um canônico reindexado continua canônico
+                ja_canonico = conn.execute(
+                    "SELECT 1 FROM canonicos WHERE chunk_id = ?", (chunk_id,)
+                ).fetchone()
+                canonico = None if ja_canonico else self._procurar(conn, assinatura, chunk_id, separacao)
+                if canonico is None:
+                    separacao.adicionar_canonico(chunk_id, chunk, assinatura)
+                else:
+                    separacao.ligar(chunk_id, chunk, canonico)
+        return separacao
+
+    def registrar(self, separacao: Separacao) -> None:
+        """Grava os canônicos e as cópias de uma separação cujos chunks já estão na base."""
+        with self._conectar() as conn:
+            for chunk_id, assinatura in separacao.assinaturas.items():
+                conn.execute("DELETE FROM copias WHERE chunk_id = ?", (chunk_id,))
+                self._registrar_canonico(conn, chunk_id, assinatura)
+            conn.executemany(
+                "INSERT OR REPLACE INTO copias (chunk_id, canonico, fonte, pagina, texto, metadados) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        chunk_id, separacao.ligacoes[chunk_id], chunk.metadata.get("fonte"),
+                        chunk.metadata.get("page"), chunk.page_content,
+                        json.dumps(chunk.metadata, ensure_ascii=False),
+                    )
+                    for chunk_id, chunk in separacao.copias
+                ],
+            )
+
+    def _procurar(
+        self,
+        conn: sqlite3.Connection,
+        assinatura: np.ndarray,
+        ignorar: str,
+        separacao: Optional[Separacao] = None,
+    ) -> Optional[str]:
+        """Canônico mais parecido acima do limiar, gravado ou da separação em curso (None se não houver)."""
+        candidatos = set()
+        pendentes = set()
+        for banda, chave in _chaves_bandas(assinatura):
+            candidatos.update(
+                linha[0] for linha in conn.execute(
+                    "SELECT chunk_id FROM bandas WHERE banda = ? AND chave = ?", (banda, chave)
+                )
+            )
+            if separacao is not None:
+                pendentes.update(separacao.bandas.get((banda, chave), ()))
+        candidatos.discard(ignorar)
+        pendentes.discard(ignorar)
+        melhor, melhor_score = None, self.limiar
+        for lote, marcadores in self._em_lotes(sorted(candidatos)):
+            for chunk_id, blob in conn.execute(
+                f"SELECT chunk_id, assinatura FROM canonicos WHERE chunk_id IN ({marcadores})", lote
+            ):
+                score = similaridade(assinatura, np.frombuffer(blob, dtype=np.uint32))
+                if score >= melhor_score:
+                    melhor, melhor_score = chunk_id, score
+        for chunk_id in sorted(pendentes):
+            score = similaridade(assinatura, separacao.assinaturas[chunk_id])
+            if score >= melhor_score:
+                melhor, melhor_score = chunk_id, score
+        return melhor
+
+    def remover(self, ids: Sequence[str]) -> List[Tuple[str, Document]]:
+        """
+        Remove chunks (canônicos ou cópias) do índice.
+
+        Cada canônico removido que ainda tinha cópias é substituído pela
+        primeira delas, e as demais passam a apontar para ela.
+
+        Returns:
+            Lista de (id, chunk) das cópias promovidas, que precisam ser
+            inseridas na base vetorial
+        """
+        promovidas: List[Tuple[str, Document]] = []
+        with self._conectar() as conn:
+            for lote, marcadores in self._em_lotes(ids):
+                conn.execute(f"DELETE FROM copias WHERE chunk_id IN ({marcadores})", lote)
+            orfas: Dict[str, List[tuple]] = {}
+            for lote, marcadores in self._em_lotes(ids):
+                conn.execute(f"DELETE FROM canonicos WHERE chunk_id IN ({marcadores})", lote)
+                conn.execute(f"DELETE FROM bandas WHERE chunk_id IN ({marcadores})", lote)
+                for linha in conn.execute(
+                    f"SELECT canonico, chunk_id, texto, metadados FROM copias "
+                    f"WHERE canonico IN ({marcadores}) ORDER BY chunk_id", lote
+                ):
+                    orfas.setdefault(linha[0], []).append(linha[1:])
+            for canonico, copias in orfas.items():
+                chunk_id, texto, metadados = copias[0]
+                conn.execute("DELETE FROM copias WHERE chunk_id = ?", (chunk_id,))
+                conn.execute("UPDATE copias SET canonico = ? WHERE canonico = ?", (chunk_id, canonico))
+                self._registrar_canonico(conn, chunk_id, assinatura_minhash(texto))
+                promovidas.append((chunk_id, Document(page_content=texto, metadata=json.loads(metadados))))
+        return promovidas
+
+    def fontes_das_copias(self, canonicos: Sequence[str]) -> Dict[str, List[str]]:
+        """Documentos das cópias ligadas a cada canônico informado."""
+        if not canonicos or not self.caminho.exists():
+            return {}
+        fontes: Dict[str, List[str]] = {}
+        with self._conectar() as conn:
+            for lote, marcadores in self._em_lotes(canonicos):
+                for canonico, fonte in conn.execute(
+                    f"SELECT canonico, fonte FROM copias WHERE canonico IN ({marcadores}) ORDER BY fonte", lote
+                ):
+                    fontes.setdefault(canonico, []).append(fonte)
+        return fontes
+
+    def canonicos_das_fontes(
+        self,
+        fontes: Sequence[str],
+        pagina_min: Optional[int] = None,
+        pagina_max: Optional[int] = None,
+    ) -> List[str]:
+        """Canônicos com cópia nos documentos (e intervalo de páginas) informados."""
+        if not fontes or not self.caminho.exists():
+            return []
+        condicoes, parametros = [], []
+        if pagina_min is not None:
+            condicoes.append("pagina >= ?")
+            parametros.append(pagina_min)
+        if pagina_max is not None:
+            condicoes.append("pagina <= ?")
+            parametros.append(pagina_max)
+        extra = "".join(f" AND {c}" for c in condicoes)
+        canonicos = set()
+        with self._conectar() as conn:
+            for lote, marcadores in self._em_lotes(fontes):
+                canonicos.update(
+                    linha[0] for linha in conn.execute(
+                        f"SELECT DISTINCT canonico FROM copias WHERE fonte IN ({marcadores}){extra}",
+                        lote + parametros,
+                    )
+                )
+        return sorted(canonicos)
+
+    def contar_copias(self) -> int:
+        """Número de chunks ligados a um canônico (sem vetor próprio)."""
+        if not self.caminho.exists():
+            return 0
+        with self._conectar() as conn:
+            return conn.execute("SELECT COUNT(*) FROM copias").fetchone()[0]
+
+    def compactar(self) -> None:
+        """Devolve ao disco o espaço de linhas removidas (VACUUM)."""
+        if not self.caminho.exists():
+            return
+        with self._conectar() as conn:
+            conn.execute("VACUUM")
+
+    def exportar(self) -> Tuple[dict, np.ndarray]:
+        """
+        Conteúdo do índice para o snapshot da base.
+
+        Returns:
+            Tuple com ({'canonicos': [...], 'copias': [...]}, matriz uint32
+            das assinaturas, uma linha por canônico)
+        """
+        if not self.caminho.exists():
+            return {"canonicos": [], "copias": []}, np.zeros((0, NUM_PERMUTACOES), dtype=np.uint32)
+        with self._conectar() as conn:
+            linhas = conn.execute("SELECT chunk_id, assinatura FROM canonicos ORDER BY chunk_id").fetchall()
+            copias = conn.execute(
+                "SELECT chunk_id, canonico, fonte, pagina, texto, metadados FROM copias ORDER BY chunk_id"
+            ).fetchall()
+        assinaturas = np.array(
+            [np.frombuffer(blob, dtype=np.uint32) for _, blob in linhas], dtype=np.uint32
+        ).reshape(len(linhas), NUM_PERMUTACOES)
+        return {"canonicos": [chunk_id for chunk_id, _ in linhas], "copias": [list(c) for c in copias]}, assinaturas
+
+    def importar(self, dados: dict, assinaturas: np.ndarray) -> None:
+        """Substitui o índice pelo conteúdo exportado (as bandas são recalculadas)."""
+        self.limpar()
+        with self._conectar() as conn:
+            for chunk_id, assinatura in zip(dados["canonicos"], assinaturas):
+                self._registrar_canonico(conn, chunk_id, np.ascontiguousarray(assinatura, dtype=np.uint32))
+            conn.executemany(
+                "INSERT INTO copias (chunk_id, canonico, fonte, pagina, texto, metadados) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [tuple(copia) for copia in dados["copias"]],
+            )
+
+    def limpar(self) -> None:
+        """Remove canônicos, bandas e cópias."""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM copias")
+            conn.execute("DELETE FROM bandas")
+            conn.execute("DELETE FROM canonicos")
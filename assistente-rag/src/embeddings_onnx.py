@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Embeddings ONNX - Assistente Corporativo RAG
+Backend de CPU sem PyTorch: ONNX Runtime + tokenizers, com quantização
+dinâmica int8 opcional
+
+Dependências opcionais: pip install onnxruntime tokenizers
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# all-MiniLM-L6-v2 foi treinado com sequências de até 256 tokens
+MAX_TOKENS_PADRAO = 256
+
+
+def quantizar_modelo(caminho_onnx: Path, destino: Path) -> Path:
+    """
+    Gera uma versão int8 (quantização dinâmica dos pesos) do modelo ONNX.
+
+    Args:
+        caminho_onnx: Modelo ONNX em float32
+        destino: Caminho do modelo quantizado
+
+    Returns:
+        Caminho do modelo quantizado (reaproveitado se já existir)
+    """
+    if destino.exists():
+        return destino
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    quantize_dynamic(str(caminho_onnx), str(destino), weight_type=QuantType.QInt8)
+    return destino
+
+
+class EmbeddingsONNX(Embeddings):
+    """
+    Embeddings de sentence-transformers executados no ONNX Runtime.
+
+    Usa o export ONNX publicado no repositório do modelo no Hugging Face
+    Hub (onnx/model.onnx) e reproduz o pipeline do sentence-transformers:
+    tokenização, mean pooling pela máscara de atenção e normalização L2.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantizar: bool = False,
+        pasta_modelos: Optional[Path] = None,
+        batch_size: int = 32,
+        max_tokens: int = MAX_TOKENS_PADRAO,
+        threads: Optional[int] = None,
+    ):
+        try:
+            import onnxruntime as ort
+            from huggingface_hub import hf_hub_download
+            from tokenizers import Tokenizer
+        except ImportError as exc:
+            raise ImportError(
+                "Backend ONNX requer 'onnxruntime' e 'tokenizers': "
+                "pip install onnxruntime tokenizers"
+            ) from exc
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+        caminho_onnx = Path(hf_hub_download(model_name, "onnx/model.onnx"))
+        if quantizar:
+            pasta = Path(pasta_modelos) if pasta_modelos else caminho_onnx.parent
+            nome = model_name.replace("/", "__")
+            caminho_onnx = quantizar_modelo(caminho_onnx, pasta / f"{nome}_int8.onnx")
+        self.caminho_onnx = caminho_onnx
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(model_name, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_tokens)
+        self.tokenizer.enable_padding()
+
+        opcoes = ort.SessionOptions()
+        if threads:
+            opcoes.intra_op_num_threads = threads
+        self.sessao = ort.InferenceSession(
+            str(caminho_onnx), sess_options=opcoes, providers=["CPUExecutionProvider"]
+        )
+        self._entradas = {entrada.name for entrada in self.sessao.get_inputs()}
+
+    def _embed_lote(self, textos: List[str]) -> np.ndarray:
+        codificados = self.tokenizer.encode_batch(textos)
+        input_ids = np.array([c.ids for c in codificados], dtype=np.int64)
+        mascara = np.array([c.attention_mask for c in codificados], dtype=np.int64)
+        entradas = {"input_ids": input_ids, "attention_mask": mascara}
+        if "token_type_ids" in self._entradas:
+            entradas["token_type_ids"] = np.array([c.type_ids for c in codificados], dtype=np.int64)
+
+        estados = self.sessao.run(None, entradas)[0]
+
+        # Mean pooling considerando só tokens reais + normalização L2
+        peso = mascara[:, :, None].astype(np.float32)
+        medias = (estados * peso).sum(axis=1) / np.clip(peso.sum(axis=1), 1e-9, None)
+        normas = np.linalg.norm(medias, axis=1, keepdims=True)
+        return medias / np.clip(normas, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vetores = []
+        for inicio in range(0, len(texts), self.batch_size):
+            vetores.extend(self._embed_lote(texts[inicio:inicio + self.batch_size]).tolist())
+        return vetores
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_lote([text])[0].tolist()
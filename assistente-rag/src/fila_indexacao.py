@@ -0,0 +1,188 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Fila de Indexação - Assistente Corporativo RAG
+Executa leitura → chunking → embeddings → gravação de uploads em segundo
+plano, com progresso por tarefa para a interface consultar
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+WORKERS_PADRAO = int(os.getenv("RAG_INDEXACAO_WORKERS", "1"))
+MAX_TAREFAS_HISTORICO = 20   # Tarefas finalizadas mantidas para exibição
+
+NA_FILA = "na_fila"
+PROCESSANDO = "processando"
+CONCLUIDA = "concluida"
+ERRO = "erro"
+
+
+class TarefaIndexacao:
+    """Estado e progresso de uma indexação (atualizado pela thread do worker)."""
+
+    def __init__(self, nome: str, hash_arquivo: str, caminho: Path):
+        self.id = uuid.uuid4().hex[:12]
+        self.nome = nome
+        self.hash = hash_arquivo
+        self.caminho = caminho
+        self.estado = NA_FILA
+        self.envios = 1
+        self.paginas_total = 0
+        self.paginas_lidas = 0
+        self.chunks_lidos = 0
+        self.chunks_embedados = 0
+        self.erro: Optional[str] = None
+        self.criada_em = time.time()
+        self.iniciada_em: Optional[float] = None
+        self.finalizada_em: Optional[float] = None
+
+    @property
+    def ativa(self) -> bool:
+        return self.estado in (NA_FILA, PROCESSANDO)
+
+    def eta_s(self) -> Optional[float]:
+        """Tempo restante estimado pela taxa de páginas lidas até agora."""
+        if self.estado != PROCESSANDO or not self.paginas_lidas or not self.paginas_total:
+            return None
+        decorrido = time.time() - self.iniciada_em
+        taxa = self.paginas_lidas / decorrido if decorrido > 0 else 0
+        restantes = max(self.paginas_total - self.paginas_lidas, 0)
+        return restantes / taxa if taxa else None
+
+    def progresso(self) -> dict:
+        """Retrato do estado atual, seguro para exibir na interface."""
+        fim = self.finalizada_em or time.time()
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "estado": self.estado,
+            "envios": self.envios,
+            "paginas_total": self.paginas_total,
+            "paginas_lidas": self.paginas_lidas,
+            "chunks_lidos": self.chunks_lidos,
+            "chunks_embedados": self.chunks_embedados,
+            "fracao": (
+                1.0 if self.estado == CONCLUIDA
+                else self.paginas_lidas / self.paginas_total if self.paginas_total else 0.0
+            ),
+            "eta_s": self.eta_s(),
+            "duracao_s": fim - self.iniciada_em if self.iniciada_em else 0.0,
+            "erro": self.erro,
+        }
+
+
+class FilaIndexacao:
+    """
+    Fila de indexação com pool de workers (threads).
+
+    O upload é copiado para disco no envio (rápido); o restante roda num
+    worker. Envios de um arquivo com o mesmo SHA-256 de uma tarefa ainda na
+    fila ou em andamento são agrupados nela em vez de gerar outra indexação
+    (depois de concluída, o manifesto de hashes já evita reprocessar).
+    """
+
+    def __init__(self, workers: int = WORKERS_PADRAO, pasta: Optional[Path] = None):
+        self.pasta = Path(pasta) if pasta else Path(tempfile.gettempdir()) / "rag_uploads"
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="indexacao")
+        self._tarefas: Dict[str, TarefaIndexacao] = {}
+        self._lock = threading.Lock()
+
+    def enviar(self, arquivo: BinaryIO, nome: str) -> TarefaIndexacao:
+        """
+        Enfileira um upload para indexação.
+
+        Args:
+            arquivo: Objeto com read() (ex.: UploadedFile do Streamlit)
+            nome: Nome do documento (metadado 'fonte')
+
+        Returns:
+            Tarefa criada, ou a ativa com o mesmo hash
+        """
+        from processador_pdf import salvar_upload
+
+        caminho = self.pasta / f"{uuid.uuid4().hex}.pdf"
+        hash_arquivo = salvar_upload(arquivo, caminho)
+
+        with self._lock:
+            existente = next(
+                (t for t in self._tarefas.values() if t.hash == hash_arquivo and t.ativa),
+                None,
+            )
+            if existente:
+                existente.envios += 1
+                caminho.unlink(missing_ok=True)
+                return existente
+            tarefa = TarefaIndexacao(nome, hash_arquivo, caminho)
+            self._tarefas[tarefa.id] = tarefa
+            self._descartar_antigas()
+
+        self._executor.submit(self._executar, tarefa)
+        return tarefa
+
+    def _descartar_antigas(self) -> None:
+        finalizadas = sorted(
+            (t for t in self._tarefas.values() if not t.ativa), key=lambda t: t.finalizada_em or 0
+        )
+        for tarefa in finalizadas[:-MAX_TAREFAS_HISTORICO]:
+            del self._tarefas[tarefa.id]
+
+    def _executar(self, tarefa: TarefaIndexacao) -> None:
+        from indexador import indexar_em_lotes
+        from processador_pdf import contar_paginas_pdf, iterar_chunks, iterar_paginas_pdf
+
+        tarefa.estado = PROCESSANDO
+        tarefa.iniciada_em = time.time()
+        try:
+            tarefa.paginas_total = contar_paginas_pdf(tarefa.caminho, tarefa.hash)
+
+            def contar_paginas(paginas) -> Iterator:
+                for pagina in paginas:
+                    tarefa.paginas_lidas += 1
+                    yield pagina
+
+            def atualizar(chunks_lidos: int, chunks_embedados: int) -> None:
+                tarefa.chunks_lidos = chunks_lidos
+                tarefa.chunks_embedados = chunks_embedados
+
+            chunks = iterar_chunks(contar_paginas(
+                iterar_paginas_pdf(tarefa.caminho, fonte=tarefa.nome, hash_arquivo=tarefa.hash)
+            ))
+            _, total = indexar_em_lotes(
+                chunks, fonte=tarefa.nome, hash_arquivo=tarefa.hash, progresso=atualizar
+            )
+            if not total:
+                raise ValueError("Não foi possível extrair texto do PDF.")
+            tarefa.chunks_lidos = total
+            tarefa.paginas_lidas = tarefa.paginas_total
+            tarefa.estado = CONCLUIDA
+        except Exception as exc:
+            tarefa.erro = str(exc)
+            tarefa.estado = ERRO
+        finally:
+            tarefa.finalizada_em = time.time()
+            tarefa.caminho.unlink(missing_ok=True)
+
+    def tarefa(self, tarefa_id: str) -> Optional[TarefaIndexacao]:
+        with self._lock:
+            return self._tarefas.get(tarefa_id)
+
+    def listar(self) -> List[dict]:
+        """Progresso de todas as tarefas, das mais recentes para as mais antigas."""
+        with self._lock:
+            tarefas = sorted(self._tarefas.values(), key=lambda t: t.criada_em, reverse=True)
+        return [t.progresso() for t in tarefas]
+
+    def ativas(self) -> int:
+        with self._lock:
+            return sum(1 for t in self._tarefas.values() if t.ativa)
+
+    def encerrar(self, aguardar: bool = True) -> None:
+        self._executor.shutdown(wait=aguardar)
@@ -6,63 +6,251 @@ Transforma chunks de texto em embeddings e armazena no ChromaDB
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
 import sqlite3
 import shutil
 import os
-import tempfile
+import threading
+import time
 
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from langchain_core.vectorstores import VectorStore
 
-BASE_DIR = Path(__file__).resolve().parents[1]
+# langchain_huggingface (torch) e langchain_chroma (chromadb) são importados no
+# primeiro uso: abrir a página do chat não deve pagar por eles
+from aquecimento import EmbeddingsPreguicosos, importar
+from cache_embeddings import EmbeddingsComCache
+from servico_embeddings import EmbeddingsMicroLote
+from lotes_por_comprimento import ORCAMENTO_PADRAO, EmbeddingsPorComprimento, carregar_ou_calibrar
+from vectorstore_numpy import VetorialNumpy
+from indice_lexico import IndiceLexico, fundir_rankings
+from duplicatas import IndiceDuplicatas
+from config_base import DB_DIR
 
-# Detecta Streamlit Cloud: filesystem é readonly exceto /tmp
-# Variáveis que indicam ambiente cloud: HOME=/home/adminuser ou mount path /mount/src
-_is_cloud = (
-    os.getenv("HOME") == "/home/adminuser"
-    or str(BASE_DIR).startswith("/mount/src")
-    or not os.access(str(BASE_DIR), os.W_OK)
-)
+COLLECTION_NAME = "documentos_corporativos"
+_LOCK_VECTORSTORE = threading.Lock()
 
-if _is_cloud:
-    DB_DIR = Path(tempfile.gettempdir()) / "assistente_rag_db"
-else:
-    DB_DIR = BASE_DIR / "db_store"
+# Backend da base vetorial: 'chroma' ou 'numpy' (matriz .npy mapeada em memória,
+# varredura exata; indicado para coleções de até algumas centenas de milhares de chunks)
+BACKEND_VETORIAL = os.getenv("RAG_BACKEND_VETORIAL", "chroma")
+NUMPY_DTYPE = os.getenv("RAG_NUMPY_DTYPE", "float32")  # 'float32' ou 'float16'
+NUMPY_DIR = DB_DIR / "vetorial_numpy"
+# Índice compacto da varredura ('nenhuma', 'float16' ou 'int8'), com PCA opcional
+# (0 = dimensão original); os melhores candidatos são reavaliados nos vetores completos
+NUMPY_COMPRESSAO = os.getenv("RAG_NUMPY_COMPRESSAO", "nenhuma")
+NUMPY_PCA = int(os.getenv("RAG_NUMPY_PCA", "0"))
+NUMPY_FATOR = int(os.getenv("RAG_NUMPY_FATOR", "8"))  # Candidatos por resultado na reavaliação
 
-COLLECTION_NAME = "documentos_corporativos"
+# Manifesto de hashes (por arquivo e por chunk) usado na indexação incremental.
+# Fica ao lado do DB_DIR para sobreviver a recriações da coleção pelo Chroma.
+MANIFESTO_PATH = DB_DIR.parent / f"{DB_DIR.name}_manifesto.json"
+MANIFESTO_VERSAO = 1
+# Serializa leitura-modificação-escrita do manifesto entre threads (fila de indexação)
+_LOCK_MANIFESTO = threading.RLock()
+
+# Contador de versão da coleção (fora do DB_DIR para nunca voltar a um valor antigo).
+# Incrementado a cada inserção/remoção; caches de resposta usam-no para invalidar.
+VERSAO_COLECAO_PATH = DB_DIR.parent / f"{DB_DIR.name}_versao"
+
+# Índice léxico BM25 dentro do DB_DIR: é apagado junto com a coleção
+INDICE_LEXICO_PATH = DB_DIR / "indice_lexico.sqlite3"
+
+# Quase-duplicatas (rodapés, avisos legais, políticas copiadas entre manuais) não
+# recebem embedding: ficam ligadas ao chunk canônico, que lista todas as fontes
+DEDUPLICAR = os.getenv("RAG_DEDUPLICAR", "1") != "0"
+LIMIAR_DUPLICATAS = float(os.getenv("RAG_LIMIAR_DUPLICATAS", "0.9"))  # Jaccard estimado (MinHash)
+INDICE_DUPLICATAS_PATH = DB_DIR / "duplicatas.sqlite3"
+
+# Compactação periódica: após N chunks removidos, o espaço morto é devolvido ao disco
+COMPACTAR_APOS = int(os.getenv("RAG_COMPACTAR_APOS", "5000"))  # 0 = nunca automática
+REMOCOES_PENDENTES_PATH = DB_DIR / "remocoes_pendentes"
+
+# Modo padrão de busca: 'hibrido' (BM25 + vetorial) ou 'vetorial'
+MODO_BUSCA_PADRAO = os.getenv("RAG_MODO_BUSCA", "hibrido")
 
 # Modelo de embeddings gratuito e leve (roda no CPU)
 # all-MiniLM-L6-v2: 384 dimensões, ~80MB, bom equilíbrio velocidade/qualidade
 MODELO_EMBEDDINGS = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Backend do modelo: 'torch' (sentence-transformers), 'onnx' ou 'onnx-int8'
+# (ONNX Runtime, sem importar PyTorch; int8 = quantização dinâmica dos pesos)
+BACKEND_EMBEDDINGS = os.getenv("RAG_BACKEND_EMBEDDINGS", "torch")
+MODELOS_ONNX_DIR = DB_DIR.parent / "modelos_onnx"
+
+# Cache persistente de embeddings (SQLite), fora do DB_DIR para sobreviver à limpeza da base
+USAR_CACHE_EMBEDDINGS = os.getenv("RAG_CACHE_EMBEDDINGS", "1") != "0"
+CACHE_EMBEDDINGS_PATH = DB_DIR.parent / f"{DB_DIR.name}_cache_embeddings.sqlite3"
+CACHE_EMBEDDINGS_MAX = int(os.getenv("RAG_CACHE_EMBEDDINGS_MAX", "100000"))
+
+# Lotes por comprimento: orçamento de tokens (com padding) por lote do modelo.
+# 'auto' usa a calibração salva por `python src/lotes_por_comprimento.py`
+# (ou o padrão, se não houver); '0' desativa. O app nunca calibra sozinho.
+ORCAMENTO_TOKENS = os.getenv("RAG_ORCAMENTO_TOKENS", str(ORCAMENTO_PADRAO))
+CALIBRACAO_LOTES_PATH = DB_DIR.parent / f"{DB_DIR.name}_calibracao_lotes.json"
+
+# Micro-lotes: agrupa pedidos concorrentes de embedding numa só chamada ao modelo
+USAR_MICRO_LOTE = os.getenv("RAG_MICRO_LOTE", "1") != "0"
+MICRO_LOTE_JANELA_MS = float(os.getenv("RAG_MICRO_LOTE_JANELA_MS", "5"))
+MICRO_LOTE_MAX = int(os.getenv("RAG_MICRO_LOTE_MAX", "64"))
+
+
+def criar_modelo_embeddings(backend: Optional[str] = None):
+    """
+    Cria o modelo de embeddings "puro" (sem cache nem micro-lotes).
+    
+    Args:
+        backend: 'torch', 'onnx' ou 'onnx-int8' (padrão: RAG_BACKEND_EMBEDDINGS)
+        
+    Returns:
+        Instância de Embeddings do LangChain
+    """
+    backend = backend or BACKEND_EMBEDDINGS
+    if backend in ("onnx", "onnx-int8"):
+        from embeddings_onnx import EmbeddingsONNX
+        
+        return EmbeddingsONNX(
+            MODELO_EMBEDDINGS,
+            quantizar=backend == "onnx-int8",
+            pasta_modelos=MODELOS_ONNX_DIR,
+            batch_size=32,
+        )
+    if backend != "torch":
+        raise ValueError(f"Backend de embeddings desconhecido: {backend}")
+    
+    from langchain_huggingface import HuggingFaceEmbeddings
+    
+    return HuggingFaceEmbeddings(
+        model_name=MODELO_EMBEDDINGS,
+        model_kwargs={
+            'device': 'cpu',
+            'trust_remote_code': True
+        },
+        encode_kwargs={
+            'normalize_embeddings': True,
+            'batch_size': 32
+        }
+    )
+
+
+def chave_modelo_embeddings() -> str:
+    """
+    Identifica o espaço vetorial gerado pelo modelo atual.
+    
+    O int8 gera vetores ligeiramente diferentes e recebe chave própria
+    (usada pelo cache de embeddings e pelos snapshots da base).
+    """
+    if BACKEND_EMBEDDINGS == "onnx-int8":
+        return f"{MODELO_EMBEDDINGS}#int8"
+    return MODELO_EMBEDDINGS
+
 
 def criar_embeddings():
     """
     Cria instância do modelo de embeddings HuggingFace.
-    Roda localmente, sem necessidade de API.
+    Roda localmente, sem necessidade de API, no backend BACKEND_EMBEDDINGS.
+    Os textos de cada chamada são reagrupados por comprimento sob um
+    orçamento de tokens (ORCAMENTO_TOKENS). Se USAR_MICRO_LOTE, pedidos
+    concorrentes são agrupados em lotes, e cada fatia de MICRO_LOTE_MAX
+    textos já sai ordenada por comprimento em relação à chamada inteira
+    (não só ao trecho de 64 chunks); se USAR_CACHE_EMBEDDINGS, os
+    vetores já calculados são reaproveitados a partir do cache em disco
+    (antes de entrar na fila).
+    
+    O modelo só é carregado no primeiro texto a codificar (ou por
+    etapas_aquecimento); até lá a instância é um EmbeddingsPreguicosos.
     """
     import streamlit as st
     
+    def _construir_embeddings():
+        embeddings = criar_modelo_embeddings()
+        if ORCAMENTO_TOKENS != "0":
+            if ORCAMENTO_TOKENS == "auto":
+                orcamento = carregar_ou_calibrar(
+                    embeddings, CALIBRACAO_LOTES_PATH, f"{chave_modelo_embeddings()}|{BACKEND_EMBEDDINGS}",
+                    calibrar=False,
+                )
+            else:
+                orcamento = int(ORCAMENTO_TOKENS)
+            embeddings = EmbeddingsPorComprimento(embeddings, orcamento_tokens=orcamento)
+        if USAR_MICRO_LOTE:
+            embeddings = EmbeddingsMicroLote(
+                embeddings,
+                janela_ms=MICRO_LOTE_JANELA_MS,
+                max_lote=MICRO_LOTE_MAX,
+            )
+        if USAR_CACHE_EMBEDDINGS:
+            embeddings = EmbeddingsComCache(
+                embeddings,
+                modelo=chave_modelo_embeddings(),
+                caminho=CACHE_EMBEDDINGS_PATH,
+                max_entradas=CACHE_EMBEDDINGS_MAX,
+            )
+        return embeddings
+    
     @st.cache_resource(show_spinner=False)
     def _load_embeddings():
-        return HuggingFaceEmbeddings(
-            model_name=MODELO_EMBEDDINGS,
-            model_kwargs={
-                'device': 'cpu',
-                'trust_remote_code': True
-            },
-            encode_kwargs={
-                'normalize_embeddings': True,
-                'batch_size': 32
-            }
-        )
+        return EmbeddingsPreguicosos(_construir_embeddings)
     
     return _load_embeddings()
 
 
-def criar_ou_carregar_vectorstore(embeddings=None) -> Chroma:
+def etapas_aquecimento() -> List[Tuple[str, Callable[[], object]]]:
+    """
+    Etapas para pré-carregar em segundo plano o que a primeira pergunta usaria.
+    
+    Deve ser chamada na thread do Streamlit (resolve os recursos em cache);
+    as funções devolvidas podem rodar em qualquer thread.
+    """
+    embeddings = criar_embeddings()
+    
+    def _modelo() -> None:
+        # Carrega os pesos e roda uma codificação para inicializar o torch
+        embeddings.carregar()
+        embeddings.embed_query("aquecimento")
+    
+    etapas = []
+    if BACKEND_VETORIAL != "numpy":
+        etapas.append(("chromadb", importar("langchain_chroma")))
+    etapas.append(("embeddings", _modelo))
+    return etapas
+
+
+def _contar_vetores(vectorstore: VectorStore) -> int:
+    """Conta os vetores da coleção em qualquer backend."""
+    if isinstance(vectorstore, VetorialNumpy):
+        return vectorstore.contar()
+    return vectorstore._collection.count()
+
+
+def metricas_embeddings(embeddings=None) -> dict:
+    """
+    Coleta as métricas das camadas de embeddings (cache, micro-lotes,
+    lotes por comprimento).
+    
+    Args:
+        embeddings: Instância retornada por criar_embeddings (cria se None)
+        
+    Returns:
+        Dicionário {camada: métricas}
+    """
+    if embeddings is None:
+        embeddings = criar_embeddings()
+    
+    metricas = {}
+    while embeddings is not None:
+        if isinstance(embeddings, EmbeddingsComCache):
+            metricas["cache"] = embeddings.estatisticas()
+        elif isinstance(embeddings, EmbeddingsMicroLote):
+            metricas["micro_lote"] = embeddings.metricas()
+        elif isinstance(embeddings, EmbeddingsPorComprimento):
+            metricas["lotes_comprimento"] = embeddings.metricas()
+        embeddings = getattr(embeddings, "base", None)
+    return metricas
+
+
+def criar_ou_carregar_vectorstore(embeddings=None) -> VectorStore:
     """
     Cria nova base vetorial ou carrega existente.
     
@@ -70,51 +258,339 @@ def criar_ou_carregar_vectorstore(embeddings=None) -> Chroma:
         embeddings: Modelo de embeddings (cria novo se None)
         
     Returns:
-        Instância do ChromaDB
+        Instância do ChromaDB ou do VetorialNumpy (conforme BACKEND_VETORIAL)
     """
     if embeddings is None:
         embeddings = criar_embeddings()
     
     DB_DIR.mkdir(parents=True, exist_ok=True)
     
-    vectorstore = Chroma(
-        collection_name=COLLECTION_NAME,
-        embedding_function=embeddings,
-        persist_directory=str(DB_DIR),
-    )
-
-    try:
-        # Força acesso à coleção para validar o schema do DB
-        _ = vectorstore._collection.count()
-    except Exception as exc:
-        mensagem = str(exc).lower()
-        erro_schema = (
-            "no such table: embeddings" in mensagem
-            or "error executing plan" in mensagem
-            or isinstance(exc, sqlite3.OperationalError)
+    if BACKEND_VETORIAL == "numpy":
+        return VetorialNumpy(
+            NUMPY_DIR,
+            embeddings,
+            dtype=NUMPY_DTYPE,
+            compressao=NUMPY_COMPRESSAO,
+            dimensao_pca=NUMPY_PCA,
+            fator_candidatos=NUMPY_FATOR,
         )
-        if erro_schema:
-            if DB_DIR.exists():
-                shutil.rmtree(DB_DIR)
-                DB_DIR.mkdir(parents=True, exist_ok=True)
-            vectorstore = Chroma(
-                collection_name=COLLECTION_NAME,
-                embedding_function=embeddings,
-                persist_directory=str(DB_DIR),
+    
+    from langchain_chroma import Chroma
+    
+    # O cliente do Chroma não suporta ser criado por várias threads ao mesmo tempo
+    with _LOCK_VECTORSTORE:
+        vectorstore = Chroma(
+            collection_name=COLLECTION_NAME,
+            embedding_function=embeddings,
+            persist_directory=str(DB_DIR),
+        )
+
+        try:
+            # Força acesso à coleção para validar o schema do DB
+            _ = vectorstore._collection.count()
+        except Exception as exc:
+            mensagem = str(exc).lower()
+            erro_schema = (
+                "no such table: embeddings" in mensagem
+                or "error executing plan" in mensagem
+                or isinstance(exc, sqlite3.OperationalError)
             )
-        else:
-            raise
+            if erro_schema:
+                if DB_DIR.exists():
+                    shutil.rmtree(DB_DIR)
+                    DB_DIR.mkdir(parents=True, exist_ok=True)
+                vectorstore = Chroma(
+                    collection_name=COLLECTION_NAME,
+                    embedding_function=embeddings,
+                    persist_directory=str(DB_DIR),
+                )
+            else:
+                raise
 
     return vectorstore
 
 
-def indexar_documentos(chunks: List[Document], limpar_base: bool = False) -> Chroma:
+# ────────────────────────────────────────────────────────────────────────────────
+# MANIFESTO DE HASHES (INDEXAÇÃO INCREMENTAL)
+# ────────────────────────────────────────────────────────────────────────────────
+def _hash_texto(texto: str) -> str:
+    """Retorna o SHA-256 hexadecimal de um texto."""
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def gerar_ids_chunks(
+    chunks: List[Document],
+    ocorrencias: Optional[Dict[str, int]] = None,
+) -> List[str]:
+    """
+    Gera IDs determinísticos para os chunks a partir do conteúdo.
+    
+    O ID é o hash de fonte + página + texto; chunks idênticos na mesma
+    página recebem um sufixo sequencial para não colidirem.
+    
+    Args:
+        chunks: Lista de Documents
+        ocorrencias: Contagem de hashes já vistos, para gerar IDs de um
+            mesmo documento em vários lotes (modificado no lugar)
+        
+    Returns:
+        Lista de IDs na mesma ordem dos chunks
+    """
+    ids = []
+    if ocorrencias is None:
+        ocorrencias = {}
+    for chunk in chunks:
+        base = _hash_texto(
+            f"{chunk.metadata.get('fonte', '')}\x00"
+            f"{chunk.metadata.get('page', '')}\x00"
+            f"{chunk.page_content}"
+        )
+        n = ocorrencias.get(base, 0)
+        ocorrencias[base] = n + 1
+        ids.append(base if n == 0 else f"{base}-{n}")
+    return ids
+
+
+def carregar_manifesto() -> dict:
+    """
+    Carrega o manifesto de hashes da base vetorial.
+    
+    Retorna um manifesto vazio se o arquivo não existir, estiver corrompido,
+    pertencer a outro modelo de embeddings ou se o DB_DIR tiver sido removido.
+    """
+    vazio = {"versao": MANIFESTO_VERSAO, "modelo": MODELO_EMBEDDINGS, "arquivos": {}}
+    if not MANIFESTO_PATH.exists() or not DB_DIR.exists():
+        return vazio
+    try:
+        manifesto = json.loads(MANIFESTO_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return vazio
+    if (
+        manifesto.get("versao") != MANIFESTO_VERSAO
+        or manifesto.get("modelo") != MODELO_EMBEDDINGS
+    ):
+        return vazio
+    manifesto.setdefault("arquivos", {})
+    return manifesto
+
+
+def salvar_manifesto(manifesto: dict) -> None:
+    """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+    MANIFESTO_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFESTO_PATH.with_suffix(".tmp")
+    with _LOCK_MANIFESTO:
+        tmp_path.write_text(json.dumps(manifesto, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, MANIFESTO_PATH)
+
+
+def obter_versao_colecao() -> int:
+    """Retorna a versão atual da coleção (0 se nunca houve alteração)."""
+    try:
+        return int(VERSAO_COLECAO_PATH.read_text().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _incrementar_versao_colecao() -> int:
+    """Incrementa a versão da coleção após qualquer mudança de conteúdo."""
+    with _LOCK_MANIFESTO:
+        versao = obter_versao_colecao() + 1
+        VERSAO_COLECAO_PATH.parent.mkdir(parents=True, exist_ok=True)
+        VERSAO_COLECAO_PATH.write_text(str(versao))
+    return versao
+
+
+def _indice_lexico() -> IndiceLexico:
+    """Retorna o índice BM25 associado à coleção."""
+    return IndiceLexico(INDICE_LEXICO_PATH)
+
+
+def _indice_duplicatas() -> IndiceDuplicatas:
+    """Retorna o índice de quase-duplicatas associado à coleção."""
+    return IndiceDuplicatas(INDICE_DUPLICATAS_PATH, limiar=LIMIAR_DUPLICATAS)
+
+
+def _carregar_manifesto_sincronizado(vectorstore: VectorStore) -> dict:
+    """
+    Carrega o manifesto, descartando-o (junto com os índices léxico e de
+    duplicatas) se a coleção estiver vazia — caso em que ele não reflete
+    mais a base.
+    """
+    manifesto = carregar_manifesto()
+    if contar_documentos(vectorstore) == 0:
+        manifesto["arquivos"] = {}
+        if INDICE_LEXICO_PATH.exists():
+            _indice_lexico().limpar()
+        if INDICE_DUPLICATAS_PATH.exists():
+            _indice_duplicatas().limpar()
+    return manifesto
+
+
+def _inserir_chunks(
+    vectorstore: VectorStore,
+    chunks: List[Document],
+    ids: List[str],
+    deduplicar: bool = DEDUPLICAR,
+) -> int:
+    """
+    Insere chunks na coleção e no índice léxico, mantendo os dois em sincronia.
+    
+    Com `deduplicar`, quase-duplicatas de chunks já indexados (ou do mesmo
+    lote) não recebem embedding: ficam só no índice de duplicatas, ligadas
+    ao chunk canônico. Os IDs delas continuam no manifesto da fonte.
+    
+    Returns:
+        Número de chunks ligados a um canônico em vez de inseridos
+    """
+    # Data de ingestão (epoch, em segundos) para filtrar buscas por período
+    agora = int(time.time())
+    for chunk in chunks:
+        chunk.metadata.setdefault("indexado_em", agora)
+    copias: List[str] = []
+    separacao = None
+    if deduplicar:
+        indice = _indice_duplicatas()
+        separacao = indice.separar(ids, chunks)
+        ids, chunks = separacao.novos_ids, separacao.novos_chunks
+        copias = list(separacao.ligacoes)
+    if copias:
+        # Bases anteriores à deduplicação podem ter vetor para a cópia
+        vectorstore.delete(ids=copias)
+        _indice_lexico().remover(copias)
+    if chunks:
+        vectorstore.add_documents(chunks, ids=ids)
+        _indice_lexico().adicionar(ids, chunks)
+    if separacao is not None:
+        # Só agora: se o embedding falhou, nenhum canônico fica sem vetor
+        indice.registrar(separacao)
+    _incrementar_versao_colecao()
+    return len(copias)
+
+
+def _apagar_chunks(vectorstore: VectorStore, ids: List[str]) -> None:
+    """
+    Remove chunks da coleção e do índice léxico (compactando a cada COMPACTAR_APOS).
+    
+    Se um chunk canônico sai e ainda tem cópias em outros documentos, a
+    primeira cópia é inserida no lugar dele.
+    """
+    vectorstore.delete(ids=ids)
+    _indice_lexico().remover(ids)
+    _incrementar_versao_colecao()
+    if INDICE_DUPLICATAS_PATH.exists():
+        promovidas = _indice_duplicatas().remover(ids)
+        if promovidas:
+            _inserir_chunks(
+                vectorstore,
+                [chunk for _, chunk in promovidas],
+                [chunk_id for chunk_id, _ in promovidas],
+                deduplicar=False,
+            )
+            print(f"   ♻️  {len(promovidas)} cópias promovidas a canônico")
+    if _registrar_remocoes(len(ids)) >= COMPACTAR_APOS > 0:
+        compactar_base(vectorstore)
+
+
+def _registrar_remocoes(quantidade: int) -> int:
+    """Soma chunks removidos desde a última compactação; retorna o total pendente."""
+    with _LOCK_MANIFESTO:
+        try:
+            pendentes = int(REMOCOES_PENDENTES_PATH.read_text().strip() or 0)
+        except (OSError, ValueError):
+            pendentes = 0
+        pendentes += quantidade
+        REMOCOES_PENDENTES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        REMOCOES_PENDENTES_PATH.write_text(str(pendentes))
+    return pendentes
+
+
+def compactar_base(vectorstore: Optional[VectorStore] = None) -> dict:
+    """
+    Devolve ao disco o espaço deixado por remoções e substituições.
+    
+    No backend numpy reescreve vetores e metadados só com as linhas ativas;
+    no Chroma executa VACUUM no SQLite da coleção. O índice léxico é
+    compactado nos dois casos.
+    
+    Args:
+        vectorstore: Base vetorial (carrega se None)
+        
+    Returns:
+        Dicionário com o tamanho do DB_DIR antes e depois, em bytes
+    """
+    if vectorstore is None:
+        vectorstore = criar_ou_carregar_vectorstore()
+    
+    def tamanho() -> int:
+        return sum(f.stat().st_size for f in DB_DIR.rglob("*") if f.is_file())
+    
+    antes = tamanho()
+    if isinstance(vectorstore, VetorialNumpy):
+        vectorstore.compactar()
+    else:
+        caminho_sqlite = DB_DIR / "chroma.sqlite3"
+        if caminho_sqlite.exists():
+            try:
+                conn = sqlite3.connect(str(caminho_sqlite), timeout=30)
+                try:
+                    conn.execute("VACUUM")
+                finally:
+                    conn.close()
+            except sqlite3.OperationalError as exc:
+                # Base ocupada por outra escrita: tenta de novo na próxima compactação
+                print(f"⚠️  Compactação do Chroma adiada: {exc}")
+                return {"bytes_antes": antes, "bytes_depois": antes}
+    _indice_lexico().compactar()
+    _indice_duplicatas().compactar()
+    REMOCOES_PENDENTES_PATH.unlink(missing_ok=True)
+    
+    depois = tamanho()
+    print(f"🧹 Base compactada: {antes / 2**20:.1f} MB → {depois / 2**20:.1f} MB")
+    return {"bytes_antes": antes, "bytes_depois": depois}
+
+
+def _remover_base() -> None:
+    """Apaga o DB_DIR inteiro e o manifesto de hashes."""
+    if DB_DIR.exists():
+        shutil.rmtree(DB_DIR)
+        print("   🗑️  Base anterior removida")
+    MANIFESTO_PATH.unlink(missing_ok=True)
+    _incrementar_versao_colecao()
+
+
+def limpar_base() -> None:
+    """Remove todos os documentos indexados (coleção, índice léxico e manifesto)."""
+    _remover_base()
+
+
+def _agrupar_por_fonte(chunks: List[Document], ids: List[str]) -> Dict[str, list]:
+    """Agrupa pares (id, chunk) pelo metadado 'fonte', preservando a ordem."""
+    grupos: Dict[str, list] = {}
+    for chunk_id, chunk in zip(ids, chunks):
+        grupos.setdefault(chunk.metadata.get("fonte", ""), []).append((chunk_id, chunk))
+    return grupos
+
+
+def indexar_documentos(
+    chunks: List[Document],
+    limpar_base: bool = False,
+    incremental: bool = False,
+    hashes_arquivos: Optional[Dict[str, str]] = None,
+    origem: str = "upload",
+) -> VectorStore:
     """
     Indexa lista de chunks no ChromaDB.
     
+    Os chunks recebem IDs determinísticos derivados do conteúdo, e o manifesto
+    de hashes é atualizado a cada chamada.
+    
     Args:
         chunks: Lista de Documents para indexar
         limpar_base: Se True, limpa a base antes de indexar
+        incremental: Se True, gera embeddings apenas para chunks novos ou
+            alterados e remove os chunks obsoletos de cada fonte recebida
+        hashes_arquivos: Hash do arquivo original por fonte (opcional)
+        origem: Origem dos documentos no manifesto ('pasta' ou 'upload')
         
     Returns:
         Instância do ChromaDB com documentos indexados
@@ -123,32 +599,330 @@ def indexar_documentos(chunks: List[Document], limpar_base: bool = False) -> Chr
         print("⚠️  Nenhum chunk para indexar")
         return criar_ou_carregar_vectorstore()
     
-    print(f"🔮 Criando embeddings para {len(chunks)} chunks...")
     embeddings = criar_embeddings()
     
     if limpar_base:
-        # Remove base existente
-        import shutil
-        if DB_DIR.exists():
-            shutil.rmtree(DB_DIR)
-            print("   🗑️  Base anterior removida")
-    
-    print("📦 Indexando no ChromaDB...")
-    
-    # Cria vectorstore com os documentos
-    vectorstore = Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-        collection_name=COLLECTION_NAME,
-        persist_directory=str(DB_DIR),
+        _remover_base()
+    
+    vectorstore = criar_ou_carregar_vectorstore(embeddings)
+    manifesto = _carregar_manifesto_sincronizado(vectorstore)
+    
+    ids = gerar_ids_chunks(chunks)
+    novos_chunks: List[Document] = []
+    novos_ids: List[str] = []
+    obsoletos: List[str] = []
+    
+    for fonte, pares in _agrupar_por_fonte(chunks, ids).items():
+        ids_fonte = [chunk_id for chunk_id, _ in pares]
+        hash_arquivo = (hashes_arquivos or {}).get(fonte) or _hash_texto("".join(ids_fonte))
+        anterior = manifesto["arquivos"].get(fonte, {})
+        existentes = set(anterior.get("chunks", [])) if incremental else set()
+        
+        for chunk_id, chunk in pares:
+            if chunk_id not in existentes:
+                novos_chunks.append(chunk)
+                novos_ids.append(chunk_id)
+        atuais = set(ids_fonte)
+        obsoletos.extend(i for i in anterior.get("chunks", []) if i not in atuais)
+        
+        manifesto["arquivos"][fonte] = {
+            "hash": hash_arquivo,
+            "origem": origem,
+            "chunks": ids_fonte,
+            "indexado_em": int(time.time()),
+        }
+    
+    if obsoletos:
+        _apagar_chunks(vectorstore, obsoletos)
+        print(f"   🗑️  {len(obsoletos)} chunks obsoletos removidos")
+    
+    copias = 0
+    if novos_chunks:
+        print(f"🔮 Criando embeddings para {len(novos_chunks)} chunks...")
+        backend = "NumPy (memmap)" if isinstance(vectorstore, VetorialNumpy) else "ChromaDB"
+        print(f"📦 Indexando no {backend}...")
+        copias = _inserir_chunks(vectorstore, novos_chunks, novos_ids)
+    
+    salvar_manifesto(manifesto)
+    
+    print(f"✅ {len(novos_chunks)} chunks indexados com sucesso!")
+    if copias:
+        print(f"   🔗 {copias} quase-duplicatas ligadas a chunks existentes (sem novo embedding)")
+    stats = metricas_embeddings(embeddings).get("cache")
+    if stats:
+        print(f"   💾 Cache de embeddings: {stats['acertos']} acertos, "
+              f"{stats['faltas']} faltas ({stats['taxa_acerto']:.0%})")
+    if len(novos_chunks) < len(chunks):
+        print(f"   ♻️  {len(chunks) - len(novos_chunks)} chunks inalterados reaproveitados")
+    
+    return vectorstore
+
+
+def indexar_em_lotes(
+    chunks: Iterable[Document],
+    fonte: str,
+    hash_arquivo: Optional[str] = None,
+    origem: str = "upload",
+    tamanho_lote: Optional[int] = None,
+    progresso: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[VectorStore, int]:
+    """
+    Indexa os chunks de um documento consumindo-os em lotes de tamanho fixo.
+    
+    Cada lote é embedado e inserido antes de o próximo ser lido, então o
+    pico de memória não depende do tamanho do documento. Chunks já
+    presentes no manifesto não são reembedados e os que sumiram da nova
+    versão do documento são removidos ao final.
+    
+    Args:
+        chunks: Iterável (preguiçoso) de chunks de uma única fonte
+        fonte: Nome do documento (metadado 'fonte')
+        hash_arquivo: SHA-256 do arquivo; se igual ao do manifesto, nada é feito
+        origem: Origem do documento no manifesto ('pasta' ou 'upload')
+        tamanho_lote: Chunks por lote (padrão: TAMANHO_LOTE_PADRAO)
+        progresso: Chamado após cada lote com (chunks lidos, chunks embedados)
+        
+    Returns:
+        Tuple com (instância do ChromaDB, total de chunks do documento)
+    """
+    from processador_pdf import TAMANHO_LOTE_PADRAO, iterar_lotes
+    
+    vectorstore = criar_ou_carregar_vectorstore()
+    manifesto = _carregar_manifesto_sincronizado(vectorstore)
+    
+    anterior = manifesto["arquivos"].get(fonte, {})
+    if hash_arquivo and anterior.get("hash") == hash_arquivo:
+        print(f"♻️  '{fonte}' já está indexado (hash inalterado)")
+        return vectorstore, len(anterior.get("chunks", []))
+    
+    existentes = set(anterior.get("chunks", []))
+    ids_fonte: List[str] = []
+    ocorrencias: Dict[str, int] = {}
+    novos = 0
+    copias = 0
+    
+    for lote in iterar_lotes(chunks, tamanho_lote or TAMANHO_LOTE_PADRAO):
+        ids = gerar_ids_chunks(lote, ocorrencias)
+        ids_fonte.extend(ids)
+        pendentes = [(chunk_id, chunk) for chunk_id, chunk in zip(ids, lote) if chunk_id not in existentes]
+        if pendentes:
+            copias += _inserir_chunks(
+                vectorstore,
+                [chunk for _, chunk in pendentes],
+                [chunk_id for chunk_id, _ in pendentes],
+            )
+            novos += len(pendentes)
+            print(f"   📦 {novos} chunks indexados...")
+        if progresso:
+            progresso(len(ids_fonte), novos)
+    
+    if not ids_fonte:
+        return vectorstore, 0
+    
+    atuais = set(ids_fonte)
+    obsoletos = [chunk_id for chunk_id in existentes if chunk_id not in atuais]
+    if obsoletos:
+        _apagar_chunks(vectorstore, obsoletos)
+    
+    # Relê o manifesto: outra indexação pode ter terminado enquanto esta rodava
+    with _LOCK_MANIFESTO:
+        manifesto = carregar_manifesto()
+        manifesto["arquivos"][fonte] = {
+            "hash": hash_arquivo or _hash_texto("".join(ids_fonte)),
+            "origem": origem,
+            "chunks": ids_fonte,
+            "indexado_em": int(time.time()),
+        }
+        salvar_manifesto(manifesto)
+    
+    print(f"✅ {novos} chunks indexados com sucesso!")
+    if copias:
+        print(f"   🔗 {copias} quase-duplicatas ligadas a chunks existentes (sem novo embedding)")
+    return vectorstore, len(ids_fonte)
+
+
+def remover_fontes(fontes: List[str], vectorstore: Optional[VectorStore] = None) -> int:
+    """
+    Remove da base todos os chunks das fontes informadas.
+    
+    Args:
+        fontes: Nomes dos arquivos (metadado 'fonte') a remover
+        vectorstore: Instância do ChromaDB (carrega se None)
+        
+    Returns:
+        Número de chunks removidos
+    """
+    if not fontes:
+        return 0
+    if vectorstore is None:
+        vectorstore = criar_ou_carregar_vectorstore()
+    return sum(remover_documento(fonte, vectorstore) for fonte in fontes)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# OPERAÇÕES POR DOCUMENTO
+# ────────────────────────────────────────────────────────────────────────────────
+def listar_documentos() -> List[dict]:
+    """
+    Lista os documentos indexados.
+    
+    Returns:
+        Lista de {fonte, chunks, hash, origem, indexado_em}, em ordem alfabética
+    """
+    manifesto = carregar_manifesto()
+    return [
+        {
+            "fonte": fonte,
+            "chunks": len(dados.get("chunks", [])),
+            "hash": dados.get("hash"),
+            "origem": dados.get("origem"),
+            "indexado_em": dados.get("indexado_em"),
+        }
+        for fonte, dados in sorted(manifesto["arquivos"].items())
+    ]
+
+
+def _ids_da_fonte(vectorstore: VectorStore, fonte: str) -> List[str]:
+    """IDs de todos os chunks com o metadado 'fonte' informado (só IDs, sem textos)."""
+    return vectorstore.get(where={"fonte": fonte}, include=[])["ids"]
+
+
+def remover_documento(fonte: str, vectorstore: Optional[VectorStore] = None) -> int:
+    """
+    Remove um documento da base, sem tocar nos demais.
+    
+    Apaga os chunks listados no manifesto e também os que tenham o metadado
+    'fonte' sem constar nele (restos de indexações interrompidas).
+    
+    Args:
+        fonte: Nome do documento (metadado 'fonte')
+        vectorstore: Base vetorial (carrega se None)
+        
+    Returns:
+        Número de chunks removidos
+    """
+    if vectorstore is None:
+        vectorstore = criar_ou_carregar_vectorstore()
+    
+    with _LOCK_MANIFESTO:
+        manifesto = carregar_manifesto()
+        ids = set(manifesto["arquivos"].pop(fonte, {}).get("chunks", []))
+        ids.update(_ids_da_fonte(vectorstore, fonte))
+        if ids:
+            _apagar_chunks(vectorstore, sorted(ids))
+        salvar_manifesto(manifesto)
+    
+    if ids:
+        print(f"🗑️  '{fonte}' removido ({len(ids)} chunks)")
+    return len(ids)
+
+
+def substituir_documento(
+    chunks: Iterable[Document],
+    fonte: str,
+    hash_arquivo: Optional[str] = None,
+    origem: str = "upload",
+    progresso: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[VectorStore, int]:
+    """
+    Substitui o conteúdo de um documento pela nova versão.
+    
+    Só os chunks novos recebem embeddings (ver indexar_em_lotes); ao final,
+    qualquer chunk da mesma fonte que não pertença à nova versão é apagado.
+    
+    Args:
+        chunks: Iterável de chunks da nova versão
+        fonte: Nome do documento (metadado 'fonte')
+        hash_arquivo: SHA-256 do arquivo (opcional)
+        origem: Origem do documento no manifesto ('pasta' ou 'upload')
+        progresso: Repassado a indexar_em_lotes
+        
+    Returns:
+        Tuple com (base vetorial, total de chunks do documento)
+    """
+    vectorstore, total = indexar_em_lotes(
+        chunks, fonte=fonte, hash_arquivo=hash_arquivo, origem=origem, progresso=progresso
     )
+    if total:
+        atuais = set(carregar_manifesto()["arquivos"].get(fonte, {}).get("chunks", []))
+        orfaos = [chunk_id for chunk_id in _ids_da_fonte(vectorstore, fonte) if chunk_id not in atuais]
+        if orfaos:
+            _apagar_chunks(vectorstore, orfaos)
+    return vectorstore, total
+
+
+def indexar_pasta_incremental(pasta: Optional[Path] = None, workers: Optional[int] = None) -> VectorStore:
+    """
+    Sincroniza a base vetorial com a pasta de PDFs.
     
-    print(f"✅ {len(chunks)} chunks indexados com sucesso!")
+    Arquivos com hash inalterado nem são reabertos; arquivos novos ou
+    alterados são reprocessados e só os chunks diferentes recebem novos
+    embeddings; arquivos removidos da pasta têm seus vetores apagados.
+    Documentos enviados por upload não são afetados.
+    
+    A leitura dos PDFs roda em `workers` processos e cada arquivo é
+    indexado assim que seus chunks ficam prontos.
+    
+    Args:
+        pasta: Pasta com os PDFs (padrão: documentos/)
+        workers: Processos de leitura (padrão: RAG_PDF_WORKERS)
+        
+    Returns:
+        Instância do ChromaDB sincronizada
+    """
+    from processador_pdf import (
+        DOCUMENTOS_DIR,
+        WORKERS_PADRAO,
+        calcular_hash_arquivo,
+        iterar_pdfs_processados,
+    )
+    
+    pasta = pasta or DOCUMENTOS_DIR
+    pasta.mkdir(parents=True, exist_ok=True)
+    vectorstore = criar_ou_carregar_vectorstore()
+    registrados = _carregar_manifesto_sincronizado(vectorstore)["arquivos"]
+    
+    arquivos_pdf = sorted(pasta.glob("*.pdf"))
+    presentes = {pdf_path.name for pdf_path in arquivos_pdf}
+    removidos = [
+        fonte for fonte, info in registrados.items()
+        if info.get("origem") == "pasta" and fonte not in presentes
+    ]
+    
+    hashes: Dict[str, str] = {}
+    for pdf_path in arquivos_pdf:
+        hash_arquivo = calcular_hash_arquivo(pdf_path)
+        if registrados.get(pdf_path.name, {}).get("hash") != hash_arquivo:
+            hashes[pdf_path.name] = hash_arquivo
+    alterados = [pdf_path for pdf_path in arquivos_pdf if pdf_path.name in hashes]
+    
+    print(f"📂 {len(arquivos_pdf)} PDFs: {len(arquivos_pdf) - len(alterados)} inalterados, "
+          f"{len(alterados)} novos/alterados, {len(removidos)} removidos")
+    
+    if removidos:
+        total = remover_fontes(removidos, vectorstore=vectorstore)
+        print(f"   🗑️  {total} chunks de arquivos removidos apagados")
+    
+    for pdf_path, chunks_pdf, erro in iterar_pdfs_processados(
+        alterados, workers if workers is not None else WORKERS_PADRAO, hashes=hashes
+    ):
+        print(f"   📄 Processado: {pdf_path.name}")
+        if erro is not None:
+            print(f"      ❌ Erro ao processar: {erro}")
+            continue
+        print(f"      └─ {len(chunks_pdf)} chunks criados")
+        if chunks_pdf:
+            vectorstore = indexar_documentos(
+                chunks_pdf,
+                incremental=True,
+                hashes_arquivos={pdf_path.name: hashes[pdf_path.name]},
+                origem="pasta",
+            )
     
     return vectorstore
 
 
-def buscar_similares(query: str, k: int = 3, vectorstore: Optional[Chroma] = None) -> List[Document]:
+def buscar_similares(query: str, k: int = 3, vectorstore: Optional[VectorStore] = None) -> List[Document]:
     """
     Busca os k documentos mais similares à query.
     
@@ -164,7 +938,7 @@ def buscar_similares(query: str, k: int = 3, vectorstore: Optional[Chroma] = Non
         vectorstore = criar_ou_carregar_vectorstore()
     
     # Verifica se há documentos na base
-    if vectorstore._collection.count() == 0:
+    if _contar_vetores(vectorstore) == 0:
         print("⚠️  Base vetorial vazia. Indexe documentos primeiro.")
         return []
     
@@ -173,7 +947,278 @@ def buscar_similares(query: str, k: int = 3, vectorstore: Optional[Chroma] = Non
     return resultados
 
 
-def buscar_com_scores(query: str, k: int = 3, vectorstore: Optional[Chroma] = None) -> List[tuple]:
+def reconstruir_indice_lexico(vectorstore: Optional[VectorStore] = None) -> int:
+    """
+    Reconstrói o índice BM25 a partir dos chunks já gravados na coleção.
+    
+    Útil para bases criadas antes do índice léxico existir.
+    
+    Returns:
+        Número de chunks indexados
+    """
+    if vectorstore is None:
+        vectorstore = criar_ou_carregar_vectorstore()
+    
+    indice = _indice_lexico()
+    indice.limpar()
+    total = contar_documentos(vectorstore)
+    for inicio in range(0, total, 1000):
+        dados = vectorstore.get(include=["documents", "metadatas"], limit=1000, offset=inicio)
+        chunks = [
+            Document(page_content=texto or "", metadata=meta or {})
+            for texto, meta in zip(dados["documents"], dados["metadatas"])
+        ]
+        indice.adicionar(dados["ids"], chunks)
+    return total
+
+
+class FiltroBusca:
+    """
+    Restrição da busca por documento, intervalo de páginas e data de ingestão.
+
+    Aplicado antes da varredura vetorial (pré-filtro) e também ao BM25, de
+    modo que uma busca restrita a um documento não percorre a base inteira.
+    Chunks indexados antes do metadado 'indexado_em' existir não passam em
+    filtros de data.
+    """
+
+    def __init__(
+        self,
+        fontes: Optional[Iterable[str]] = None,
+        pagina_min: Optional[int] = None,
+        pagina_max: Optional[int] = None,
+        indexado_desde: Optional[float] = None,
+        indexado_ate: Optional[float] = None,
+    ):
+        self.fontes = sorted(set(fontes)) if fontes is not None else None
+        self.pagina_min = pagina_min
+        self.pagina_max = pagina_max
+        self.indexado_desde = indexado_desde
+        self.indexado_ate = indexado_ate
+
+    @property
+    def vazio(self) -> bool:
+        return self.where() is None
+
+    def where(self) -> Optional[dict]:
+        """Filtro no formato `where` do Chroma (None se nada for restringido)."""
+        condicoes = []
+        if self.fontes is not None:
+            condicoes.append({"fonte": {"$in": self.fontes}})
+        if self.pagina_min is not None:
+            condicoes.append({"page": {"$gte": self.pagina_min}})
+        if self.pagina_max is not None:
+            condicoes.append({"page": {"$lte": self.pagina_max}})
+        if self.indexado_desde is not None:
+            condicoes.append({"indexado_em": {"$gte": int(self.indexado_desde)}})
+        if self.indexado_ate is not None:
+            condicoes.append({"indexado_em": {"$lte": int(self.indexado_ate)}})
+        if not condicoes:
+            return None
+        return condicoes[0] if len(condicoes) == 1 else {"$and": condicoes}
+
+    def chave(self) -> tuple:
+        """Identificação estável do filtro (para caches)."""
+        return (
+            tuple(self.fontes) if self.fontes is not None else None,
+            self.pagina_min, self.pagina_max, self.indexado_desde, self.indexado_ate,
+        )
+
+
+def _buscar_vetores_em_lote(
+    vectorstore: VectorStore,
+    vetores: List[List[float]],
+    k: int,
+    filtro: Optional[FiltroBusca] = None,
+) -> List[List[tuple]]:
+    """Top-k vetorial de várias consultas numa única chamada à base."""
+    where = filtro.where() if filtro else None
+    if filtro and filtro.fontes == []:
+        return [[] for _ in vetores]
+    if isinstance(vectorstore, VetorialNumpy):
+        resultados = vectorstore.buscar_em_lote(vetores, k=k, where=where)
+    else:
+        dados = vectorstore._collection.query(
+            query_embeddings=vetores,
+            n_results=k,
+            where=where,
+            include=["documents", "metadatas", "distances"],
+        )
+        resultados = [
+            [
+                (Document(page_content=texto or "", metadata=meta or {}, id=chunk_id), distancia)
+                for chunk_id, texto, meta, distancia in zip(ids, textos, metas, distancias)
+            ]
+            for ids, textos, metas, distancias in zip(
+                dados["ids"], dados["documents"], dados["metadatas"], dados["distances"]
+            )
+        ]
+    if filtro and filtro.fontes and INDICE_DUPLICATAS_PATH.exists():
+        resultados = _incluir_canonicos(vectorstore, vetores, k, filtro, resultados)
+    return resultados
+
+
+def _incluir_canonicos(
+    vectorstore: VectorStore,
+    vetores: List[List[float]],
+    k: int,
+    filtro: FiltroBusca,
+    resultados: List[List[tuple]],
+) -> List[List[tuple]]:
+    """
+    Completa uma busca restrita a documentos com os canônicos de outros
+    documentos que têm cópia neles (a cópia não tem vetor próprio).
+    """
+    canonicos = _indice_duplicatas().canonicos_das_fontes(filtro.fontes, filtro.pagina_min, filtro.pagina_max)
+    if not canonicos:
+        return resultados
+    por_data = FiltroBusca(indexado_desde=filtro.indexado_desde, indexado_ate=filtro.indexado_ate)
+    dados = vectorstore.get(ids=canonicos, where=por_data.where(), include=["documents", "metadatas", "embeddings"])
+    if not dados["ids"]:
+        return resultados
+    
+    completos = []
+    for vetor_query, encontrados in zip(vetores, resultados):
+        presentes = {doc.id for doc, _ in encontrados}
+        extras = [
+            (
+                Document(page_content=texto or "", metadata=meta or {}, id=chunk_id),
+                sum((float(a) - b) ** 2 for a, b in zip(vetor, vetor_query)),
+            )
+            for chunk_id, texto, meta, vetor in zip(
+                dados["ids"], dados["documents"], dados["metadatas"], dados["embeddings"]
+            )
+            if chunk_id not in presentes
+        ]
+        completos.append(sorted(encontrados + extras, key=lambda par: par[1])[:k])
+    return completos
+
+
+def _anotar_fontes(resultados: List[List[tuple]]) -> List[List[tuple]]:
+    """
+    Lista em `metadata['fontes']` todos os documentos em que cada chunk
+    aparece (o dele e os das quase-duplicatas ligadas a ele).
+    """
+    if not INDICE_DUPLICATAS_PATH.exists():
+        return resultados
+    ids = sorted({doc.id for lista in resultados for doc, _ in lista if doc.id})
+    copias = _indice_duplicatas().fontes_das_copias(ids)
+    if not copias:
+        return resultados
+    anotados = []
+    for lista in resultados:
+        nova = []
+        for doc, score in lista:
+            if doc.id in copias:
+                fonte = doc.metadata.get("fonte")
+                fontes = [fonte] + [f for f in dict.fromkeys(copias[doc.id]) if f != fonte]
+                # Cópia do metadata: o backend numpy pode reaproveitar o dicionário
+                doc = Document(
+                    page_content=doc.page_content,
+                    metadata={**doc.metadata, "fontes": fontes, "copias": len(copias[doc.id])},
+                    id=doc.id,
+                )
+            nova.append((doc, score))
+        anotados.append(nova)
+    return anotados
+
+
+def _busca_hibrida_em_lote(
+    queries: List[str],
+    vetores: List[List[float]],
+    k: int,
+    vectorstore: VectorStore,
+    filtro: Optional[FiltroBusca] = None,
+) -> List[List[tuple]]:
+    """
+    Funde o ranking vetorial com o BM25 por Reciprocal Rank Fusion.
+    
+    Os scores devolvidos continuam sendo distâncias vetoriais, para que a
+    interface interprete resultados léxicos e vetoriais da mesma forma.
+    """
+    candidatos = max(k * 4, 10)
+    
+    indice = _indice_lexico()
+    if indice.contar() == 0:
+        reconstruir_indice_lexico(vectorstore)
+    
+    # O índice léxico filtra documento e página; a data é conferida na leitura abaixo
+    filtro_lexico = {}
+    if filtro:
+        filtro_lexico = {
+            "fontes": filtro.fontes, "pagina_min": filtro.pagina_min, "pagina_max": filtro.pagina_max
+        }
+    verificar_data = bool(filtro and (filtro.indexado_desde is not None or filtro.indexado_ate is not None))
+    
+    por_consulta = []
+    faltantes = set()
+    for query, vetoriais in zip(queries, _buscar_vetores_em_lote(vectorstore, vetores, candidatos, filtro)):
+        por_id = {doc.id: (doc, distancia) for doc, distancia in vetoriais}
+        lexicos = [chunk_id for chunk_id, _ in indice.buscar(query, k=candidatos, **filtro_lexico)]
+        if verificar_data:
+            faltantes.update(chunk_id for chunk_id in lexicos if chunk_id not in por_id)
+        por_consulta.append((lexicos, por_id))
+    
+    if not verificar_data:
+        por_consulta = [
+            (fundir_rankings([list(por_id), lexicos])[:k], por_id) for lexicos, por_id in por_consulta
+        ]
+        faltantes = {
+            chunk_id for melhores, por_id in por_consulta for chunk_id in melhores if chunk_id not in por_id
+        }
+    
+    # Resultados só léxicos: busca texto e vetor (de todas as consultas de uma vez)
+    # para calcular a distância real
+    encontrados = {}
+    if faltantes:
+        dados = vectorstore.get(
+            ids=sorted(faltantes),
+            where=filtro.where() if verificar_data else None,
+            include=["documents", "metadatas", "embeddings"],
+        )
+        for chunk_id, texto, meta, vetor in zip(
+            dados["ids"], dados["documents"], dados["metadatas"], dados["embeddings"]
+        ):
+            encontrados[chunk_id] = (texto, meta or {}, vetor)
+    
+    if verificar_data:
+        por_consulta = [
+            (
+                fundir_rankings([
+                    list(por_id),
+                    [chunk_id for chunk_id in lexicos if chunk_id in por_id or chunk_id in encontrados],
+                ])[:k],
+                por_id,
+            )
+            for lexicos, por_id in por_consulta
+        ]
+    
+    resultados = []
+    for (melhores, por_id), vetor_query in zip(por_consulta, vetores):
+        for chunk_id in melhores:
+            if chunk_id not in por_id and chunk_id in encontrados:
+                texto, meta, vetor = encontrados[chunk_id]
+                distancia = sum((float(a) - b) ** 2 for a, b in zip(vetor, vetor_query))
+                por_id[chunk_id] = (Document(page_content=texto, metadata=meta, id=chunk_id), distancia)
+        resultados.append([por_id[chunk_id] for chunk_id in melhores if chunk_id in por_id])
+    return resultados
+
+
+def _busca_hibrida(
+    query: str, k: int, vectorstore: VectorStore, filtro: Optional[FiltroBusca] = None
+) -> List[tuple]:
+    """Busca híbrida (BM25 + vetorial) de uma única consulta."""
+    vetor_query = vectorstore.embeddings.embed_query(query)
+    return _busca_hibrida_em_lote([query], [vetor_query], k, vectorstore, filtro)[0]
+
+
+def buscar_com_scores(
+    query: str,
+    k: int = 3,
+    vectorstore: Optional[VectorStore] = None,
+    modo: Optional[str] = None,
+    filtro: Optional[FiltroBusca] = None,
+) -> List[tuple]:
     """
     Busca similares retornando também os scores de similaridade.
     
@@ -181,70 +1226,150 @@ def buscar_com_scores(query: str, k: int = 3, vectorstore: Optional[Chroma] = No
         query: Texto da pergunta/busca
         k: Número de resultados
         vectorstore: Instância do ChromaDB
+        modo: 'hibrido' (BM25 + vetorial) ou 'vetorial' (padrão: RAG_MODO_BUSCA)
+        filtro: Restringe a busca a documentos, páginas ou período de ingestão
         
     Returns:
-        Lista de tuplas (Document, score)
+        Lista de tuplas (Document, score), score = distância vetorial
     """
     if vectorstore is None:
         vectorstore = criar_ou_carregar_vectorstore()
+    modo = modo or MODO_BUSCA_PADRAO
+    filtro = None if filtro is None or filtro.vazio else filtro
 
-    try:
-        if vectorstore._collection.count() == 0:
+    def _buscar(vs: VectorStore) -> List[tuple]:
+        if _contar_vetores(vs) == 0:
             return []
-        resultados = vectorstore.similarity_search_with_score(query, k=k)
-        return resultados
+        if modo == "hibrido":
+            return _busca_hibrida(query, k, vs, filtro)
+        if filtro:
+            return _buscar_vetores_em_lote(vs, [vs.embeddings.embed_query(query)], k, filtro)[0]
+        return vs.similarity_search_with_score(query, k=k)
+
+    try:
+        return _anotar_fontes([_buscar(vectorstore)])[0]
     except Exception:
         # Se o DB estiver inválido, tenta recriar vazio e retorna sem resultados
         vectorstore = criar_ou_carregar_vectorstore()
         try:
-            if vectorstore._collection.count() == 0:
-                return []
-            return vectorstore.similarity_search_with_score(query, k=k)
+            return _anotar_fontes([_buscar(vectorstore)])[0]
         except Exception:
             return []
 
 
-def contar_documentos(vectorstore: Optional[Chroma] = None) -> int:
+def buscar_em_lote(
+    queries: List[str],
+    k: int = 3,
+    vectorstore: Optional[VectorStore] = None,
+    modo: Optional[str] = None,
+    tempos: Optional[dict] = None,
+    filtro: Optional[FiltroBusca] = None,
+) -> List[List[tuple]]:
+    """
+    Busca várias perguntas de uma vez: uma chamada de embeddings para todas
+    e uma busca vetorial em lote.
+    
+    Args:
+        queries: Perguntas
+        k: Número de resultados por pergunta
+        vectorstore: Instância do ChromaDB
+        modo: 'hibrido' (BM25 + vetorial) ou 'vetorial' (padrão: RAG_MODO_BUSCA)
+        tempos: Dicionário preenchido com embeddings_ms e busca_ms do lote
+        filtro: Restringe a busca a documentos, páginas ou período de ingestão
+        
+    Returns:
+        Uma lista de (Document, score) por pergunta, na ordem recebida
+    """
+    if vectorstore is None:
+        vectorstore = criar_ou_carregar_vectorstore()
+    modo = modo or MODO_BUSCA_PADRAO
+    filtro = None if filtro is None or filtro.vazio else filtro
+    tempos = tempos if tempos is not None else {}
+    if not queries or _contar_vetores(vectorstore) == 0:
+        return [[] for _ in queries]
+    
+    # all-MiniLM-L6-v2 codifica perguntas e documentos da mesma forma
+    inicio = time.perf_counter()
+    vetores = vectorstore.embeddings.embed_documents(list(queries))
+    tempos["embeddings_ms"] = 1000 * (time.perf_counter() - inicio)
+    
+    inicio = time.perf_counter()
+    if modo == "hibrido":
+        resultados = _busca_hibrida_em_lote(list(queries), vetores, k, vectorstore, filtro)
+    else:
+        resultados = _buscar_vetores_em_lote(vectorstore, vetores, k, filtro)
+    resultados = _anotar_fontes(resultados)
+    tempos["busca_ms"] = 1000 * (time.perf_counter() - inicio)
+    return resultados
+
+
+def contar_documentos(vectorstore: Optional[VectorStore] = None) -> int:
     """Retorna o número de documentos indexados."""
     if vectorstore is None:
         vectorstore = criar_ou_carregar_vectorstore()
 
     try:
-        return vectorstore._collection.count()
+        return _contar_vetores(vectorstore)
     except Exception:
         # Tenta recriar o DB se estiver corrompido
         vectorstore = criar_ou_carregar_vectorstore()
         try:
-            return vectorstore._collection.count()
+            return _contar_vetores(vectorstore)
         except Exception:
             return 0
 
 
 def main():
     """Pipeline completo: processa PDFs e indexa."""
-    from processador_pdf import processar_todos_pdfs
+    import argparse
+    from processador_pdf import DOCUMENTOS_DIR, WORKERS_PADRAO
+    
+    parser = argparse.ArgumentParser(description="Indexador vetorial do Assistente RAG")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reindexa apenas PDFs novos/alterados e remove os apagados da pasta",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS_PADRAO,
+        help="Processos paralelos para leitura dos PDFs (padrão: RAG_PDF_WORKERS ou 1)",
+    )
+    parser.add_argument("--listar", action="store_true", help="Lista os documentos indexados")
+    parser.add_argument("--remover", nargs="+", metavar="FONTE", help="Remove documentos pelo nome")
+    parser.add_argument("--compactar", action="store_true", help="Compacta a base vetorial")
+    args = parser.parse_args()
     
     print("=" * 60)
     print("  INDEXADOR VETORIAL - Assistente RAG")
     print("=" * 60)
     print()
     
-    # 1. Processa PDFs
-    chunks = processar_todos_pdfs()
+    if args.listar or args.remover or args.compactar:
+        if args.remover:
+            remover_fontes(args.remover)
+        if args.compactar:
+            compactar_base()
+        if args.listar:
+            for doc in listar_documentos():
+                print(f"📄 {doc['fonte']:<40} {doc['chunks']:>6} chunks  {doc['origem']:<7} {doc['hash'][:12]}")
+        return
     
-    if not chunks:
-        print("\n⚠️  Coloque PDFs na pasta documentos/ e execute novamente.")
+    if not any(DOCUMENTOS_DIR.glob("*.pdf")):
+        print("⚠️  Coloque PDFs na pasta documentos/ e execute novamente.")
         return
     
-    print()
+    if not args.incremental:
+        # Reconstrução completa: a sincronização abaixo reindexa tudo
+        _remover_base()
     
-    # 2. Indexa no ChromaDB
-    vectorstore = indexar_documentos(chunks, limpar_base=True)
+    vectorstore = indexar_pasta_incremental(workers=args.workers)
     
     print()
     print(f"📊 Total de documentos na base: {contar_documentos(vectorstore)}")
     
-    # 3. Teste de busca
+    # Teste de busca
     print()
     print("🔍 Teste de busca semântica:")
     print("-" * 40)
@@ -0,0 +1,266 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Índice Léxico (BM25) - Assistente Corporativo RAG
+Índice invertido em SQLite para casar termos exatos (números de contrato,
+artigos, códigos de produto) que a busca vetorial costuma perder
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import math
+import re
+import sqlite3
+import unicodedata
+
+from langchain_core.documents import Document
+
+# Parâmetros clássicos do Okapi BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Termos muito frequentes em português que só inflariam as listas invertidas
+STOPWORDS = {
+    "a", "ao", "aos", "as", "com", "como", "da", "das", "de", "do", "dos", "e",
+    "ela", "ele", "em", "entre", "era", "essa", "esse", "esta", "este", "eu",
+    "foi", "ha", "isso", "ja", "lhe", "mais", "mas", "me", "mesmo", "na", "nas",
+    "nao", "no", "nos", "o", "os", "ou", "para", "pela", "pelas", "pelo", "pelos",
+    "por", "qual", "quando", "que", "se", "sem", "ser", "seu", "sua", "so", "tem",
+    "um", "uma", "voce",
+}
+
+# Tokens alfanuméricos, mantendo códigos compostos como "ct-2023/0042" ou "12.345"
+_REGEX_TOKEN = re.compile(r"[a-z0-9]+(?:[./\-][a-z0-9]+)*")
+
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Converte texto em termos de busca.
+
+    Remove acentos e caixa; códigos compostos são indexados inteiros e
+    também por partes, para que "0042" encontre "CT-2023/0042".
+    """
+    sem_acento = unicodedata.normalize("NFKD", texto.lower())
+    sem_acento = "".join(c for c in sem_acento if not unicodedata.combining(c))
+    termos = []
+    for token in _REGEX_TOKEN.findall(sem_acento):
+        if token not in STOPWORDS:
+            termos.append(token)
+        if not token.isalnum():
+            termos.extend(p for p in re.split(r"[./\-]", token) if p and p not in STOPWORDS)
+    return termos
+
+
+class IndiceLexico:
+    """Índice invertido BM25 persistido em SQLite, endereçado pelos IDs dos chunks."""
+
+    def __init__(self, caminho: Path):
+        self.caminho = Path(caminho)
+        self._esquema_criado = False
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão por operação (commit ao sair, sempre fechada)."""
+        # O esquema só é recriado se o arquivo sumiu (ex.: base limpa por outro caminho)
+        criar_esquema = not self._esquema_criado or not self.caminho.exists()
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.caminho))
+        if criar_esquema:
+            self._criar_esquema(conn)
+            self._esquema_criado = True
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _criar_esquema(conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documentos (
+                chunk_id TEXT PRIMARY KEY,
+                comprimento INTEGER NOT NULL,
+                fonte TEXT,
+                pagina INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                termo TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (termo, chunk_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings (chunk_id);
+            -- N e soma dos comprimentos, mantidos por adicionar/remover para o BM25
+            CREATE TABLE IF NOT EXISTS estatisticas (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                total INTEGER NOT NULL,
+                soma_comprimentos INTEGER NOT NULL
+            );
+            -- Índices criados antes da tabela de estatísticas: conta uma única vez
+            INSERT OR IGNORE INTO estatisticas (id, total, soma_comprimentos)
+                SELECT 0, COUNT(*), COALESCE(SUM(comprimento), 0) FROM documentos;
+            """
+        )
+
+    @staticmethod
+    def _somar_estatisticas(conn: sqlite3.Connection, total: int, soma_comprimentos: int) -> None:
+        conn.execute(
+            "UPDATE estatisticas SET total = total + ?, soma_comprimentos = soma_comprimentos + ? WHERE id = 0",
+            (total, soma_comprimentos),
+        )
+
+    def adicionar(self, ids: Sequence[str], chunks: Sequence[Document]) -> None:
+        """Indexa (ou reindexa) os chunks informados."""
+        with self._conectar() as conn:
+            self._apagar(conn, ids)
+            adicionados, soma_comprimentos = 0, 0
+            for chunk_id, chunk in zip(ids, chunks):
+                termos = Counter(tokenizar(chunk.page_content))
+                comprimento = sum(termos.values())
+                adicionados += 1
+                soma_comprimentos += comprimento
+                conn.execute(
+                    "INSERT INTO documentos (chunk_id, comprimento, fonte, pagina) VALUES (?, ?, ?, ?)",
+                    (
+                        chunk_id,
+                        comprimento,
+                        chunk.metadata.get("fonte"),
+                        chunk.metadata.get("page"),
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO postings (termo, chunk_id, tf) VALUES (?, ?, ?)",
+                    [(termo, chunk_id, tf) for termo, tf in termos.items()],
+                )
+            self._somar_estatisticas(conn, adicionados, soma_comprimentos)
+
+    def remover(self, ids: Sequence[str]) -> None:
+        """Remove os chunks informados do índice."""
+        with self._conectar() as conn:
+            self._apagar(conn, ids)
+
+    @staticmethod
+    def _apagar(conn: sqlite3.Connection, ids: Sequence[str]) -> None:
+        lista = list(ids)
+        for inicio in range(0, len(lista), 500):
+            lote = lista[inicio:inicio + 500]
+            marcadores = ",".join("?" * len(lote))
+            removidos, soma_comprimentos = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(comprimento), 0) FROM documentos WHERE chunk_id IN ({marcadores})",
+                lote,
+            ).fetchone()
+            IndiceLexico._somar_estatisticas(conn, -removidos, -soma_comprimentos)
+            conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({marcadores})", lote)
+            conn.execute(f"DELETE FROM documentos WHERE chunk_id IN ({marcadores})", lote)
+
+    def buscar(
+        self,
+        query: str,
+        k: int = 10,
+        fontes: Optional[Sequence[str]] = None,
+        pagina_min: Optional[int] = None,
+        pagina_max: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Ranqueia chunks por BM25.
+
+        Args:
+            query: Texto da busca
+            k: Número máximo de resultados
+            fontes: Restringe a esses documentos
+            pagina_min: Primeira página aceita
+            pagina_max: Última página aceita
+
+        Returns:
+            Lista de (chunk_id, score BM25) em ordem decrescente de score
+        """
+        termos = set(tokenizar(query))
+        if not termos or (fontes is not None and not fontes):
+            return []
+
+        # IDF e comprimento médio continuam globais; o filtro só restringe os candidatos
+        condicoes, parametros = [], []
+        if fontes is not None:
+            condicoes.append(f"d.fonte IN ({','.join('?' * len(fontes))})")
+            parametros.extend(fontes)
+        if pagina_min is not None:
+            condicoes.append("d.pagina >= ?")
+            parametros.append(pagina_min)
+        if pagina_max is not None:
+            condicoes.append("d.pagina <= ?")
+            parametros.append(pagina_max)
+        filtro_sql = "".join(f" AND {condicao}" for condicao in condicoes)
+
+        with self._conectar() as conn:
+            total, soma_comprimentos = conn.execute(
+                "SELECT total, soma_comprimentos FROM estatisticas WHERE id = 0"
+            ).fetchone()
+            if not total:
+                return []
+            media = soma_comprimentos / total
+
+            scores: Dict[str, float] = {}
+            for termo in termos:
+                postings = conn.execute(
+                    f"""
+                    SELECT p.chunk_id, p.tf, d.comprimento
+                    FROM postings p JOIN documentos d ON d.chunk_id = p.chunk_id
+                    WHERE p.termo = ?{filtro_sql}
+                    """,
+                    (termo, *parametros),
+                ).fetchall()
+                if not postings:
+                    continue
+                frequencia = len(postings)
+                if condicoes:
+                    (frequencia,) = conn.execute(
+                        "SELECT COUNT(*) FROM postings WHERE termo = ?", (termo,)
+                    ).fetchone()
+                idf = math.log(1 + (total - frequencia + 0.5) / (frequencia + 0.5))
+                for chunk_id, tf, comprimento in postings:
+                    norma = BM25_K1 * (1 - BM25_B + BM25_B * comprimento / (media or 1))
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norma)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def contar(self) -> int:
+        """Número de chunks no índice."""
+        if not self.caminho.exists():
+            return 0
+        with self._conectar() as conn:
+            return conn.execute("SELECT total FROM estatisticas WHERE id = 0").fetchone()[0]
+
+    def compactar(self) -> None:
+        """Devolve ao disco o espaço de linhas removidas (VACUUM)."""
+        if not self.caminho.exists():
+            return
+        with self._conectar() as conn:
+            conn.execute("VACUUM")
+
+    def limpar(self) -> None:
+        """Remove todos os chunks do índice."""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM documentos")
+            conn.execute("UPDATE estatisticas SET total = 0, soma_comprimentos = 0 WHERE id = 0")
+
+
+def fundir_rankings(rankings: Sequence[Sequence[str]], k_rrf: int = 60) -> List[str]:
+    """
+    Funde rankings por Reciprocal Rank Fusion (RRF).
+
+    Args:
+        rankings: Listas de IDs, cada uma em ordem de relevância
+        k_rrf: Constante de suavização do RRF
+
+    Returns:
+        IDs ordenados pelo score fundido
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for posicao, chunk_id in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k_rrf + posicao + 1)
+    return sorted(scores, key=scores.get, reverse=True)
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+LLM Falso - Assistente Corporativo RAG
+Chat model local que emite tokens com atraso configurável, para testar o
+streaming de respostas e as métricas de latência sem chamar a API do Gemini
+"""
+
+from typing import Any, Iterator, List, Optional
+import re
+import time
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+RESPOSTA_PADRAO = (
+    "Resposta simulada: de acordo com os trechos encontrados nos documentos, "
+    "a informação solicitada está descrita no contexto fornecido."
+)
+
+
+class ChatFalso(BaseChatModel):
+    """
+    Chat model determinístico para desenvolvimento.
+
+    Atributos:
+        resposta: Texto devolvido (palavra a palavra no streaming)
+        atraso_inicial_ms: Espera antes do primeiro token (simula fila/prefill)
+        atraso_token_ms: Espera entre tokens (simula decodificação)
+        falhar: Se True, levanta erro antes do primeiro token
+    """
+
+    resposta: str = RESPOSTA_PADRAO
+    atraso_inicial_ms: float = 300.0
+    atraso_token_ms: float = 30.0
+    falhar: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "chat-falso"
+
+    def _tokens(self) -> List[str]:
+        # Palavras com o espaço que as precede, para que a concatenação reproduza o texto
+        return re.findall(r"\s*\S+", self.resposta)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.atraso_inicial_ms / 1000)
+        if self.falhar:
+            raise RuntimeError("Falha simulada do ChatFalso")
+        for i, token in enumerate(self._tokens()):
+            if i:
+                time.sleep(self.atraso_token_ms / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        texto = "".join(c.message.content for c in self._stream(messages, stop, None, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=texto))])
@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Lotes por Comprimento - Assistente Corporativo RAG
+Agenda os embeddings de documentos em lotes de comprimento parecido,
+limitados por um orçamento de tokens (com padding) em vez de um número
+fixo de textos, e calibra esse orçamento na CPU do host
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import random
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+
+ORCAMENTO_PADRAO = 4096                            # Tokens por lote (incluindo padding)
+CANDIDATOS_ORCAMENTO = (1024, 2048, 4096, 8192, 16384)
+MAX_TOKENS_PADRAO = 256                            # Truncamento do all-MiniLM-L6-v2
+CARACTERES_POR_TOKEN = 4.0                         # Estimativa sem tokenizer
+TOLERANCIA_CALIBRACAO = 0.05                       # Prefere o menor orçamento a até 5% do melhor
+LOTE_INTERNO_SEM_LIMITE = 1 << 20
+
+PALAVRAS_CALIBRACAO = (
+    "contrato política colaborador empresa prazo aprovação gestor documento "
+    "reembolso despesas cláusula fornecedor vigência valor mensal reajuste "
+    "segurança informação acesso sistema procedimento registro unidade"
+).split()
+
+
+def criar_contador_tokens(base: Embeddings, max_tokens: int = MAX_TOKENS_PADRAO) -> Callable[[Sequence[str]], List[int]]:
+    """
+    Retorna uma função que conta os tokens de cada texto (com truncamento).
+
+    Usa o tokenizer do próprio modelo quando acessível (sentence-transformers
+    ou ONNX); senão, estima pelo número de caracteres.
+    """
+    cliente = getattr(base, "_client", None)
+    tokenizer_hf = getattr(cliente, "tokenizer", None)
+    if tokenizer_hf is not None:
+        def contar_hf(textos: Sequence[str]) -> List[int]:
+            ids = tokenizer_hf(list(textos), truncation=True, max_length=max_tokens)["input_ids"]
+            return [len(i) for i in ids]
+        return contar_hf
+
+    tokenizer_onnx = getattr(base, "tokenizer", None)
+    if tokenizer_onnx is not None and hasattr(tokenizer_onnx, "encode_batch"):
+        def contar_onnx(textos: Sequence[str]) -> List[int]:
+            # O tokenizer ONNX tem padding ligado: conta só a máscara de atenção
+            return [sum(c.attention_mask) for c in tokenizer_onnx.encode_batch(list(textos))]
+        return contar_onnx
+
+    def estimar(textos: Sequence[str]) -> List[int]:
+        return [min(max_tokens, 2 + int(len(t) / CARACTERES_POR_TOKEN)) for t in textos]
+    return estimar
+
+
+def _desativar_lotes_internos(base: Embeddings) -> None:
+    """Faz o modelo processar cada lote recebido numa única passada."""
+    encode_kwargs = getattr(base, "encode_kwargs", None)
+    if isinstance(encode_kwargs, dict):
+        encode_kwargs["batch_size"] = LOTE_INTERNO_SEM_LIMITE
+    elif hasattr(base, "batch_size"):
+        base.batch_size = LOTE_INTERNO_SEM_LIMITE
+
+
+def planejar_lotes(comprimentos: Sequence[int], orcamento_tokens: int) -> List[List[int]]:
+    """
+    Agrupa índices em lotes de comprimento parecido.
+
+    Os textos são ordenados por comprimento e cada lote cresce enquanto
+    (textos no lote) x (maior comprimento do lote) couber no orçamento,
+    que é o custo real de um lote com padding.
+
+    Returns:
+        Lista de lotes, cada um com os índices originais dos textos
+    """
+    lotes: List[List[int]] = []
+    atual: List[int] = []
+    for indice in sorted(range(len(comprimentos)), key=lambda i: comprimentos[i]):
+        # Em ordem crescente, o texto que entra é sempre o maior do lote
+        if atual and comprimentos[indice] * (len(atual) + 1) > orcamento_tokens:
+            lotes.append(atual)
+            atual = []
+        atual.append(indice)
+    if atual:
+        lotes.append(atual)
+    return lotes
+
+
+class EmbeddingsPorComprimento(Embeddings):
+    """
+    Embeddings de documentos em lotes por comprimento sob orçamento de tokens.
+
+    A saída volta na ordem original dos textos. Queries passam direto
+    para o modelo base.
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        orcamento_tokens: int = ORCAMENTO_PADRAO,
+        max_tokens: int = MAX_TOKENS_PADRAO,
+        contar_tokens: Optional[Callable[[Sequence[str]], List[int]]] = None,
+    ):
+        self.base = base
+        self.orcamento_tokens = orcamento_tokens
+        self.contar_tokens = contar_tokens or criar_contador_tokens(base, max_tokens)
+        _desativar_lotes_internos(base)
+        self._lock = threading.Lock()
+        self._lotes = 0
+        self._textos = 0
+        self._tokens_reais = 0
+        self._tokens_com_padding = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        comprimentos = self.contar_tokens(texts)
+        resultado: List[Optional[List[float]]] = [None] * len(texts)
+        lotes = planejar_lotes(comprimentos, self.orcamento_tokens)
+        for lote in lotes:
+            vetores = self.base.embed_documents([texts[i] for i in lote])
+            for indice, vetor in zip(lote, vetores):
+                resultado[indice] = vetor
+
+        with self._lock:
+            self._lotes += len(lotes)
+            self._textos += len(texts)
+            self._tokens_reais += sum(comprimentos)
+            self._tokens_com_padding += sum(
+                len(lote) * max(comprimentos[i] for i in lote) for lote in lotes
+            )
+        return resultado
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.base.embed_query(text)
+
+    def metricas(self) -> dict:
+        """Tamanho médio dos lotes e fração dos tokens processados que não é padding."""
+        with self._lock:
+            return {
+                "orcamento_tokens": self.orcamento_tokens,
+                "lotes": self._lotes,
+                "media_lote": self._textos / self._lotes if self._lotes else 0.0,
+                "aproveitamento": (
+                    self._tokens_reais / self._tokens_com_padding if self._tokens_com_padding else 1.0
+                ),
+            }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# CALIBRAÇÃO DO ORÇAMENTO
+# ────────────────────────────────────────────────────────────────────────────────
+def _textos_calibracao(quantidade: int, caracteres_max: int, semente: int = 13) -> List[str]:
+    """Mistura de cabeçalhos curtos, fragmentos e chunks completos."""
+    rng = random.Random(semente)
+    textos = []
+    for _ in range(quantidade):
+        tamanho = rng.choice([40, 120, caracteres_max // 2, caracteres_max, caracteres_max])
+        palavras = []
+        while sum(len(p) + 1 for p in palavras) < tamanho:
+            palavras.append(rng.choice(PALAVRAS_CALIBRACAO))
+        textos.append(" ".join(palavras))
+    return textos
+
+
+def calibrar_orcamento(
+    base: Embeddings,
+    candidatos: Sequence[int] = CANDIDATOS_ORCAMENTO,
+    quantidade_textos: int = 96,
+    caracteres_max: int = 1000,
+) -> Tuple[int, Dict[int, float]]:
+    """
+    Mede a vazão (tokens reais por segundo) de cada orçamento candidato.
+
+    Args:
+        base: Modelo de embeddings puro
+        candidatos: Orçamentos a testar
+        quantidade_textos: Textos sintéticos por medição
+        caracteres_max: Tamanho dos chunks completos (CHUNK_SIZE)
+
+    Returns:
+        Tuple com (orçamento escolhido, {orçamento: tokens/s}); entre
+        orçamentos a até 5% do melhor, fica o menor (menos memória e latência)
+    """
+    textos = _textos_calibracao(quantidade_textos, caracteres_max)
+    agendador = EmbeddingsPorComprimento(base)
+    total_tokens = sum(agendador.contar_tokens(textos))
+    agendador.embed_documents(textos[:8])  # Aquecimento (alocação, threads)
+
+    vazoes: Dict[int, float] = {}
+    for orcamento in candidatos:
+        agendador.orcamento_tokens = orcamento
+        inicio = time.perf_counter()
+        agendador.embed_documents(textos)
+        vazoes[orcamento] = total_tokens / (time.perf_counter() - inicio)
+
+    melhor = max(vazoes.values())
+    escolhido = min(o for o, v in vazoes.items() if v >= melhor * (1 - TOLERANCIA_CALIBRACAO))
+    return escolhido, vazoes
+
+
+def carregar_ou_calibrar(base: Embeddings, caminho: Path, chave: str, calibrar: bool = True) -> int:
+    """
+    Orçamento salvo para esta combinação modelo/CPU, calibrando na primeira vez.
+
+    Args:
+        base: Modelo de embeddings puro
+        caminho: Arquivo JSON com as calibrações anteriores
+        chave: Identificador do modelo/backend (a contagem de CPUs é acrescentada)
+        calibrar: Se False, usa ORCAMENTO_PADRAO quando não houver calibração
+                  salva (caminho do app: a calibração custa segundos de CPU)
+
+    Returns:
+        Orçamento de tokens por lote
+    """
+    chave = f"{chave}|cpus={os.cpu_count()}"
+    try:
+        salvas = json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        salvas = {}
+    if chave in salvas:
+        return int(salvas[chave]["orcamento_tokens"])
+    if not calibrar:
+        return ORCAMENTO_PADRAO
+
+    print("⏱️  Calibrando orçamento de tokens dos lotes de embeddings...")
+    escolhido, vazoes = calibrar_orcamento(base)
+    print(
+        "   " + " | ".join(f"{o}: {v:,.0f} tok/s" for o, v in vazoes.items())
+        + f" → {escolhido}"
+    )
+    salvas[chave] = {"orcamento_tokens": escolhido, "vazoes": {str(o): v for o, v in vazoes.items()}}
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(json.dumps(salvas, indent=2), encoding="utf-8")
+    except OSError:
+        pass  # Sem disco gravável: vale só para este processo
+    return escolhido
+
+
+def main():
+    """Calibra o orçamento na CPU atual e salva para RAG_ORCAMENTO_TOKENS=auto."""
+    import indexador
+
+    caminho = indexador.CALIBRACAO_LOTES_PATH
+    chave = f"{indexador.chave_modelo_embeddings()}|{indexador.BACKEND_EMBEDDINGS}"
+    try:
+        salvas = json.loads(caminho.read_text(encoding="utf-8"))
+        salvas.pop(f"{chave}|cpus={os.cpu_count()}", None)
+        caminho.write_text(json.dumps(salvas, indent=2), encoding="utf-8")
+    except (OSError, ValueError):
+        pass
+    orcamento = carregar_ou_calibrar(indexador.criar_modelo_embeddings(), caminho, chave)
+    print(f"✅ Orçamento {orcamento} salvo em {caminho} (use RAG_ORCAMENTO_TOKENS=auto)")
+
+
+if __name__ == "__main__":
+    main()
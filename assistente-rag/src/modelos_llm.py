@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Modelos LLM - Assistente Corporativo RAG
+Lista de modelos Gemini (preferido + fallbacks) e a fábrica de chat models,
+compartilhadas pelo app e pela CLI de perguntas em lote
+"""
+
+import os
+
+GEMINI_MODEL_DEFAULT = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_MODEL_FALLBACKS = [
+    GEMINI_MODEL_DEFAULT,
+    "gemini-2.5-flash",
+    "gemini-2.5-pro",
+    "gemini-flash-latest",
+]
+# Chat model local para testar streaming sem API (RAG_LLM_FALSO=1)
+USAR_LLM_FALSO = os.getenv("RAG_LLM_FALSO", "0") != "0"
+LLM_FALSO_ATRASO_INICIAL_MS = float(os.getenv("RAG_LLM_FALSO_ATRASO_INICIAL_MS", "300"))
+LLM_FALSO_ATRASO_TOKEN_MS = float(os.getenv("RAG_LLM_FALSO_ATRASO_TOKEN_MS", "30"))
+
+
+def criar_llm(modelo_nome: str, api_key: str):
+    """Cria o chat model (Gemini, ou o falso local se RAG_LLM_FALSO=1)."""
+    if USAR_LLM_FALSO:
+        from llm_falso import ChatFalso
+
+        return ChatFalso(
+            atraso_inicial_ms=LLM_FALSO_ATRASO_INICIAL_MS,
+            atraso_token_ms=LLM_FALSO_ATRASO_TOKEN_MS,
+        )
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=modelo_nome,
+        google_api_key=api_key,
+        temperature=0.3,
+        max_output_tokens=1024,
+    )
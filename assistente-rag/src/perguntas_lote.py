@@ -0,0 +1,290 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Perguntas em Lote - Assistente Corporativo RAG
+Responde uma planilha de perguntas (CSV ou JSONL) sem passar pelo chat:
+busca em lotes vetorizados e geração concorrente com limite de taxa
+
+Uso:
+    python src/perguntas_lote.py perguntas.csv --saida respostas.jsonl
+    python src/perguntas_lote.py perguntas.jsonl --concorrencia 4 --rpm 60
+    python src/perguntas_lote.py perguntas.csv --sem-geracao --saida fontes.csv
+
+A pergunta vem da coluna/campo "pergunta" (ou da primeira coluna do CSV);
+os demais campos são repetidos na saída. A chave do Gemini vem de
+GEMINI_API_KEY; com RAG_LLM_FALSO=1 usa o chat model local.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+
+from contexto import ORCAMENTO_CONTEXTO_PADRAO, montar_prompt
+from indexador import FiltroBusca, buscar_em_lote, contar_documentos, criar_ou_carregar_vectorstore
+from modelos_llm import GEMINI_MODEL_FALLBACKS, criar_llm
+from pool_llm import PoolClientesLLM, gerar_stream
+
+LOTE_PADRAO = 64                 # Perguntas por chamada de embeddings/busca
+CONCORRENCIA_PADRAO = int(os.getenv("RAG_LOTE_CONCORRENCIA", "4"))
+RPM_PADRAO = float(os.getenv("RAG_LOTE_RPM", "60"))   # Requisições ao LLM por minuto (0 = sem limite)
+MODELOS_PADRAO = GEMINI_MODEL_FALLBACKS
+ORCAMENTO_CONTEXTO = int(os.getenv("RAG_ORCAMENTO_CONTEXTO", str(ORCAMENTO_CONTEXTO_PADRAO)))
+LLM_HEDGE_MS = float(os.getenv("RAG_LLM_HEDGE_MS", "0"))
+
+
+class LimitadorTaxa:
+    """Espaça as requisições para no máximo `por_minuto` (seguro entre threads)."""
+
+    def __init__(self, por_minuto: float):
+        self.intervalo = 60.0 / por_minuto if por_minuto > 0 else 0.0
+        self._proxima = 0.0
+        self._lock = threading.Lock()
+
+    def aguardar(self) -> float:
+        """Bloqueia até o próximo horário livre; retorna a espera em segundos."""
+        if not self.intervalo:
+            return 0.0
+        with self._lock:
+            agora = time.monotonic()
+            horario = max(agora, self._proxima)
+            self._proxima = horario + self.intervalo
+        espera = horario - agora
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ENTRADA E SAÍDA
+# ────────────────────────────────────────────────────────────────────────────────
+def ler_perguntas(caminho: Path) -> List[dict]:
+    """
+    Lê as perguntas de um CSV ou JSONL.
+
+    Returns:
+        Registros com a chave 'pergunta' mais os campos originais
+    """
+    registros = []
+    if caminho.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                if linha.strip():
+                    registros.append(json.loads(linha))
+    else:
+        with open(caminho, encoding="utf-8-sig", newline="") as arquivo:
+            leitor = csv.DictReader(arquivo)
+            coluna = "pergunta" if "pergunta" in (leitor.fieldnames or []) else (leitor.fieldnames or [None])[0]
+            for linha in leitor:
+                registros.append({**linha, "pergunta": linha.get(coluna) or ""})
+
+    registros = [r for r in registros if str(r.get("pergunta", "")).strip()]
+    if not registros:
+        raise ValueError(f"Nenhuma pergunta encontrada em {caminho}")
+    return registros
+
+
+def gravar_respostas(caminho: Path, resultados: List[dict]) -> None:
+    """Grava JSONL (estruturado) ou CSV (fontes e tempos achatados em colunas)."""
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    if caminho.suffix.lower() != ".csv":
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            for resultado in resultados:
+                arquivo.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        return
+
+    linhas = []
+    for resultado in resultados:
+        linha = {c: v for c, v in resultado.items() if c not in ("fontes", "tempos", "contexto")}
+        linha["fontes"] = "; ".join(
+            f"{f['fonte']} p.{f['pagina']} ({f['score']:.3f})" for f in resultado["fontes"]
+        )
+        linha.update({etapa: round(ms, 1) for etapa, ms in resultado["tempos"].items()})
+        linha["tokens_contexto"] = resultado.get("contexto", {}).get("tokens_usados")
+        linhas.append(linha)
+    colunas = list(dict.fromkeys(c for linha in linhas for c in linha))
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=colunas)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# GERAÇÃO
+# ────────────────────────────────────────────────────────────────────────────────
+def _gerar(
+    resultado: dict,
+    contextos: list,
+    pool: PoolClientesLLM,
+    modelos: List[str],
+    limitador: LimitadorTaxa,
+) -> None:
+    """Gera a resposta de uma pergunta e preenche `resultado` (roda num worker)."""
+    resultado["contexto"] = {}
+    prompt = montar_prompt(resultado["pergunta"], contextos, ORCAMENTO_CONTEXTO, resultado["contexto"])
+    resultado["tempos"]["espera_taxa_ms"] = 1000 * limitador.aguardar()
+
+    metricas: dict = {}
+    try:
+        texto = "".join(
+            gerar_stream(pool, prompt, pool.ordenar(modelos), atraso_hedge_ms=LLM_HEDGE_MS, metricas=metricas)
+        )
+    except Exception as exc:
+        # Uma falha inesperada não derruba o lote; fica registrada na pergunta
+        texto, metricas["erro"] = "", str(exc)
+    resultado["modelo"] = metricas.get("modelo")
+    if "erro" in metricas:
+        resultado["erro"] = metricas["erro"]
+    else:
+        resultado["resposta"] = texto.strip()
+    if "ttft_ms" in metricas:
+        resultado["tempos"]["primeiro_token_ms"] = metricas["ttft_ms"]
+    resultado["tempos"]["geracao_ms"] = metricas.get("total_ms", 0.0)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# EXECUÇÃO
+# ────────────────────────────────────────────────────────────────────────────────
+def responder_em_lote(
+    registros: List[dict],
+    k: int = 3,
+    lote: int = LOTE_PADRAO,
+    concorrencia: int = CONCORRENCIA_PADRAO,
+    rpm: float = RPM_PADRAO,
+    modelos: Optional[List[str]] = None,
+    gerar: bool = True,
+    modo: Optional[str] = None,
+    filtro: Optional[FiltroBusca] = None,
+) -> List[dict]:
+    """
+    Recupera os trechos e gera as respostas de todas as perguntas.
+
+    A busca roda na thread principal, um lote por vez (uma chamada de
+    embeddings e uma busca vetorial por lote); cada pergunta recuperada vai
+    direto para o pool de geração, que trabalha enquanto o próximo lote é
+    buscado. O pool limita as chamadas simultâneas ao LLM e o limitador
+    espaça o início delas para respeitar a cota por minuto.
+
+    Args:
+        registros: Perguntas (saída de `ler_perguntas`)
+        k: Trechos recuperados por pergunta
+        lote: Perguntas por chamada de embeddings/busca
+        concorrencia: Gerações simultâneas
+        rpm: Requisições ao LLM por minuto (0 = sem limite)
+        modelos: Modelos na ordem de preferência (o pool reordena pelas estatísticas)
+        gerar: False para só recuperar as fontes
+        modo: 'hibrido' ou 'vetorial' (padrão: RAG_MODO_BUSCA)
+        filtro: FiltroBusca aplicado a todas as perguntas
+
+    Returns:
+        Um resultado por pergunta, na ordem de entrada
+    """
+    vectorstore = criar_ou_carregar_vectorstore()
+    if contar_documentos(vectorstore) == 0:
+        raise RuntimeError("Base vetorial vazia. Indexe documentos primeiro.")
+
+    modelos = modelos or MODELOS_PADRAO
+    api_key = os.getenv("GEMINI_API_KEY", "")
+    pool = PoolClientesLLM(lambda modelo_nome: criar_llm(modelo_nome, api_key))
+    limitador = LimitadorTaxa(rpm)
+
+    resultados: List[dict] = []
+    with ThreadPoolExecutor(max_workers=max(concorrencia, 1), thread_name_prefix="geracao") as executor:
+        for numero, inicio in enumerate(range(0, len(registros), lote)):
+            fatia = registros[inicio:inicio + lote]
+            tempos_lote: dict = {}
+            achados = buscar_em_lote(
+                [r["pergunta"] for r in fatia],
+                k=k,
+                vectorstore=vectorstore,
+                modo=modo,
+                tempos=tempos_lote,
+                filtro=filtro,
+            )
+            for registro, contextos in zip(fatia, achados):
+                resultado = {
+                    **registro,
+                    "resposta": None,
+                    "modelo": None,
+                    "erro": None,
+                    "lote": numero,
+                    "fontes": [
+                        {
+                            "fonte": doc.metadata.get("fonte", "documento"),
+                            "pagina": doc.metadata.get("page"),
+                            "score": float(score),
+                        }
+                        for doc, score in contextos
+                    ],
+                    # Tempo do lote dividido entre as perguntas dele
+                    "tempos": {etapa: ms / len(fatia) for etapa, ms in tempos_lote.items()},
+                }
+                resultados.append(resultado)
+                if gerar and contextos:
+                    executor.submit(_gerar, resultado, contextos, pool, modelos, limitador)
+                elif gerar:
+                    resultado["erro"] = "nenhum trecho relevante encontrado"
+            print(
+                f"🔍 Lote {numero + 1}: {len(fatia)} perguntas "
+                f"(embeddings {tempos_lote.get('embeddings_ms', 0):.0f} ms, "
+                f"busca {tempos_lote.get('busca_ms', 0):.0f} ms)"
+            )
+    return resultados
+
+
+def _percentil(valores: List[float], fracao: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(int(fracao * len(ordenados)), len(ordenados) - 1)] if ordenados else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Responde perguntas em lote com o Assistente RAG")
+    parser.add_argument("entrada", type=Path, help="CSV ou JSONL com as perguntas")
+    parser.add_argument("--saida", type=Path, help="Arquivo .jsonl ou .csv (padrão: <entrada>_respostas.jsonl)")
+    parser.add_argument("--k", type=int, default=3, help="Trechos por pergunta")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO, help="Perguntas por busca vetorizada")
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA_PADRAO, help="Gerações simultâneas")
+    parser.add_argument("--rpm", type=float, default=RPM_PADRAO, help="Requisições ao LLM por minuto (0 = sem limite)")
+    parser.add_argument("--modelos", nargs="+", default=MODELOS_PADRAO, help="Modelos em ordem de preferência")
+    parser.add_argument("--modo", choices=["hibrido", "vetorial"], help="Modo de busca (padrão: RAG_MODO_BUSCA)")
+    parser.add_argument("--fontes", nargs="+", metavar="FONTE", help="Busca apenas nesses documentos")
+    parser.add_argument("--pagina-min", type=int, help="Primeira página considerada")
+    parser.add_argument("--pagina-max", type=int, help="Última página considerada")
+    parser.add_argument("--sem-geracao", action="store_true", help="Só recupera as fontes")
+    args = parser.parse_args()
+
+    saida = args.saida or args.entrada.with_name(f"{args.entrada.stem}_respostas.jsonl")
+    registros = ler_perguntas(args.entrada)
+    print(f"📋 {len(registros)} perguntas lidas de {args.entrada}")
+
+    filtro = FiltroBusca(fontes=args.fontes, pagina_min=args.pagina_min, pagina_max=args.pagina_max)
+    inicio = time.perf_counter()
+    resultados = responder_em_lote(
+        registros,
+        k=args.k,
+        lote=args.lote,
+        concorrencia=args.concorrencia,
+        rpm=args.rpm,
+        modelos=args.modelos,
+        gerar=not args.sem_geracao,
+        modo=args.modo,
+        filtro=filtro,
+    )
+    duracao = time.perf_counter() - inicio
+    gravar_respostas(saida, resultados)
+
+    erros = sum(1 for r in resultados if r["erro"])
+    print(f"✅ {len(resultados)} perguntas em {duracao:.1f}s ({len(resultados) / duracao:.1f}/s), {erros} com erro")
+    geracoes = [r["tempos"]["geracao_ms"] for r in resultados if "geracao_ms" in r["tempos"]]
+    if geracoes:
+        print(f"   Geração: p50 {_percentil(geracoes, 0.5):.0f} ms, p95 {_percentil(geracoes, 0.95):.0f} ms")
+    print(f"💾 Respostas salvas em {saida}")
+
+
+if __name__ == "__main__":
+    main()
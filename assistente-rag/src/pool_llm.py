@@ -0,0 +1,261 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Pool de Clientes LLM - Assistente Corporativo RAG
+Reaproveita um cliente por modelo, ordena os fallbacks por latência e taxa
+de erro observadas e, opcionalmente, dispara requisições "hedged": se o
+modelo atual não responder a tempo, o próximo começa em paralelo e vence
+quem entregar o primeiro token
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import queue
+import threading
+import time
+
+ALFA_EWMA = 0.3                 # Peso da observação mais recente
+LATENCIA_PRIORI_MS = 2000.0     # Estimativa para modelos ainda sem medições
+TAXA_ERRO_MAX = 0.95            # Evita custo infinito para modelos que só falham
+
+
+class PoolClientesLLM:
+    """
+    Clientes de chat model reutilizados entre perguntas e sessões.
+
+    `fabrica(modelo)` cria o cliente na primeira vez que o modelo é usado.
+    Para cada modelo são mantidas médias móveis (EWMA) do tempo até o
+    primeiro token e da taxa de erro, usadas em `ordenar`.
+    """
+
+    def __init__(self, fabrica: Callable[[str], Any]):
+        self.fabrica = fabrica
+        self._clientes: Dict[str, Any] = {}
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # ── Clientes ────────────────────────────────────────────────────────────────
+    def obter(self, modelo: str) -> Any:
+        """Retorna o cliente do modelo, criando-o só na primeira vez."""
+        with self._lock:
+            cliente = self._clientes.get(modelo)
+        if cliente is None:
+            cliente = self.fabrica(modelo)
+            with self._lock:
+                cliente = self._clientes.setdefault(modelo, cliente)
+        return cliente
+
+    def descartar(self, modelo: Optional[str] = None) -> None:
+        """Remove um cliente (ou todos), p. ex. após troca de API key."""
+        with self._lock:
+            if modelo is None:
+                self._clientes.clear()
+            else:
+                self._clientes.pop(modelo, None)
+
+    # ── Estatísticas ────────────────────────────────────────────────────────────
+    def _stat(self, modelo: str) -> dict:
+        return self._stats.setdefault(modelo, {
+            "chamadas": 0, "erros": 0, "latencia_ms": None, "taxa_erro": 0.0,
+        })
+
+    def registrar_sucesso(self, modelo: str, latencia_ms: float) -> None:
+        """Registra o tempo até o primeiro token de uma chamada bem-sucedida."""
+        with self._lock:
+            stat = self._stat(modelo)
+            stat["chamadas"] += 1
+            stat["taxa_erro"] *= 1 - ALFA_EWMA
+            anterior = stat["latencia_ms"]
+            stat["latencia_ms"] = (
+                latencia_ms if anterior is None
+                else ALFA_EWMA * latencia_ms + (1 - ALFA_EWMA) * anterior
+            )
+
+    def registrar_erro(self, modelo: str) -> None:
+        with self._lock:
+            stat = self._stat(modelo)
+            stat["chamadas"] += 1
+            stat["erros"] += 1
+            stat["taxa_erro"] = ALFA_EWMA + (1 - ALFA_EWMA) * stat["taxa_erro"]
+
+    def registrar_descartado(self, modelo: str, decorrido_ms: float) -> None:
+        """
+        Modelo que perdeu a corrida: só se sabe que levaria mais que `decorrido_ms`,
+        então a latência estimada nunca é reduzida por essa observação.
+        """
+        with self._lock:
+            stat = self._stat(modelo)
+            anterior = stat["latencia_ms"]
+            if anterior is None or decorrido_ms > anterior:
+                stat["latencia_ms"] = (
+                    decorrido_ms if anterior is None
+                    else ALFA_EWMA * decorrido_ms + (1 - ALFA_EWMA) * anterior
+                )
+
+    def custo(self, modelo: str) -> float:
+        """
+        Latência esperada penalizada pela taxa de erro.
+
+        Modelos sem medição de latência usam LATENCIA_PRIORI_MS.
+        """
+        with self._lock:
+            stat = self._stats.get(modelo) or {"latencia_ms": None, "taxa_erro": 0.0}
+            latencia = LATENCIA_PRIORI_MS if stat["latencia_ms"] is None else stat["latencia_ms"]
+            return latencia / (1 - min(stat["taxa_erro"], TAXA_ERRO_MAX))
+
+    def ordenar(self, modelos: List[str]) -> List[str]:
+        """
+        Ordena os modelos do menor para o maior custo observado.
+
+        Empates mantêm a ordem configurada, então sem histórico nada muda.
+        """
+        return sorted(modelos, key=lambda m: (self.custo(m), modelos.index(m)))
+
+    def estatisticas(self) -> Dict[str, dict]:
+        with self._lock:
+            return {modelo: dict(stat) for modelo, stat in self._stats.items()}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# STREAMING COM FALLBACK / HEDGING
+# ────────────────────────────────────────────────────────────────────────────────
+def _consumir_stream(
+    cliente: Any,
+    prompt: str,
+    indice: int,
+    saida: "queue.Queue[Tuple[str, int, Any]]",
+    cancelado: threading.Event,
+) -> None:
+    """Thread de uma tentativa: repassa os fragmentos de texto para a fila."""
+    try:
+        stream = cliente.stream(prompt)
+        for pedaco in stream:
+            if cancelado.is_set():
+                if hasattr(stream, "close"):
+                    stream.close()
+                return
+            texto = pedaco.content if isinstance(pedaco.content, str) else str(pedaco.content)
+            if texto:
+                saida.put(("token", indice, texto))
+        saida.put(("fim", indice, None))
+    except Exception as exc:
+        saida.put(("erro", indice, exc))
+
+
+def gerar_stream(
+    pool: PoolClientesLLM,
+    prompt: str,
+    modelos: List[str],
+    atraso_hedge_ms: Optional[float] = None,
+    metricas: Optional[dict] = None,
+) -> Iterator[str]:
+    """
+    Transmite a resposta do primeiro modelo que começar a responder.
+
+    Sem `atraso_hedge_ms` o fallback é sequencial: o próximo modelo só é
+    tentado quando o atual falha antes do primeiro token. Com ele, se o
+    primeiro token não chegar dentro do atraso, o próximo modelo também é
+    disparado; o primeiro a emitir um token vence e os demais são cancelados.
+
+    Args:
+        pool: Pool de clientes (também recebe as estatísticas)
+        prompt: Prompt completo
+        modelos: Modelos na ordem de tentativa
+        atraso_hedge_ms: Espera antes de disparar o próximo modelo (None/0 = desligado)
+        metricas: Preenchido com modelo, ttft_ms, total_ms, tokens, tentativas e erro
+
+    Yields:
+        Fragmentos de texto do modelo vencedor
+    """
+    metricas = metricas if metricas is not None else {}
+    saida: "queue.Queue[Tuple[str, int, Any]]" = queue.Queue()
+    cancelados: List[threading.Event] = []
+    inicios: List[float] = []
+    ativos: set = set()
+    erros: List[str] = []
+    vencedor: Optional[int] = None
+    tokens = 0
+    inicio = time.perf_counter()
+    proximo_hedge = None
+
+    def disparar() -> None:
+        nonlocal proximo_hedge
+        indice = len(inicios)
+        modelo = modelos[indice]
+        cancelado = threading.Event()
+        cancelados.append(cancelado)
+        inicios.append(time.perf_counter())
+        ativos.add(indice)
+        try:
+            cliente = pool.obter(modelo)
+        except Exception as exc:
+            saida.put(("erro", indice, exc))
+        else:
+            threading.Thread(
+                target=_consumir_stream,
+                args=(cliente, prompt, indice, saida, cancelado),
+                name=f"llm-{modelo}",
+                daemon=True,
+            ).start()
+        proximo_hedge = (
+            time.perf_counter() + atraso_hedge_ms / 1000 if atraso_hedge_ms else None
+        )
+
+    try:
+        if modelos:
+            disparar()
+        while ativos:
+            pode_hedge = vencedor is None and proximo_hedge is not None and len(inicios) < len(modelos)
+            timeout = max(proximo_hedge - time.perf_counter(), 0) if pode_hedge else None
+            try:
+                tipo, indice, valor = saida.get(timeout=timeout)
+            except queue.Empty:
+                disparar()
+                continue
+
+            modelo = modelos[indice]
+            decorrido_ms = 1000 * (time.perf_counter() - inicios[indice])
+            if vencedor is not None and indice != vencedor:
+                continue  # Resto de uma tentativa já descartada
+
+            if tipo == "token":
+                if vencedor is None:
+                    vencedor = indice
+                    metricas["modelo"] = modelo
+                    metricas["ttft_ms"] = 1000 * (time.perf_counter() - inicio)
+                    pool.registrar_sucesso(modelo, decorrido_ms)
+                    for outro in ativos - {indice}:
+                        cancelados[outro].set()
+                        pool.registrar_descartado(modelos[outro], decorrido_ms)
+                    ativos = {indice}
+                tokens += 1
+                yield valor
+            elif tipo == "fim":
+                ativos.discard(indice)
+                if vencedor is None:
+                    # Terminou sem texto: conta como falha e segue para o próximo
+                    pool.registrar_erro(modelo)
+                    erros.append(f"{modelo}: resposta vazia")
+                    if len(inicios) < len(modelos) and not ativos:
+                        disparar()
+            else:
+                ativos.discard(indice)
+                pool.registrar_erro(modelo)
+                if vencedor == indice:
+                    metricas["erro"] = str(valor)
+                    yield f"\n\n❌ Resposta interrompida: {valor}"
+                    break
+                erros.append(f"{modelo}: {valor}")
+                if len(inicios) < len(modelos):
+                    disparar()
+    finally:
+        # Se o consumidor parar no meio, nenhuma thread continua lendo o stream
+        for cancelado in cancelados:
+            cancelado.set()
+
+    if vencedor is None:
+        metricas["erro"] = " | ".join(erros)
+        yield "❌ Erro ao gerar resposta. Modelos testados: " + " | ".join(erros)
+
+    metricas["tentativas"] = len(inicios)
+    metricas["tokens"] = tokens
+    metricas["total_ms"] = 1000 * (time.perf_counter() - inicio)
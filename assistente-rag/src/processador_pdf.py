@@ -5,39 +5,78 @@ Processador de PDFs - Assistente Corporativo RAG
 Lê PDFs e divide em chunks para indexação vetorial
 """
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import os
+import tempfile
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 
-BASE_DIR = Path(__file__).resolve().parents[1]
+from cache_extracao import CacheExtracao
+from config_base import BASE_DIR, DB_DIR
+
 DOCUMENTOS_DIR = BASE_DIR / "documentos"
 
 # Configurações de chunking
 CHUNK_SIZE = 1000      # Tamanho de cada pedaço em caracteres
 CHUNK_OVERLAP = 100    # Sobreposição para manter contexto
 
+# Processos paralelos para leitura/chunking de PDFs (1 = sequencial)
+WORKERS_PADRAO = int(os.getenv("RAG_PDF_WORKERS", "1"))
+
+# Chunks por lote na ingestão em streaming (limita o pico de memória)
+TAMANHO_LOTE_PADRAO = 64
+
+# Cache do texto extraído por SHA-256 do arquivo. Fica ao lado da base vetorial
+# (como o cache de embeddings), fora dela: sobrevive a limpezas e reindexações.
+USAR_CACHE_EXTRACAO = os.getenv("RAG_CACHE_EXTRACAO", "1") != "0"
+CACHE_EXTRACAO_MAX_MB = float(os.getenv("RAG_CACHE_EXTRACAO_MAX_MB", "512"))
+CACHE_EXTRACAO_MAX_DIAS = float(os.getenv("RAG_CACHE_EXTRACAO_DIAS", "30"))
+CACHE_EXTRACAO_PATH = DB_DIR.parent / f"{DB_DIR.name}_cache_extracao.sqlite3"
+
+
+def _cache_extracao() -> Optional[CacheExtracao]:
+    """Cache de extração configurado (None se desligado)."""
+    if not USAR_CACHE_EXTRACAO:
+        return None
+    from pypdf import __version__ as versao_pypdf
+
+    return CacheExtracao(
+        CACHE_EXTRACAO_PATH,
+        extrator=f"pypdf-{versao_pypdf}",
+        max_mb=CACHE_EXTRACAO_MAX_MB,
+        max_dias=CACHE_EXTRACAO_MAX_DIAS,
+    )
+
 
-def carregar_pdf(caminho_pdf: Path) -> List[Document]:
+def carregar_pdf(caminho_pdf: Path, hash_arquivo: Optional[str] = None) -> List[Document]:
     """
     Carrega um PDF e retorna lista de documentos (uma página = um documento).
     
     Args:
         caminho_pdf: Caminho para o arquivo PDF
+        hash_arquivo: SHA-256 já calculado do arquivo (chave do cache de extração)
         
     Returns:
         Lista de Documents do LangChain
     """
-    loader = PyPDFLoader(str(caminho_pdf))
-    documentos = loader.load()
-    
-    # Adiciona metadados úteis
-    for doc in documentos:
-        doc.metadata["fonte"] = caminho_pdf.name
-    
-    return documentos
+    return list(iterar_paginas_pdf(caminho_pdf, hash_arquivo=hash_arquivo))
+
+
+def _criar_text_splitter() -> RecursiveCharacterTextSplitter:
+    """Cria o splitter com a configuração de chunking do projeto."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        length_function=len,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
 
 
 def dividir_em_chunks(documentos: List[Document]) -> List[Document]:
@@ -50,12 +89,7 @@ def dividir_em_chunks(documentos: List[Document]) -> List[Document]:
     Returns:
         Lista de chunks (Documents menores)
     """
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""],
-    )
+    text_splitter = _criar_text_splitter()
     
     chunks = text_splitter.split_documents(documentos)
     
@@ -66,20 +100,109 @@ def dividir_em_chunks(documentos: List[Document]) -> List[Document]:
     return chunks
 
 
-def processar_todos_pdfs() -> List[Document]:
+def calcular_hash_arquivo(caminho_pdf: Path, bloco: int = 1 << 20) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos.
+    
+    Args:
+        caminho_pdf: Caminho para o arquivo
+        bloco: Tamanho do bloco de leitura em bytes
+        
+    Returns:
+        Hash hexadecimal do arquivo
+    """
+    sha = hashlib.sha256()
+    with open(caminho_pdf, "rb") as arquivo:
+        for parte in iter(lambda: arquivo.read(bloco), b""):
+            sha.update(parte)
+    return sha.hexdigest()
+
+
+def processar_pdf(caminho_pdf: Path, hash_arquivo: Optional[str] = None) -> List[Document]:
+    """
+    Carrega um único PDF e divide em chunks.
+    
+    Args:
+        caminho_pdf: Caminho para o arquivo PDF
+        hash_arquivo: SHA-256 já calculado do arquivo (calcula se None)
+        
+    Returns:
+        Lista de chunks do PDF
+    """
+    return dividir_em_chunks(carregar_pdf(caminho_pdf, hash_arquivo=hash_arquivo))
+
+
+def _processar_pdf_isolado(
+    caminho_pdf: Path, hash_arquivo: Optional[str] = None
+) -> Tuple[Path, List[Document], Optional[str]]:
+    """
+    Processa um PDF capturando qualquer erro (executado nos workers).
+    
+    Returns:
+        Tuple com (caminho, chunks, mensagem de erro ou None)
+    """
+    try:
+        return caminho_pdf, processar_pdf(caminho_pdf, hash_arquivo), None
+    except Exception as e:
+        return caminho_pdf, [], str(e)
+
+
+def iterar_pdfs_processados(
+    arquivos_pdf: Sequence[Path],
+    workers: int = WORKERS_PADRAO,
+    hashes: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[Path, List[Document], Optional[str]]]:
+    """
+    Lê e divide PDFs, entregando cada arquivo assim que fica pronto.
+    
+    Com workers > 1 os arquivos são processados em paralelo num pool de
+    processos e chegam na ordem de conclusão. Falhas ficam isoladas por
+    arquivo. O chunk_id é numerado dentro de cada arquivo, portanto não
+    depende da ordem de conclusão.
+    
+    Args:
+        arquivos_pdf: Caminhos dos PDFs
+        workers: Número de processos (1 = sequencial, no processo atual)
+        hashes: SHA-256 já calculados, por nome de arquivo (evita reler o
+                PDF só para a chave do cache de extração)
+        
+    Yields:
+        Tuple com (caminho, chunks, mensagem de erro ou None)
+    """
+    hashes = hashes or {}
+    if workers <= 1 or len(arquivos_pdf) <= 1:
+        for pdf_path in arquivos_pdf:
+            yield _processar_pdf_isolado(pdf_path, hashes.get(pdf_path.name))
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(workers, len(arquivos_pdf))) as pool:
+        futuros = {
+            pool.submit(_processar_pdf_isolado, p, hashes.get(p.name)): p for p in arquivos_pdf
+        }
+        for futuro in as_completed(futuros):
+            try:
+                yield futuro.result()
+            except Exception as e:  # Worker morto ou resultado não serializável
+                yield futuros[futuro], [], str(e)
+
+
+def processar_todos_pdfs(workers: int = WORKERS_PADRAO) -> List[Document]:
     """
     Processa todos os PDFs na pasta documentos/.
     
+    Args:
+        workers: Número de processos para leitura paralela
+        
     Returns:
-        Lista de todos os chunks de todos os PDFs
+        Lista de todos os chunks de todos os PDFs, ordenada por arquivo
     """
-    todos_chunks = []
+    chunks_por_arquivo = {}
     
     # Garante que a pasta existe
     DOCUMENTOS_DIR.mkdir(parents=True, exist_ok=True)
     
     # Processa cada PDF
-    arquivos_pdf = list(DOCUMENTOS_DIR.glob("*.pdf"))
+    arquivos_pdf = sorted(DOCUMENTOS_DIR.glob("*.pdf"))
     
     if not arquivos_pdf:
         print("⚠️  Nenhum PDF encontrado na pasta documentos/")
@@ -87,61 +210,166 @@ def processar_todos_pdfs() -> List[Document]:
     
     print(f"📂 Encontrados {len(arquivos_pdf)} PDFs para processar")
     
-    for pdf_path in arquivos_pdf:
-        print(f"   📄 Processando: {pdf_path.name}")
+    for pdf_path, chunks, erro in iterar_pdfs_processados(arquivos_pdf, workers):
+        print(f"   📄 Processado: {pdf_path.name}")
+        
+        if erro is not None:
+            print(f"      ❌ Erro ao processar: {erro}")
+            continue
         
-        try:
-            # Carrega PDF
-            documentos = carregar_pdf(pdf_path)
-            print(f"      └─ {len(documentos)} páginas carregadas")
-            
-            # Divide em chunks
-            chunks = dividir_em_chunks(documentos)
-            print(f"      └─ {len(chunks)} chunks criados")
-            
-            todos_chunks.extend(chunks)
-            
-        except Exception as e:
-            print(f"      ❌ Erro ao processar: {e}")
-    
-    return todos_chunks
+        print(f"      └─ {len(chunks)} chunks criados")
+        chunks_por_arquivo[pdf_path] = chunks
+    
+    # Ordem final independe da ordem de conclusão dos workers
+    return [chunk for pdf_path in arquivos_pdf for chunk in chunks_por_arquivo.get(pdf_path, [])]
 
 
-def processar_pdf_upload(conteudo_bytes: bytes, nome_arquivo: str) -> List[Document]:
+# ────────────────────────────────────────────────────────────────────────────────
+# INGESTÃO EM STREAMING (memória limitada)
+# ────────────────────────────────────────────────────────────────────────────────
+def iterar_paginas_pdf(
+    caminho_pdf: Path,
+    fonte: Optional[str] = None,
+    hash_arquivo: Optional[str] = None,
+) -> Iterator[Document]:
     """
-    Processa um PDF enviado via upload (bytes em memória).
+    Lê um PDF página a página, sem materializar o documento inteiro.
+    
+    Um arquivo já extraído antes (mesmo SHA-256) é lido do cache de
+    extração sem abrir o PDF; senão cada página é gravada no cache à
+    medida que sai do PyPDFLoader.
     
     Args:
-        conteudo_bytes: Conteúdo do PDF em bytes
-        nome_arquivo: Nome original do arquivo
+        caminho_pdf: Caminho para o arquivo PDF
+        fonte: Nome a gravar no metadado 'fonte' (padrão: nome do arquivo)
+        hash_arquivo: SHA-256 já calculado do arquivo (calcula se None)
         
-    Returns:
-        Lista de chunks do PDF
+    Yields:
+        Um Document por página
+    """
+    cache = _cache_extracao()
+    if cache is None:
+        paginas = PyPDFLoader(str(caminho_pdf)).lazy_load()
+    else:
+        hash_arquivo = hash_arquivo or calcular_hash_arquivo(caminho_pdf)
+        paginas = cache.ler(hash_arquivo)
+        if paginas is None:
+            paginas = cache.gravar(hash_arquivo, PyPDFLoader(str(caminho_pdf)).lazy_load())
+    for doc in paginas:
+        doc.metadata["source"] = str(caminho_pdf)
+        doc.metadata["fonte"] = fonte or caminho_pdf.name
+        yield doc
+
+
+def iterar_chunks(paginas: Iterable[Document]) -> Iterator[Document]:
     """
-    import tempfile
+    Divide páginas em chunks conforme chegam.
     
-    # Salva temporariamente para o PyPDFLoader processar
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(conteudo_bytes)
-        tmp_path = Path(tmp.name)
+    Produz os mesmos chunks e chunk_id que dividir_em_chunks, mas mantém
+    apenas uma página em memória por vez.
     
-    try:
-        # Carrega e processa
-        documentos = carregar_pdf(tmp_path)
-        
-        # Atualiza metadados com nome real
-        for doc in documentos:
-            doc.metadata["fonte"] = nome_arquivo
+    Args:
+        paginas: Iterável de Documents (páginas)
         
-        chunks = dividir_em_chunks(documentos)
+    Yields:
+        Chunks numerados sequencialmente
+    """
+    text_splitter = _criar_text_splitter()
+    chunk_id = 0
+    for pagina in paginas:
+        for chunk in text_splitter.split_documents([pagina]):
+            chunk.metadata["chunk_id"] = chunk_id
+            chunk_id += 1
+            yield chunk
+
+
+def iterar_lotes(itens: Iterable, tamanho: int = TAMANHO_LOTE_PADRAO) -> Iterator[list]:
+    """Agrupa um iterável em listas de até `tamanho` itens."""
+    iterador = iter(itens)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def salvar_upload(arquivo: BinaryIO, destino: Path, bloco: int = 1 << 20) -> str:
+    """
+    Copia um upload (objeto tipo arquivo) para `destino` em blocos.
+    
+    Args:
+        arquivo: Objeto com read() (ex.: UploadedFile do Streamlit)
+        destino: Caminho do arquivo a gravar
+        bloco: Tamanho do bloco de cópia em bytes
         
-        return chunks
+    Returns:
+        Hash SHA-256 do conteúdo, calculado durante a cópia
+    """
+    sha = hashlib.sha256()
+    if hasattr(arquivo, "seek"):
+        arquivo.seek(0)
+    with open(destino, "wb") as saida:
+        for parte in iter(lambda: arquivo.read(bloco), b""):
+            sha.update(parte)
+            saida.write(parte)
+    return sha.hexdigest()
+
+
+def contar_paginas_pdf(caminho_pdf: Path, hash_arquivo: Optional[str] = None) -> int:
+    """Número de páginas do PDF (do cache de extração ou só da estrutura, sem extrair texto)."""
+    from pypdf import PdfReader
+
+    cache = _cache_extracao()
+    if cache is not None and hash_arquivo:
+        paginas = cache.contar_paginas(hash_arquivo)
+        if paginas is not None:
+            return paginas
+    return len(PdfReader(str(caminho_pdf)).pages)
+
+
+@contextmanager
+def upload_em_arquivo_temporario(arquivo: BinaryIO, bloco: int = 1 << 20) -> Iterator[Tuple[Path, str]]:
+    """
+    Copia um upload para um arquivo temporário, removido ao sair do `with`.
+    
+    Args:
+        arquivo: Objeto com read() (ex.: UploadedFile do Streamlit)
+        bloco: Tamanho do bloco de cópia em bytes
         
+    Yields:
+        Tuple com (caminho temporário, hash SHA-256)
+    """
+    descritor, nome = tempfile.mkstemp(suffix=".pdf")
+    os.close(descritor)
+    tmp_path = Path(nome)
+    
+    try:
+        yield tmp_path, salvar_upload(arquivo, tmp_path, bloco)
     finally:
         # Remove arquivo temporário
         tmp_path.unlink(missing_ok=True)
 
 
+def processar_pdf_upload(conteudo_bytes: bytes, nome_arquivo: str) -> List[Document]:
+    """
+    Processa um PDF enviado via upload (bytes em memória).
+    
+    Para arquivos grandes prefira upload_em_arquivo_temporario +
+    iterar_chunks, que não acumulam páginas nem chunks em memória.
+    
+    Args:
+        conteudo_bytes: Conteúdo do PDF em bytes
+        nome_arquivo: Nome original do arquivo
+        
+    Returns:
+        Lista de chunks do PDF
+    """
+    import io
+    
+    with upload_em_arquivo_temporario(io.BytesIO(conteudo_bytes)) as (tmp_path, hash_arquivo):
+        return list(iterar_chunks(iterar_paginas_pdf(tmp_path, fonte=nome_arquivo, hash_arquivo=hash_arquivo)))
+
+
 def main():
     """Execução standalone para teste."""
     print("=" * 60)
@@ -0,0 +1,203 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Serviço de Embeddings em Micro-Lotes - Assistente Corporativo RAG
+Agrupa pedidos concorrentes (queries e documentos) de várias sessões
+numa única chamada ao modelo
+"""
+
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+import queue
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+
+JANELA_MS_PADRAO = 5.0      # Tempo máximo aguardando mais pedidos
+MAX_LOTE_PADRAO = 64        # Textos por chamada ao modelo
+
+
+class _Pedido:
+    """Pedido na fila do worker, com os vetores já calculados das fatias anteriores."""
+
+    __slots__ = ("textos", "futuro", "enfileirado", "vetores", "ordem", "feitos")
+
+    def __init__(self, textos: List[str], futuro: Future, enfileirado: float):
+        self.textos = textos
+        self.futuro = futuro
+        self.enfileirado = enfileirado
+        self.vetores: List[Optional[List[float]]] = [None] * len(textos)
+        # Atendido do menor texto ao maior: cada fatia sai com comprimentos parecidos
+        self.ordem = sorted(range(len(textos)), key=lambda i: len(textos[i]))
+        self.feitos = 0
+
+    @property
+    def restantes(self) -> int:
+        return len(self.textos) - self.feitos
+
+
+class EmbeddingsMicroLote(Embeddings):
+    """
+    Executor de embeddings que forma lotes dinâmicos entre threads.
+
+    Cada chamada entra numa fila; uma thread dedicada pega o primeiro
+    pedido, espera até `janela_ms` por outros (ou até `max_lote` textos),
+    roda um único `embed_documents` e devolve a fatia de cada chamador.
+
+    Nenhuma chamada ao modelo passa de `max_lote` textos: pedidos maiores
+    (ingestão de um PDF) são atendidos em fatias, e a cada fatia os pedidos
+    com menos textos pendentes vão primeiro, então uma query que chega no
+    meio de uma indexação espera no máximo uma fatia. Dentro de um pedido
+    os textos saem em ordem de comprimento, então as fatias de uma ingestão
+    grande já chegam ao modelo (ou ao EmbeddingsPorComprimento) com pouco
+    padding, e o chamador recebe os vetores na ordem original.
+
+    Queries também são calculadas via `embed_documents`, o que equivale a
+    `embed_query` para modelos sem prompt específico de consulta (caso do
+    all-MiniLM-L6-v2 usado no projeto).
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        janela_ms: float = JANELA_MS_PADRAO,
+        max_lote: int = MAX_LOTE_PADRAO,
+    ):
+        self.base = base
+        self.janela_ms = janela_ms
+        self.max_lote = max_lote
+        self._fila: "queue.Queue[Tuple[List[str], Future, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._lotes = 0
+        self._textos = 0
+        self._pedidos = 0
+        self._participacoes = 0
+        self._maior_lote = 0
+        self._espera_total = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    # ── Worker ──────────────────────────────────────────────────────────────────
+    def _iniciar(self) -> None:
+        """Sobe o worker se ainda não existe (ou morreu); chamar com `_lock`."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._loop, name="embeddings-micro-lote", daemon=True
+            )
+            self._thread.start()
+
+    def _loop(self) -> None:
+        pendentes: List[_Pedido] = []
+        try:
+            self._atender(pendentes)
+        except Exception as exc:
+            # Erro fora de uma fatia: ninguém pode ficar esperando um worker morto
+            with self._lock:
+                self._thread = None
+                while True:
+                    try:
+                        pendentes.append(_Pedido(*self._fila.get_nowait()))
+                    except queue.Empty:
+                        break
+            for pedido in pendentes:
+                if not pedido.futuro.done():
+                    pedido.futuro.set_exception(exc)
+
+    def _atender(self, pendentes: List[_Pedido]) -> None:
+        """Laço do worker; `pendentes` é da chamadora, que o esvazia se o laço quebrar."""
+        while True:
+            if pendentes:
+                # Já há trabalho: recolhe sem esperar tudo o que chegou durante a fatia anterior
+                while True:
+                    try:
+                        pendentes.append(_Pedido(*self._fila.get_nowait()))
+                    except queue.Empty:
+                        break
+            else:
+                pendentes.append(_Pedido(*self._fila.get()))
+                limite = time.perf_counter() + self.janela_ms / 1000
+                while sum(pedido.restantes for pedido in pendentes) < self.max_lote:
+                    restante = limite - time.perf_counter()
+                    if restante <= 0:
+                        break
+                    try:
+                        pendentes.append(_Pedido(*self._fila.get(timeout=restante)))
+                    except queue.Empty:
+                        break
+            self._executar(pendentes)
+            pendentes[:] = [pedido for pedido in pendentes if not pedido.futuro.done()]
+
+    def _executar(self, pendentes: List[_Pedido]) -> None:
+        """Calcula uma fatia de até `max_lote` textos, menores pedidos primeiro."""
+        fatia: List[Tuple[_Pedido, int, int]] = []
+        vagas = self.max_lote
+        for pedido in sorted(pendentes, key=lambda p: p.restantes):
+            if vagas <= 0:
+                break
+            inicio = pedido.feitos
+            fim = inicio + min(pedido.restantes, vagas)
+            fatia.append((pedido, inicio, fim))
+            vagas -= fim - inicio
+
+        textos = [
+            pedido.textos[i] for pedido, inicio, fim in fatia for i in pedido.ordem[inicio:fim]
+        ]
+        agora = time.perf_counter()
+        try:
+            vetores = self.base.embed_documents(textos)
+        except Exception as exc:
+            for pedido, _, _ in fatia:
+                pedido.futuro.set_exception(exc)
+            return
+
+        novos = [pedido for pedido, inicio, _ in fatia if inicio == 0]
+        with self._lock:
+            self._lotes += 1
+            self._pedidos += len(novos)
+            self._participacoes += len(fatia)
+            self._textos += len(textos)
+            self._maior_lote = max(self._maior_lote, len(textos))
+            self._espera_total += sum(agora - pedido.enfileirado for pedido in novos)
+
+        posicao = 0
+        for pedido, inicio, fim in fatia:
+            for i in pedido.ordem[inicio:fim]:
+                pedido.vetores[i] = vetores[posicao]
+                posicao += 1
+            pedido.feitos = fim
+            if not pedido.restantes:
+                pedido.futuro.set_result(pedido.vetores)
+
+    def _enviar(self, textos: List[str]) -> List[List[float]]:
+        if not textos:
+            return []
+        futuro: Future = Future()
+        # Sob o lock: um pedido nunca entra na fila de um worker que já desistiu dela
+        with self._lock:
+            self._iniciar()
+            self._fila.put((list(textos), futuro, time.perf_counter()))
+        return futuro.result()
+
+    # ── Interface Embeddings ────────────────────────────────────────────────────
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._enviar(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._enviar([text])[0]
+
+    # ── Métricas ────────────────────────────────────────────────────────────────
+    def metricas(self) -> dict:
+        """Profundidade da fila e tamanhos de lote, para calibrar janela x vazão."""
+        with self._lock:
+            return {
+                "fila_atual": self._fila.qsize(),
+                "lotes": self._lotes,
+                "pedidos": self._pedidos,
+                "textos": self._textos,
+                "media_lote": self._textos / self._lotes if self._lotes else 0.0,
+                "pedidos_por_lote": self._participacoes / self._lotes if self._lotes else 0.0,
+                "maior_lote": self._maior_lote,
+                "espera_media_ms": 1000 * self._espera_total / self._pedidos if self._pedidos else 0.0,
+                "janela_ms": self.janela_ms,
+                "max_lote": self.max_lote,
+            }
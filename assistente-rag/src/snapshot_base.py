@@ -0,0 +1,222 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Snapshot da Base Vetorial - Assistente Corporativo RAG
+Exporta vetores, textos, metadados, manifesto e índice de duplicatas para
+um único arquivo .npz
+comprimido e restaura tudo numa carga em massa, sem recalcular embeddings
+
+Uso:
+    python src/snapshot_base.py exportar
+    python src/snapshot_base.py restaurar [--forcar]
+    python src/snapshot_base.py info
+
+No Streamlit Cloud o DB_DIR fica em /tmp e some a cada reinício do
+container; com o snapshot versionado no repositório, a primeira sessão
+restaura a base em segundos em vez de reindexar os PDFs.
+"""
+
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import indexador
+from config_base import BASE_DIR
+
+SNAPSHOT_PATH = BASE_DIR / "snapshot" / "base_vetorial.npz"
+FORMATO_SNAPSHOT = 2        # 2: inclui o índice de quase-duplicatas
+LOTE_RESTAURACAO = 5000
+
+# float16 reduz o arquivo pela metade; a busca continua em float32 após a carga
+SNAPSHOT_DTYPE = os.getenv("RAG_SNAPSHOT_DTYPE", "float32")
+RESTAURAR_NA_INICIALIZACAO = os.getenv("RAG_RESTAURAR_SNAPSHOT", "1") != "0"
+# Aquecimento do app e primeira pergunta podem pedir a restauração ao mesmo tempo
+_LOCK_RESTAURACAO = threading.Lock()
+
+
+def _json_para_array(dados) -> np.ndarray:
+    """Serializa para bytes UTF-8 num array uint8 (o .npz dispensa pickle)."""
+    return np.frombuffer(json.dumps(dados, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+
+def _array_para_json(array: np.ndarray):
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def exportar_snapshot(destino: Path = SNAPSHOT_PATH, vectorstore=None, dtype: str = SNAPSHOT_DTYPE) -> dict:
+    """
+    Grava a coleção inteira num arquivo .npz comprimido.
+
+    Args:
+        destino: Arquivo de saída
+        vectorstore: Base vetorial (carrega se None)
+        dtype: Tipo dos vetores no arquivo ('float32' ou 'float16')
+
+    Returns:
+        Cabeçalho (info) gravado no snapshot
+    """
+    if vectorstore is None:
+        vectorstore = indexador.criar_ou_carregar_vectorstore()
+
+    total = indexador.contar_documentos(vectorstore)
+    ids, documentos, metadados, vetores = [], [], [], []
+    for inicio in range(0, total, LOTE_RESTAURACAO):
+        dados = vectorstore.get(
+            include=["documents", "metadatas", "embeddings"], limit=LOTE_RESTAURACAO, offset=inicio
+        )
+        ids.extend(dados["ids"])
+        documentos.extend(dados["documents"])
+        metadados.extend(dados["metadatas"])
+        vetores.append(np.asarray(dados["embeddings"], dtype=np.float32))
+
+    matriz = np.concatenate(vetores) if vetores else np.zeros((0, 0), dtype=np.float32)
+    # Cópias não têm vetor: sem o índice de duplicatas elas sumiriam da base restaurada
+    duplicatas, assinaturas = indexador._indice_duplicatas().exportar()
+    info = {
+        "formato": FORMATO_SNAPSHOT,
+        "modelo": indexador.chave_modelo_embeddings(),
+        "total": len(ids),
+        "copias": len(duplicatas["copias"]),
+        "dimensao": int(matriz.shape[1]) if matriz.size else 0,
+        "dtype": dtype,
+        "criado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "versao_colecao": indexador.obter_versao_colecao(),
+    }
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destino.with_suffix(".tmp.npz")
+    np.savez_compressed(
+        tmp_path,
+        info=_json_para_array(info),
+        vetores=matriz.astype(dtype),
+        ids=_json_para_array(ids),
+        documentos=_json_para_array(documentos),
+        metadados=_json_para_array(metadados),
+        manifesto=_json_para_array(indexador.carregar_manifesto()),
+        duplicatas=_json_para_array(duplicatas),
+        assinaturas=assinaturas,
+    )
+    os.replace(tmp_path, destino)
+    print(f"💾 Snapshot salvo em {destino} ({len(ids)} chunks, {destino.stat().st_size / 2**20:.1f} MB)")
+    return info
+
+
+def ler_info(origem: Path = SNAPSHOT_PATH) -> Optional[dict]:
+    """Cabeçalho do snapshot, sem carregar os vetores (None se não existir)."""
+    if not origem.exists():
+        return None
+    with np.load(origem) as arquivo:
+        return _array_para_json(arquivo["info"])
+
+
+def restaurar_snapshot(origem: Path = SNAPSHOT_PATH, vectorstore=None, forcar: bool = False) -> int:
+    """
+    Restaura o snapshot na base vetorial atual.
+
+    Só restaura se a base estiver vazia (ou `forcar`) e se o snapshot tiver
+    sido gerado pelo mesmo modelo de embeddings; vetores de outro modelo
+    não seriam comparáveis com as queries.
+
+    Args:
+        origem: Arquivo .npz do snapshot
+        vectorstore: Base vetorial de destino (carrega se None)
+        forcar: Substitui a base atual mesmo que ela tenha documentos
+
+    Returns:
+        Número de chunks restaurados (0 se nada foi feito)
+    """
+    info = ler_info(origem)
+    if info is None:
+        return 0
+    if info.get("formato") != FORMATO_SNAPSHOT:
+        print(f"⚠️  Snapshot ignorado: formato {info.get('formato')} (esperado {FORMATO_SNAPSHOT})")
+        return 0
+    modelo_atual = indexador.chave_modelo_embeddings()
+    if info.get("modelo") != modelo_atual:
+        print(f"⚠️  Snapshot ignorado: gerado com '{info.get('modelo')}', modelo atual '{modelo_atual}'")
+        return 0
+
+    with _LOCK_RESTAURACAO:
+        return _restaurar(origem, info, vectorstore, forcar)
+
+
+def _restaurar(origem: Path, info: dict, vectorstore, forcar: bool) -> int:
+    if vectorstore is None:
+        vectorstore = indexador.criar_ou_carregar_vectorstore()
+    if indexador.contar_documentos(vectorstore) > 0:
+        if not forcar:
+            return 0
+        indexador.limpar_base()
+        vectorstore = indexador.criar_ou_carregar_vectorstore()
+
+    inicio = time.perf_counter()
+    with np.load(origem) as arquivo:
+        vetores = arquivo["vetores"].astype(np.float32)
+        ids = _array_para_json(arquivo["ids"])
+        documentos = _array_para_json(arquivo["documentos"])
+        metadados = _array_para_json(arquivo["metadados"])
+        manifesto = _array_para_json(arquivo["manifesto"])
+        duplicatas = _array_para_json(arquivo["duplicatas"])
+        assinaturas = arquivo["assinaturas"]
+
+    # Carga direta dos vetores prontos: nenhum embedding é recalculado
+    indice = indexador._indice_lexico()
+    if isinstance(vectorstore, indexador.VetorialNumpy):
+        tamanho_lote = LOTE_RESTAURACAO
+    else:
+        tamanho_lote = min(LOTE_RESTAURACAO, vectorstore._client.get_max_batch_size())
+    for pos in range(0, len(ids), tamanho_lote):
+        fatia = slice(pos, pos + tamanho_lote)
+        if isinstance(vectorstore, indexador.VetorialNumpy):
+            vectorstore.adicionar_vetores(ids[fatia], documentos[fatia], metadados[fatia], vetores[fatia])
+        else:
+            vectorstore._collection.add(
+                ids=ids[fatia],
+                embeddings=vetores[fatia],
+                documents=documentos[fatia],
+                metadatas=[meta or None for meta in metadados[fatia]],
+            )
+        indice.adicionar(
+            ids[fatia],
+            [
+                indexador.Document(page_content=texto, metadata=meta or {})
+                for texto, meta in zip(documentos[fatia], metadados[fatia])
+            ],
+        )
+
+    indexador._indice_duplicatas().importar(duplicatas, assinaturas)
+    indexador.salvar_manifesto(manifesto)
+    indexador._incrementar_versao_colecao()
+    print(
+        f"♻️  Snapshot restaurado: {len(ids)} chunks e {len(duplicatas['copias'])} cópias em {time.perf_counter() - inicio:.1f}s "
+        f"(criado em {info.get('criado_em')})"
+    )
+    return len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot da base vetorial do Assistente RAG")
+    parser.add_argument("acao", choices=["exportar", "restaurar", "info"])
+    parser.add_argument("--arquivo", type=Path, default=SNAPSHOT_PATH)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default=SNAPSHOT_DTYPE)
+    parser.add_argument("--forcar", action="store_true", help="Restaura mesmo com a base não vazia")
+    args = parser.parse_args()
+
+    if args.acao == "exportar":
+        exportar_snapshot(args.arquivo, dtype=args.dtype)
+    elif args.acao == "restaurar":
+        if not restaurar_snapshot(args.arquivo, forcar=args.forcar):
+            print("ℹ️  Nada restaurado (snapshot ausente/incompatível ou base não vazia)")
+    else:
+        info = ler_info(args.arquivo)
+        print(json.dumps(info, indent=2, ensure_ascii=False) if info else "⚠️  Snapshot não encontrado")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,825 @@
+# SPDX-License-Identifier: PolyForm-Noncommercial-1.0.0
+# Copyright (c) 2026 Lenon de Paula - https://github.com/lenondpaula
+"""
+Vector Store NumPy - Assistente Corporativo RAG
+Base vetorial plana em arquivo .npy mapeado em memória, alternativa leve
+ao ChromaDB para coleções de até algumas centenas de milhares de chunks
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from compressao_vetores import AMOSTRA_MAXIMA, CompressorVetores
+
+ARQUIVO_VETORES = "vetores.npy"
+ARQUIVO_METADADOS = "metadados.jsonl"
+ARQUIVO_IDS = "ids.jsonl"
+ARQUIVO_COMPACTOS = "vetores_compactos.npy"
+ARQUIVO_COMPRESSOR = "compressor.npz"
+
+# Linhas processadas por vez na busca (evita cópias do arquivo inteiro em float32).
+# Em float16 a conversão por bloco custa CPU: troca-se velocidade por metade da memória.
+LINHAS_POR_BLOCO = 8192
+CAPACIDADE_INICIAL = 1024
+
+# Índice compacto: candidatos por resultado reavaliados em float32 e vetores
+# necessários antes de ajustar PCA/escalas (até lá a busca é exata)
+FATOR_CANDIDATOS = 8
+MIN_VETORES_COMPRESSAO = 256
+
+# Um lock por pasta: várias instâncias no mesmo processo compartilham os arquivos
+_LOCKS: Dict[str, threading.RLock] = {}
+_LOCKS_GUARDA = threading.Lock()
+
+
+def _lock_da_pasta(pasta: Path) -> threading.RLock:
+    with _LOCKS_GUARDA:
+        return _LOCKS.setdefault(str(pasta.resolve()), threading.RLock())
+
+
+# Comparações de intervalo, avaliadas sobre colunas numéricas (NaN nunca satisfaz)
+_INTERVALOS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "$gt": np.greater,
+    "$gte": np.greater_equal,
+    "$lt": np.less,
+    "$lte": np.less_equal,
+}
+
+
+class VetorialNumpy(VectorStore):
+    """
+    Vector store de varredura exata sobre vetores normalizados.
+
+    - `vetores.npy`: matriz (capacidade x dimensão) em float32 ou float16,
+      aberta com mmap; o SO carrega as páginas sob demanda.
+    - `metadados.jsonl`: uma linha por vetor (id, texto, metadados), só de
+      acréscimo; lido sob demanda, quando textos ou filtros são pedidos.
+    - `ids.jsonl`: registro que liga as linhas da matriz aos IDs
+      (`{"id": ..., "pos": offset em metadados.jsonl}`) e às remoções
+      (`{"apagar": linha}`). Upserts são só de acréscimo: a versão antiga
+      vira uma remoção e a nova entra no fim. É o único arquivo lido na
+      abertura; escritas desta instância atualizam o estado em memória e,
+      se outro processo escreveu, só o trecho novo é lido.
+
+    O top-k sai de um produto matriz-vetor seguido de `argpartition`. Os
+    scores seguem a convenção do Chroma (distância L2 ao quadrado, que
+    para vetores unitários vale 2 - 2·cosseno).
+
+    Com `compressao` ('float16' ou 'int8', opcionalmente com `dimensao_pca`),
+    a varredura roda sobre `vetores_compactos.npy` e só os
+    `FATOR_CANDIDATOS` x k melhores candidatos são lidos de `vetores.npy`
+    e reavaliados exatamente: a memória residente da busca passa a ser a
+    da matriz compacta. PCA e escalas são ajustados quando a base atinge
+    MIN_VETORES_COMPRESSAO vetores e reajustados a cada `compactar()`.
+    """
+
+    def __init__(
+        self,
+        pasta: Path,
+        embedding_function: Embeddings,
+        dtype: str = "float32",
+        compressao: Optional[str] = None,
+        dimensao_pca: int = 0,
+        reavaliar: bool = True,
+        fator_candidatos: int = FATOR_CANDIDATOS,
+    ):
+        self.pasta = Path(pasta)
+        self._embedding = embedding_function
+        self.dtype = np.dtype(dtype)
+        self.compressao = compressao if compressao not in (None, "", "nenhuma") else None
+        self.dimensao_pca = dimensao_pca
+        self.reavaliar = reavaliar
+        self.fator_candidatos = fator_candidatos
+        self._lock = _lock_da_pasta(self.pasta)
+        self._assinatura: Optional[Tuple[int, ...]] = None
+        self._vetores: Optional[np.ndarray] = None
+        self._compactos: Optional[np.ndarray] = None
+        self._compressor: Optional[CompressorVetores] = None
+        self._versao_compressor: Optional[int] = None
+        self._reiniciar_estado()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def _caminho_vetores(self) -> Path:
+        return self.pasta / ARQUIVO_VETORES
+
+    @property
+    def _caminho_metadados(self) -> Path:
+        return self.pasta / ARQUIVO_METADADOS
+
+    @property
+    def _caminho_ids(self) -> Path:
+        return self.pasta / ARQUIVO_IDS
+
+    @property
+    def _caminho_compactos(self) -> Path:
+        return self.pasta / ARQUIVO_COMPACTOS
+
+    @property
+    def _caminho_compressor(self) -> Path:
+        return self.pasta / ARQUIVO_COMPRESSOR
+
+    # ── Carga e sincronização ───────────────────────────────────────────────────
+    def _reiniciar_estado(self) -> None:
+        """Esquece o registro lido (arquivos substituídos ou apagados)."""
+        self._ids: List[str] = []
+        self._posicoes: List[int] = []
+        self._ativos = np.zeros(0, dtype=bool)
+        self._mapa_ids: Dict[str, int] = {}
+        self._metadados: List[dict] = []
+        self._colunas: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._textos: Optional[bytearray] = None
+        self._inode_ids: Optional[int] = None
+        self._lidos_ids = 0
+
+    def _assinatura_atual(self) -> Optional[Tuple[int, ...]]:
+        try:
+            stat_ids = self._caminho_ids.stat()
+            stat_vet = self._caminho_vetores.stat()
+        except FileNotFoundError:
+            return None
+        assinatura = (stat_ids.st_ino, stat_ids.st_size, stat_vet.st_ino, stat_vet.st_mtime_ns)
+        if self.compressao:
+            try:
+                assinatura += (self._caminho_compactos.stat().st_mtime_ns,)
+            except FileNotFoundError:
+                pass
+        return assinatura
+
+    def _sincronizar(self) -> None:
+        """
+        Acompanha mudanças feitas por outra instância ou processo.
+
+        Se o registro de IDs só cresceu, lê apenas o trecho novo; se foi
+        substituído (compactação) ou apagado, recomeça do zero.
+        """
+        if not self._caminho_ids.exists() and self._caminho_metadados.exists():
+            self._migrar_registro()
+        assinatura = self._assinatura_atual()
+        if assinatura == self._assinatura:
+            return
+        if assinatura is None:
+            self._reiniciar_estado()
+            self._vetores = None
+            self._compactos = None
+            self._compressor = None
+            self._assinatura = None
+            return
+
+        inode, tamanho = assinatura[0], assinatura[1]
+        if inode != self._inode_ids or tamanho < self._lidos_ids:
+            self._reiniciar_estado()
+            self._inode_ids = inode
+        if tamanho > self._lidos_ids:
+            with open(self._caminho_ids, "rb") as arquivo:
+                arquivo.seek(self._lidos_ids)
+                trecho = arquivo.read(tamanho - self._lidos_ids)
+            # Linha final incompleta (escrita em andamento) fica para a próxima sincronização
+            trecho = trecho[:trecho.rfind(b"\n") + 1]
+            self._aplicar_registro(trecho.splitlines())
+            self._lidos_ids += len(trecho)
+        self._abrir_matrizes()
+        self._assinatura = assinatura
+
+    def _migrar_registro(self) -> None:
+        """Bases anteriores ao ids.jsonl: monta o registro a partir de metadados.jsonl (uma vez)."""
+        registros = []
+        posicao = 0
+        for linha in self._caminho_metadados.read_bytes().splitlines(keepends=True):
+            if linha.startswith(b'{"apagar"'):
+                registros.append(linha.rstrip(b"\n"))
+            elif linha.strip():
+                registros.append(json.dumps({"id": json.loads(linha)["id"], "pos": posicao}).encode())
+            posicao += len(linha)
+        tmp_path = self._caminho_ids.with_suffix(".tmp")
+        tmp_path.write_bytes(b"".join(registro + b"\n" for registro in registros))
+        os.replace(tmp_path, self._caminho_ids)
+
+    def _aplicar_registro(self, registros: Sequence[bytes]) -> None:
+        """Aplica linhas do registro (novos vetores e remoções) ao estado em memória."""
+        primeira_nova = len(self._ids)
+        novos_ativos: List[bool] = []
+        # Um único json.loads para o trecho todo (a abertura de bases grandes lê tudo de uma vez)
+        for dados in json.loads(b"[" + b",".join(registros) + b"]"):
+            if "apagar" in dados:
+                linha = dados["apagar"]
+                if linha < primeira_nova:
+                    self._ativos[linha] = False
+                else:
+                    novos_ativos[linha - primeira_nova] = False
+                chunk_id = self._ids[linha]
+                if self._mapa_ids.get(chunk_id) == linha:
+                    del self._mapa_ids[chunk_id]
+            else:
+                self._mapa_ids[dados["id"]] = len(self._ids)
+                self._ids.append(dados["id"])
+                self._posicoes.append(dados["pos"])
+                novos_ativos.append(True)
+        if novos_ativos:
+            self._ativos = np.concatenate([self._ativos, np.array(novos_ativos, dtype=bool)])
+            self._colunas = {}
+
+    def _registrar(self, registros: List[bytes]) -> None:
+        """Acrescenta linhas ao registro de IDs e aplica em memória, sem reler o arquivo."""
+        dados = b"".join(registro + b"\n" for registro in registros)
+        with open(self._caminho_ids, "ab") as arquivo:
+            sozinho = arquivo.tell() == self._lidos_ids
+            arquivo.write(dados)
+        if sozinho:
+            self._aplicar_registro(registros)
+            self._lidos_ids += len(dados)
+            self._inode_ids = self._caminho_ids.stat().st_ino
+            self._abrir_matrizes()
+            self._assinatura = self._assinatura_atual()
+        else:
+            # Outro processo escreveu antes: lê o trecho novo (o dele e o nosso) em ordem
+            self._assinatura = None
+            self._sincronizar()
+
+    def _abrir_matrizes(self) -> None:
+        """(Re)abre as matrizes mapeadas; o compressor só é relido se o arquivo dele mudou."""
+        self._vetores = np.load(self._caminho_vetores, mmap_mode="r")
+        self._compactos = None
+        if not self.compressao or not self._caminho_compactos.exists():
+            self._compressor = None
+            self._versao_compressor = None
+            return
+        try:
+            versao = self._caminho_compressor.stat().st_mtime_ns
+        except FileNotFoundError:
+            versao = None
+        if versao != self._versao_compressor:
+            compressor = CompressorVetores.carregar(self._caminho_compressor) if versao else None
+            if compressor is not None and not compressor.compativel(self.compressao, self.dimensao_pca):
+                compressor = None
+            self._compressor = compressor
+            self._versao_compressor = versao
+        if self._compressor is not None:
+            self._compactos = np.load(self._caminho_compactos, mmap_mode="r")
+
+    def _linha(self, linha: int) -> bytes:
+        """Linha de metadados.jsonl do vetor (o arquivo é lido sob demanda, só o trecho novo)."""
+        posicao = self._posicoes[linha]
+        if self._textos is None:
+            self._textos = bytearray()
+        fim = self._textos.find(b"\n", posicao)
+        if fim < 0:
+            with open(self._caminho_metadados, "rb") as arquivo:
+                arquivo.seek(len(self._textos))
+                self._textos += arquivo.read()
+            fim = self._textos.index(b"\n", posicao)
+        return bytes(self._textos[posicao:fim])
+
+    def _metadados_linhas(self) -> List[dict]:
+        """Metadados de todas as linhas, decodificados uma vez (as novas, conforme chegam)."""
+        for linha in range(len(self._metadados), len(self._ids)):
+            self._metadados.append(json.loads(self._linha(linha))["metadata"])
+        return self._metadados
+
+    def _garantir_capacidade(
+        self,
+        necessario: int,
+        dimensao: int,
+        caminho: Optional[Path] = None,
+        dtype: Optional[np.dtype] = None,
+    ) -> np.ndarray:
+        """Abre a matriz para escrita, dobrando a capacidade se faltar espaço."""
+        caminho = caminho or self._caminho_vetores
+        if caminho.exists():
+            atual = np.load(caminho, mmap_mode="r+")
+            if atual.shape[0] >= necessario:
+                return atual
+            capacidade = max(necessario, 2 * atual.shape[0])
+            dtype = atual.dtype
+        else:
+            atual = None
+            capacidade = max(necessario, CAPACIDADE_INICIAL)
+            dtype = dtype or self.dtype
+
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        tmp_path = caminho.with_suffix(".tmp.npy")
+        nova = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(capacidade, dimensao))
+        if atual is not None:
+            usadas = len(self._ids)
+            for inicio in range(0, usadas, LINHAS_POR_BLOCO):
+                fim = min(usadas, inicio + LINHAS_POR_BLOCO)
+                nova[inicio:fim] = atual[inicio:fim]
+            del atual
+        nova.flush()
+        del nova
+        os.replace(tmp_path, caminho)
+        return np.load(caminho, mmap_mode="r+")
+
+    @staticmethod
+    def _normalizar(vetores: np.ndarray) -> np.ndarray:
+        normas = np.linalg.norm(vetores, axis=-1, keepdims=True)
+        return vetores / np.clip(normas, 1e-12, None)
+
+    # ── Escrita ─────────────────────────────────────────────────────────────────
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        textos = list(texts)
+        if not textos:
+            return []
+        metadatas = metadatas or [{} for _ in textos]
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in textos]
+
+        # Repetições no mesmo lote: vale a última
+        ultima = {chunk_id: i for i, chunk_id in enumerate(ids)}
+        posicoes = sorted(ultima.values())
+        textos = [textos[i] for i in posicoes]
+        metadatas = [metadatas[i] for i in posicoes]
+        ids_lote = [ids[i] for i in posicoes]
+
+        vetores = np.asarray(self._embedding.embed_documents(textos), dtype=np.float32)
+        self.adicionar_vetores(ids_lote, textos, metadatas, vetores)
+        return ids
+
+    def adicionar_vetores(
+        self,
+        ids: List[str],
+        textos: List[str],
+        metadatas: List[dict],
+        vetores: np.ndarray,
+    ) -> None:
+        """
+        Grava vetores já calculados (carga em massa, p. ex. de um snapshot).
+
+        IDs já existentes são substituídos; os IDs do lote devem ser únicos.
+        """
+        if not len(ids):
+            return
+        vetores = self._normalizar(np.asarray(vetores, dtype=np.float32))
+        ids_lote = list(ids)
+
+        with self._lock:
+            self._sincronizar()
+            inicio = len(self._ids)
+            # Registro criado antes dos textos: outra instância não confunde a base nova com uma antiga
+            self.pasta.mkdir(parents=True, exist_ok=True)
+            self._caminho_ids.touch(exist_ok=True)
+            matriz = self._garantir_capacidade(inicio + len(textos), vetores.shape[1])
+            matriz[inicio:inicio + len(textos)] = vetores.astype(matriz.dtype)
+            matriz.flush()
+            del matriz
+            if self._compressor is not None:
+                compactos = self._garantir_capacidade(
+                    inicio + len(textos),
+                    self._compressor.dimensao_saida(vetores.shape[1]),
+                    caminho=self._caminho_compactos,
+                    dtype=self._compressor.dtype,
+                )
+                compactos[inicio:inicio + len(textos)] = self._compressor.codificar(vetores)
+                compactos.flush()
+                del compactos
+
+            # Vetores, depois textos, por fim o registro: leitores nunca veem ID sem vetor e texto
+            linhas = [
+                json.dumps({"id": chunk_id, "texto": texto, "metadata": meta or {}}, ensure_ascii=False).encode("utf-8")
+                + b"\n"
+                for chunk_id, texto, meta in zip(ids_lote, textos, metadatas)
+            ]
+            with open(self._caminho_metadados, "ab") as arquivo:
+                posicao = arquivo.tell()
+                arquivo.write(b"".join(linhas))
+            registros = [
+                json.dumps({"apagar": self._mapa_ids[chunk_id]}).encode()
+                for chunk_id in ids_lote if chunk_id in self._mapa_ids
+            ]
+            for chunk_id, linha in zip(ids_lote, linhas):
+                registros.append(json.dumps({"id": chunk_id, "pos": posicao}, ensure_ascii=False).encode("utf-8"))
+                posicao += len(linha)
+            self._registrar(registros)
+            if self.compressao and self._compressor is None:
+                self._construir_compactos()
+
+    def ajustar_compressao(self) -> bool:
+        """
+        Ajusta PCA/escalas agora, sem esperar MIN_VETORES_COMPRESSAO vetores.
+
+        Returns:
+            False se a compressão está desligada ou não há vetores suficientes
+        """
+        with self._lock:
+            self._sincronizar()
+            return bool(self.compressao) and self._construir_compactos(minimo=max(self.dimensao_pca, 1))
+
+    def _construir_compactos(self, minimo: int = MIN_VETORES_COMPRESSAO) -> bool:
+        """
+        Ajusta o compressor aos vetores ativos e recodifica a matriz compacta.
+
+        Returns:
+            False se ainda não há vetores suficientes (a busca segue exata)
+        """
+        ativas = np.flatnonzero(self._ativos)
+        if self._vetores is None or len(ativas) < max(minimo, self.dimensao_pca):
+            return False
+        rng = np.random.default_rng(0)
+        amostra = np.sort(rng.choice(ativas, min(len(ativas), AMOSTRA_MAXIMA), replace=False))
+        compressor = CompressorVetores(self.compressao, self.dimensao_pca)
+        compressor.ajustar(np.asarray(self._vetores[amostra], dtype=np.float32))
+
+        usadas = len(self._ids)
+        tmp_path = self._caminho_compactos.with_suffix(".tmp.npy")
+        nova = np.lib.format.open_memmap(
+            tmp_path,
+            mode="w+",
+            dtype=compressor.dtype,
+            shape=(max(usadas, CAPACIDADE_INICIAL), compressor.dimensao_saida(self._vetores.shape[1])),
+        )
+        for inicio in range(0, usadas, LINHAS_POR_BLOCO):
+            fim = min(usadas, inicio + LINHAS_POR_BLOCO)
+            nova[inicio:fim] = compressor.codificar(np.asarray(self._vetores[inicio:fim], dtype=np.float32))
+        nova.flush()
+        del nova
+        self._compactos = None
+        compressor.salvar(self._caminho_compressor)
+        os.replace(tmp_path, self._caminho_compactos)
+        self._compressor = compressor
+        self._versao_compressor = self._caminho_compressor.stat().st_mtime_ns
+        self._compactos = np.load(self._caminho_compactos, mmap_mode="r")
+        self._assinatura = self._assinatura_atual()
+        return True
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> Optional[bool]:
+        """Remove por IDs e/ou por filtro de metadados (`where`, como no Chroma)."""
+        if not ids and not where:
+            return False
+        with self._lock:
+            self._sincronizar()
+            linhas = {self._mapa_ids[i] for i in ids or [] if i in self._mapa_ids}
+            if where:
+                linhas.update(self._linhas_filtradas(where))
+            if linhas:
+                self._registrar([json.dumps({"apagar": linha}).encode() for linha in sorted(linhas)])
+        return True
+
+    def compactar(self) -> dict:
+        """
+        Reescreve os arquivos só com os vetores ativos.
+
+        Remoções e upserts deixam linhas mortas nos dois arquivos; a
+        compactação devolve esse espaço. Deve rodar sem outro processo
+        escrevendo na mesma pasta.
+
+        Returns:
+            Dicionário com linhas antes/depois e bytes antes/depois
+        """
+        with self._lock:
+            self._sincronizar()
+            if self._vetores is None:
+                return {"linhas_antes": 0, "linhas_depois": 0, "bytes_antes": 0, "bytes_depois": 0}
+            bytes_antes = self._tamanho_arquivos()
+            ativas = np.flatnonzero(self._ativos)
+            linhas_antes = len(self._ids)
+
+            tmp_vetores = self._caminho_vetores.with_suffix(".tmp.npy")
+            tmp_metadados = self._caminho_metadados.with_suffix(".tmp")
+            tmp_ids = self._caminho_ids.with_suffix(".tmp")
+            nova = np.lib.format.open_memmap(
+                tmp_vetores,
+                mode="w+",
+                dtype=self._vetores.dtype,
+                shape=(max(len(ativas), CAPACIDADE_INICIAL), self._vetores.shape[1]),
+            )
+            for inicio in range(0, len(ativas), LINHAS_POR_BLOCO):
+                bloco = ativas[inicio:inicio + LINHAS_POR_BLOCO]
+                nova[inicio:inicio + len(bloco)] = self._vetores[bloco]
+            nova.flush()
+            del nova
+            with open(tmp_metadados, "wb") as arquivo_textos, open(tmp_ids, "wb") as arquivo_ids:
+                posicao = 0
+                for linha in ativas:
+                    texto = self._linha(int(linha)) + b"\n"
+                    arquivo_textos.write(texto)
+                    arquivo_ids.write(json.dumps({"id": self._ids[linha], "pos": posicao}, ensure_ascii=False).encode("utf-8") + b"\n")
+                    posicao += len(texto)
+
+            self._vetores = None
+            self._compactos = None
+            os.replace(tmp_vetores, self._caminho_vetores)
+            os.replace(tmp_metadados, self._caminho_metadados)
+            os.replace(tmp_ids, self._caminho_ids)
+            self._caminho_compactos.unlink(missing_ok=True)
+            self._reiniciar_estado()
+            self._assinatura = None
+            self._sincronizar()
+            if self.compressao:
+                # Reajusta PCA/escalas à coleção atual
+                self._construir_compactos()
+            bytes_depois = self._tamanho_arquivos()
+            return {
+                "linhas_antes": linhas_antes,
+                "linhas_depois": len(ativas),
+                "bytes_antes": bytes_antes,
+                "bytes_depois": bytes_depois,
+            }
+
+    def _tamanho_arquivos(self) -> int:
+        return sum(caminho.stat().st_size for caminho in (self._caminho_vetores, self._caminho_metadados, self._caminho_ids))
+
+    # ── Leitura ─────────────────────────────────────────────────────────────────
+    def _coluna(self, campo: str, numerica: bool) -> np.ndarray:
+        """
+        Valores de um campo de metadados em todas as linhas (cache por sincronização).
+
+        A versão numérica usa NaN para valores ausentes ou não numéricos,
+        que assim nunca satisfazem comparações de intervalo.
+        """
+        chave = (campo, numerica)
+        if chave not in self._colunas:
+            valores = [metadata.get(campo) for metadata in self._metadados_linhas()]
+            if numerica:
+                self._colunas[chave] = np.array(
+                    [
+                        float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan
+                        for v in valores
+                    ],
+                    dtype=np.float64,
+                )
+            else:
+                coluna = np.empty(len(valores), dtype=object)
+                coluna[:] = valores
+                self._colunas[chave] = coluna
+        return self._colunas[chave]
+
+    def _mascara(self, where: dict) -> np.ndarray:
+        """Avalia `where` (sintaxe do Chroma) vetorizado sobre todas as linhas."""
+        mascara = np.ones(len(self._ids), dtype=bool)
+        for campo, condicao in where.items():
+            if campo == "$and":
+                for parte in condicao:
+                    mascara &= self._mascara(parte)
+            elif campo == "$or":
+                alguma = np.zeros(len(self._ids), dtype=bool)
+                for parte in condicao:
+                    alguma |= self._mascara(parte)
+                mascara &= alguma
+            elif not isinstance(condicao, dict):
+                mascara &= self._coluna(campo, numerica=False) == condicao
+            else:
+                for operador, alvo in condicao.items():
+                    if operador in _INTERVALOS:
+                        with np.errstate(invalid="ignore"):
+                            mascara &= _INTERVALOS[operador](self._coluna(campo, numerica=True), alvo)
+                        continue
+                    coluna = self._coluna(campo, numerica=False)
+                    if operador == "$eq":
+                        mascara &= coluna == alvo
+                    elif operador == "$ne":
+                        mascara &= coluna != alvo
+                    elif operador in ("$in", "$nin"):
+                        presente = np.zeros(len(self._ids), dtype=bool)
+                        for valor in alvo:
+                            presente |= coluna == valor
+                        mascara &= presente if operador == "$in" else ~presente
+                    else:
+                        raise ValueError(f"Operador não suportado no filtro: {operador}")
+        return mascara
+
+    def _linhas_filtradas(self, where: dict) -> List[int]:
+        """
+        Linhas ativas cujos metadados satisfazem `where` (sintaxe do Chroma).
+
+        Aceita igualdade direta, $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte
+        e a combinação de condições com $and/$or.
+        """
+        return [int(linha) for linha in np.flatnonzero(self._ativos & self._mascara(where))]
+
+    def contar(self) -> int:
+        """Número de vetores ativos."""
+        with self._lock:
+            self._sincronizar()
+            return int(self._ativos.sum())
+
+    def _documento(self, linha: int) -> Document:
+        dados = json.loads(self._linha(linha))
+        return Document(page_content=dados["texto"], metadata=dados["metadata"], id=dados["id"])
+
+    def _blocos_candidatos(
+        self, where: Optional[dict], matriz: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Percorre (linhas, vetores) da matriz por blocos, só nas linhas que podem entrar no top-k.
+
+        Com `where`, só as linhas que passam no filtro são lidas da matriz
+        (pré-filtro): uma busca restrita a um documento não varre a base toda.
+        """
+        if where:
+            candidatas = np.asarray(self._linhas_filtradas(where), dtype=np.int64)
+            for inicio in range(0, len(candidatas), LINHAS_POR_BLOCO):
+                linhas = candidatas[inicio:inicio + LINHAS_POR_BLOCO]
+                yield linhas, np.asarray(matriz[linhas], dtype=np.float32)
+            return
+        for inicio in range(0, len(self._ids), LINHAS_POR_BLOCO):
+            fim = min(len(self._ids), inicio + LINHAS_POR_BLOCO)
+            linhas = np.arange(inicio, fim)[self._ativos[inicio:fim]]
+            if len(linhas) == fim - inicio:
+                yield linhas, np.asarray(matriz[inicio:fim], dtype=np.float32)
+            elif len(linhas):
+                yield linhas, np.asarray(matriz[linhas], dtype=np.float32)
+
+    @staticmethod
+    def _top_k(
+        consultas: np.ndarray, blocos: Iterable[Tuple[np.ndarray, np.ndarray]], k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Maiores produtos internos por consulta, mantendo só k candidatos entre blocos.
+
+        Returns:
+            Tuple com (scores, linhas), ambos (consultas x até k); sem ordem
+        """
+        melhores_scores = np.full((len(consultas), 0), -np.inf, dtype=np.float32)
+        melhores_linhas = np.zeros((len(consultas), 0), dtype=np.int64)
+        for linhas, bloco in blocos:
+            scores = np.concatenate([melhores_scores, consultas @ bloco.T], axis=1)
+            linhas = np.concatenate(
+                [melhores_linhas, np.broadcast_to(linhas, (len(consultas), len(linhas)))], axis=1
+            )
+            manter = min(k, scores.shape[1])
+            topo = np.argpartition(-scores, manter - 1, axis=1)[:, :manter]
+            melhores_scores = np.take_along_axis(scores, topo, axis=1)
+            melhores_linhas = np.take_along_axis(linhas, topo, axis=1)
+        return melhores_scores, melhores_linhas
+
+    def _usa_compactos(self) -> bool:
+        if self.compressao and self._compressor is None and self._vetores is not None:
+            self._construir_compactos()  # Base já existente ou opção recém-ligada
+        return self._compactos is not None and self._compactos.shape[0] >= len(self._ids)
+
+    def similarity_search_by_vector_with_relevance_scores(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """Top-k; retorna (Document, distância L2²) como o Chroma."""
+        return self.buscar_em_lote([embedding], k=k, where=filter)[0]
+
+    def buscar_em_lote(
+        self,
+        vetores: Sequence[Sequence[float]],
+        k: int = 4,
+        where: Optional[dict] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Top-k de várias consultas numa única passada pela matriz.
+
+        Cada bloco de vetores é lido uma vez e multiplicado por todas as
+        consultas; só os k melhores de cada consulta são mantidos entre os
+        blocos, então a memória não cresce com o tamanho da base. Com o
+        índice compacto, a passada escolhe FATOR_CANDIDATOS x k candidatos
+        e as distâncias devolvidas vêm da reavaliação exata deles.
+
+        Args:
+            vetores: Vetores das consultas
+            k: Resultados por consulta
+            where: Filtro de metadados aplicado antes da varredura
+
+        Returns:
+            Uma lista de (Document, distância L2²) por consulta, na ordem recebida
+        """
+        consultas = self._normalizar(np.asarray(vetores, dtype=np.float32).reshape(len(vetores), -1))
+        with self._lock:
+            self._sincronizar()
+            if self._vetores is None or k <= 0 or not len(consultas):
+                return [[] for _ in range(len(consultas))]
+
+            if not self._usa_compactos():
+                scores, linhas = self._top_k(consultas, self._blocos_candidatos(where, self._vetores), k)
+            else:
+                preparadas = self._compressor.preparar_consultas(consultas)
+                candidatos = k * self.fator_candidatos if self.reavaliar else k
+                scores, linhas = self._top_k(preparadas, self._blocos_candidatos(where, self._compactos), candidatos)
+                if self.reavaliar:
+                    scores, linhas = self._reavaliar(consultas, scores, linhas, k)
+
+            resultados = []
+            for linha_scores, linhas_consulta in zip(scores, linhas):
+                ordem = [i for i in np.argsort(-linha_scores) if np.isfinite(linha_scores[i])]
+                resultados.append([
+                    (self._documento(int(linhas_consulta[i])), float(2.0 - 2.0 * linha_scores[i]))
+                    for i in ordem
+                ])
+            return resultados
+
+    def _reavaliar(
+        self, consultas: np.ndarray, scores: np.ndarray, linhas: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Recalcula os scores dos candidatos com os vetores completos e fica com os k melhores."""
+        validas = np.isfinite(scores)
+        if not validas.any():
+            return scores, linhas
+        # Cada linha candidata é lida uma vez, mesmo se aparecer em várias consultas
+        unicas = np.unique(linhas[validas])
+        exatos = np.asarray(self._vetores[unicas], dtype=np.float32)
+        posicao = np.searchsorted(unicas, np.where(validas, linhas, unicas[0]))
+        reavaliados = np.einsum("qcd,qd->qc", exatos[posicao], consultas)
+        reavaliados = np.where(validas, reavaliados, -np.inf).astype(np.float32)
+        manter = min(k, reavaliados.shape[1])
+        topo = np.argpartition(-reavaliados, manter - 1, axis=1)[:, :manter]
+        return np.take_along_axis(reavaliados, topo, axis=1), np.take_along_axis(linhas, topo, axis=1)
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_relevance_scores(
+            self._embedding.embed_query(query), k=k, filter=filter, **kwargs
+        )
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_relevance_scores(embedding, k=k, **kwargs)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return self._euclidean_relevance_score_fn
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        where: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> Dict[str, list]:
+        """Leitura direta no mesmo formato de `Chroma.get`."""
+        include = ["documents", "metadatas"] if include is None else include
+        with self._lock:
+            self._sincronizar()
+            if ids is not None:
+                linhas = [self._mapa_ids[i] for i in ids if i in self._mapa_ids]
+            else:
+                linhas = [int(i) for i in np.flatnonzero(self._ativos)]
+            if where:
+                filtradas = set(self._linhas_filtradas(where))
+                linhas = [linha for linha in linhas if linha in filtradas]
+            linhas = linhas[offset or 0:]
+            if limit is not None:
+                linhas = linhas[:limit]
+
+            resultado: Dict[str, list] = {"ids": []}
+            for chave in include:
+                resultado[chave] = []
+            # Só IDs (e vetores) não precisam tocar nos textos
+            ler_textos = "documents" in include or "metadatas" in include
+            for linha in linhas:
+                resultado["ids"].append(self._ids[linha])
+                doc = self._documento(linha) if ler_textos else None
+                if "documents" in include:
+                    resultado["documents"].append(doc.page_content)
+                if "metadatas" in include:
+                    resultado["metadatas"].append(doc.metadata)
+                if "embeddings" in include:
+                    resultado["embeddings"].append(np.asarray(self._vetores[linha], dtype=np.float32))
+            return resultado
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        dados = self.get(ids=ids)
+        return [
+            Document(page_content=texto, metadata=meta, id=chunk_id)
+            for chunk_id, texto, meta in zip(dados["ids"], dados["documents"], dados["metadatas"])
+        ]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        pasta: Optional[Path] = None,
+        dtype: str = "float32",
+        **kwargs: Any,
+    ) -> "VetorialNumpy":
+        if pasta is None:
+            raise ValueError("Informe a pasta da base vetorial (pasta=...)")
+        store = cls(pasta, embedding, dtype=dtype)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -7,6 +7,7 @@ Integrado ao Hub de Criação
 """
 
 from pathlib import Path
+import sys
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -24,12 +25,14 @@ except LookupError:
     nltk.download('punkt_tab', quiet=True)
     nltk.download('averaged_perceptron_tagger', quiet=True)
 
-from textblob import TextBlob
-
 # Caminhos do projeto
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 ANALISE_PATH = PROJECT_ROOT / "analise-sentimentos"
 DATA_PATH = ANALISE_PATH / "data" / "comentarios_classificados.csv"
+SRC_PATH = ANALISE_PATH / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from analise_motor import processar_dataframe  # noqa: E402
 
 # ────────────────────────────────────────────────────────────────────────────────
 # CSS corporativo minimalista (mesmo padrão do App 1)
@@ -175,24 +178,6 @@ USUARIOS = ['@tech_lover', '@maria_silva', '@joao_dev', '@ana_tech', '@pedro_gam
             '@julia_design', '@carlos_eng', '@fernanda_mkt', '@lucas_ti', '@patricia_ux']
 
 
-def analisar_sentimento(texto: str):
-    """Analisa o sentimento de um texto usando TextBlob."""
-    try:
-        blob = TextBlob(str(texto))
-        polaridade = blob.sentiment.polarity
-        
-        if polaridade > 0.1:
-            classificacao = 'Positivo'
-        elif polaridade < -0.1:
-            classificacao = 'Negativo'
-        else:
-            classificacao = 'Neutro'
-            
-        return polaridade, classificacao, blob.sentiment.subjectivity
-    except Exception:
-        return 0.0, 'Neutro', 0.5
-
-
 @st.cache_data
 def gerar_dados_sinteticos(n_comentarios: int = 500):
     """Gera dados sintéticos de comentários."""
@@ -229,20 +214,17 @@ def gerar_dados_sinteticos(n_comentarios: int = 500):
         else:
             likes = int(np.random.exponential(scale=40))
         
-        polaridade, classificacao, subjetividade = analisar_sentimento(texto)
-        
         dados.append({
             'data': data,
             'plataforma': plataforma,
             'usuario': usuario,
             'texto': texto,
-            'likes': min(likes, 10000),
-            'polaridade': polaridade,
-            'classificacao': classificacao,
-            'subjetividade': subjetividade
+            'likes': min(likes, 10000)
         })
     
     df = pd.DataFrame(dados)
+    # Os templates se repetem: o cache de pontuações analisa cada um só uma vez
+    df = processar_dataframe(df, 'texto')
     df = df.sort_values('data', ascending=False).reset_index(drop=True)
     
     return df